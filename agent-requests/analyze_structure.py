@@ -2,82 +2,189 @@
 import os
 import sys
 import json
+import re
 import argparse
 
+# Import the shared workspace index from the workspace root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from workspace_index import get_index
+except ImportError:
+    get_index = None
+
+# Rule paths are relative to the workspace root and live in this checkout
+INDEX_ROOT = "hrm"
+
+# Declarative rules. `path` is the directory the rule looks under; `files`
+# is a glob over paths relative to it ("*" stays within one directory,
+# "**/" spans any number of them); `contains` is an optional regex that a
+# matching file's content must also hit. A rule passes on its first match.
 RULES = [
     {
         "name": "API route naming",
         "path": "hrm/app/api",
-        "pattern": "route.ts",
+        "files": "**/route.ts",
         "required": True,
         "desc": "All API routes should use route.ts files."
     },
     {
         "name": "Auth route present",
         "path": "hrm/app/api/auth",
-        "pattern": "[...nextauth]/route.ts",
+        "files": "**/[...nextauth]/route.ts",
         "required": True,
         "desc": "Auth route must exist at app/api/auth/[...nextauth]/route.ts."
     },
     {
         "name": "Client control page present",
         "path": "hrm/app/client/control",
-        "pattern": "page.tsx",
+        "files": "**/page.tsx",
         "required": True,
         "desc": "Client control page should exist at app/client/control/page.tsx."
     },
     {
         "name": "MUI usage in components",
         "path": "hrm/components",
-        "pattern": "import .*@mui/",
+        "files": "**/*",
+        "contains": "@mui/",
         "required": False,
         "desc": "Components should use MUI imports where applicable."
     },
 ]
 
+def _index():
+    if get_index is None or not os.path.isdir(INDEX_ROOT):
+        return None
+    return get_index(INDEX_ROOT)
+
+
+def _index_rel(base):
+    """`base` relative to INDEX_ROOT, or None if it lies outside it."""
+    rel = os.path.relpath(base, INDEX_ROOT)
+    return None if rel.startswith("..") else rel.replace(os.sep, "/")
+
+
+def path_exists(base):
+    index, rel = _index(), _index_rel(base)
+    if index is not None and rel is not None and index.exists(rel):
+        return True
+    return os.path.exists(base)
+
+
 def walk_files(base):
+    index, rel = _index(), _index_rel(base)
+    if index is not None and rel is not None:
+        for entry in index.files("" if rel == "." else rel):
+            yield os.path.join(INDEX_ROOT, entry.path)
+        return
     for root, _, files in os.walk(base):
         for f in files:
             yield os.path.join(root, f)
 
 
-def check_rule(rule):
-    base = rule["path"]
-    if not os.path.exists(base):
-        return (rule["name"], False, f"Missing path: {base}")
-
-    matched = False
-    if rule["pattern"] == "route.ts":
-        for fp in walk_files(base):
-            if fp.endswith("route.ts"):
-                matched = True
-                break
-    elif rule["pattern"].endswith("page.tsx"):
-        for fp in walk_files(base):
-            if fp.endswith("page.tsx"):
-                matched = True
-                break
-    elif "[...nextauth]/route.ts" in rule["pattern"]:
-        # look for folder containing [...nextauth]/route.ts
-        for fp in walk_files(base):
-            if fp.endswith("[...nextauth]/route.ts"):
-                matched = True
+def read_text(fp):
+    index = _index()
+    if index is not None:
+        return index.read_text(fp, errors="ignore")
+    with open(fp, "r", encoding="utf-8", errors="ignore") as fh:
+        return fh.read()
+
+
+def glob_to_regex(pattern):
+    """Compile a rule glob. Brackets are literal so Next.js route folders work."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def compile_rules(rules):
+    """Turn rule dicts into (rule, base, path regex, content regex or None) tuples."""
+    compiled = []
+    for rule in rules:
+        base = os.path.normpath(rule["path"]).replace(os.sep, "/")
+        contains = re.compile(rule["contains"]) if rule.get("contains") else None
+        compiled.append((rule, base, glob_to_regex(rule.get("files", "**/*")), contains))
+    return compiled
+
+
+def evaluate_rules(rules):
+    """
+    Evaluate all rules in one traversal of the directories they cover.
+
+    Rules are bucketed by base directory, so each file only meets the rules
+    whose base is one of its ancestors. A file is read only if a content rule
+    still needs it, at most once, and a rule drops out at its first match.
+    Returns (name, ok, info) per rule, in order.
+    """
+    compiled = compile_rules(rules)
+    matched = [False] * len(compiled)
+    by_base = {}
+    for i, (_, base, _, _) in enumerate(compiled):
+        if path_exists(base):
+            by_base.setdefault(base, []).append(i)
+
+    pending = sum(len(v) for v in by_base.values())
+    roots = sorted(by_base)
+    # Walk each outermost base once; nested bases are covered by their parent
+    walk_roots = [b for b in roots if not any(b != r and b.startswith(r + "/") for r in roots)]
+    for root in walk_roots:
+        if not pending:
+            break
+        for fp in walk_files(root):
+            fp = fp.replace(os.sep, "/")
+            text = None
+            parent = fp.rpartition("/")[0]
+            while parent and pending:
+                for i in by_base.get(parent, ()):
+                    if matched[i]:
+                        continue
+                    _, base, path_re, contains = compiled[i]
+                    if not path_re.match(fp[len(base) + 1:]):
+                        continue
+                    if contains is not None:
+                        if text is None:
+                            try:
+                                text = read_text(fp)
+                            except Exception:
+                                text = ""
+                        if not contains.search(text):
+                            continue
+                    matched[i] = True
+                    pending -= 1
+                if parent == root:
+                    break
+                parent = parent.rpartition("/")[0]
+            if not pending:
                 break
-    else:
-        # lightweight text search
-        for fp in walk_files(base):
-            try:
-                with open(fp, "r", encoding="utf-8", errors="ignore") as fh:
-                    text = fh.read()
-                    if "@mui/" in text:
-                        matched = True
-                        break
-            except Exception:
-                continue
-
-    if rule["required"] and not matched:
-        return (rule["name"], False, rule["desc"])
-    return (rule["name"], True, rule["desc"])
+
+    results = []
+    for i, (rule, base, _, _) in enumerate(compiled):
+        if base not in by_base:
+            results.append((rule["name"], False, f"Missing path: {rule['path']}"))
+        elif rule["required"] and not matched[i]:
+            results.append((rule["name"], False, rule["desc"]))
+        else:
+            results.append((rule["name"], True, rule["desc"]))
+    return results
+
+
+def check_rule(rule):
+    return evaluate_rules([rule])[0]
 
 
 def main():
@@ -87,8 +194,7 @@ def main():
 
     results = []
     failures = []
-    for r in RULES:
-        name, ok, info = check_rule(r)
+    for name, ok, info in evaluate_rules(RULES):
         status = "OK" if ok else "FAIL"
         results.append({"name": name, "ok": ok, "info": info})
         if not ok:
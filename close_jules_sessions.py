@@ -4,19 +4,23 @@ Close Jules sessions associated with specific PR numbers.
 Uses unified Jules client and configuration.
 """
 
+import argparse
 import sys
 import re
 
 # Import unified configuration and client
 from common_config import setup_logging, setup_python_path
 from jules_client import get_jules_client
+from session_cleanup import (
+    add_cleanup_arguments, all_of, delete_sessions, select, state_not_in, title_matches
+)
 
 # Setup
 setup_python_path()
 logger = setup_logging("jules_session_closer")
 
 
-def close_sessions_for_prs(pr_numbers):
+def close_sessions_for_prs(pr_numbers, args=None):
     """Close Jules sessions associated with a list of PR numbers."""
     client = get_jules_client()
     
@@ -27,38 +31,31 @@ def close_sessions_for_prs(pr_numbers):
         logger.info("No sessions found.")
         return
         
-    sessions_to_close = []
-    for session in sessions:
-        session_title = session.get("title", "")
-        session_state = session.get("state", "")
-        
-        # Skip already closed sessions
-        if session_state == 'STATE_CLOSED':
-            continue
-            
-        for pr_number in pr_numbers:
-            if f"PR #{pr_number}" in session_title:
-                session_name = session.get("name")
-                if session_name:
-                    sessions_to_close.append(session_name)
+    # Skip already closed sessions; match "PR #<n>" in the title
+    mentions_pr = "|".join(re.escape(f"PR #{n}") for n in pr_numbers)
+    sessions_to_close = select(sessions, all_of(
+        state_not_in("STATE_CLOSED"),
+        title_matches(rf"(?:{mentions_pr})"),
+    ))
                     
     if not sessions_to_close:
         logger.info("No active sessions found for the specified PRs.")
         return
         
-    logger.info(f"Found {len(sessions_to_close)} active sessions to close: {sessions_to_close}")
-    
-    closed_count = 0
-    for session_name in set(sessions_to_close):  # Use set to avoid duplicates
-        success = client.delete_session(session_name)
-        if success:
-            closed_count += 1
-            
-    logger.info(f"Successfully closed {closed_count} of {len(set(sessions_to_close))} sessions.")
+    logger.info(
+        f"Found {len(sessions_to_close)} active sessions to close: "
+        f"{[s.get('name') for s in sessions_to_close]}"
+    )
+    delete_sessions(client, sessions_to_close, args)
 
 
 if __name__ == "__main__":
-    # Example: close sessions for specific closed PRs
-    closed_pr_numbers = [626, 628, 630, 632]
-    logger.info(f"Looking for active Jules sessions for closed PRs: {closed_pr_numbers}")
-    close_sessions_for_prs(closed_pr_numbers)
+    parser = argparse.ArgumentParser(description="Close Jules sessions for specific PRs")
+    parser.add_argument(
+        "pr_numbers", nargs="*", type=int, default=[626, 628, 630, 632],
+        help="PR numbers whose sessions should be closed",
+    )
+    add_cleanup_arguments(parser)
+    args = parser.parse_args()
+    logger.info(f"Looking for active Jules sessions for closed PRs: {args.pr_numbers}")
+    close_sessions_for_prs(args.pr_numbers, args)
@@ -22,6 +22,11 @@ GIT_REPO_PATH = str(HRM_REPO_DIR)
 JULES_API_BASE_URL = "https://jules.googleapis.com/v1alpha"
 JULES_DEFAULT_SOURCE = "sources/github/arii/hrm"
 
+# --- Workspace Daemon ---
+# Where `jules_ops.py serve` listens; clients find it through data/daemon.json
+DAEMON_HOST = os.environ.get("HRM_DAEMON_HOST", "127.0.0.1")
+DAEMON_PORT = int(os.environ.get("HRM_DAEMON_PORT", "8765"))
+
 # --- Logging Configuration ---
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -31,15 +36,27 @@ def is_workspace_environment():
     """Check if we're running in the hrm-workspace environment."""
     return (WORKSPACE_ROOT / "hrm").exists() and (WORKSPACE_ROOT / "hrm").is_dir()
 
+_logging_configured = False
+
 def setup_logging(logger_name: str, level: int = logging.INFO):
-    """Setup consistent logging across all scripts."""
-    logging.basicConfig(
-        level=level,
-        format=LOG_FORMAT,
-        datefmt=DATE_FORMAT,
-        force=True  # Override any existing config
-    )
-    return logging.getLogger(logger_name)
+    """
+    Setup consistent logging across all scripts. The root handler is
+    installed on the first call only, so entry points call this; library
+    modules just use logging.getLogger. `level` always applies to the
+    named logger, so a later call can still ask for DEBUG.
+    """
+    global _logging_configured
+    if not _logging_configured:
+        logging.basicConfig(
+            level=level,
+            format=LOG_FORMAT,
+            datefmt=DATE_FORMAT,
+            force=True  # Override any existing config
+        )
+        _logging_configured = True
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(level)
+    return logger
 
 # --- Path Utilities ---
 def ensure_workspace():
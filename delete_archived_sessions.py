@@ -4,19 +4,21 @@ Delete all archived Jules sessions.
 Uses unified Jules client and configuration.
 """
 
+import argparse
 import sys
 import os
 
 # Import unified configuration and client
 from common_config import setup_logging, setup_python_path
 from jules_client import get_jules_client
+from session_cleanup import add_cleanup_arguments, delete_sessions, select
 
 # Setup
 setup_python_path()
 logger = setup_logging("jules_session_deleter")
 
 
-def delete_archived_sessions():
+def delete_archived_sessions(args=None):
     """Delete all archived Jules sessions."""
     client = get_jules_client()
     
@@ -27,22 +29,17 @@ def delete_archived_sessions():
         logger.info("No archived sessions found to delete.")
         return
         
-    sessions_to_delete = [session.get("name") for session in sessions if session.get("name")]
+    sessions_to_delete = select(sessions)
     
     if not sessions_to_delete:
         logger.info("No valid session names found to delete.")
         return
         
     logger.info(f"Found {len(sessions_to_delete)} archived sessions to delete.")
-    
-    deleted_count = 0
-    for session_name in sessions_to_delete:
-        success = client.delete_session(session_name)
-        if success:
-            deleted_count += 1
-            
-    logger.info(f"Successfully deleted {deleted_count} of {len(sessions_to_delete)} archived sessions.")
+    delete_sessions(client, sessions_to_delete, args, label="archived sessions")
 
 
 if __name__ == "__main__":
-    delete_archived_sessions()
+    parser = argparse.ArgumentParser(description="Delete all archived Jules sessions")
+    add_cleanup_arguments(parser)
+    delete_archived_sessions(parser.parse_args())
@@ -4,9 +4,10 @@ import csv
 import os
 import sys
 
-# Try to import JulesClient for messaging capabilities
+# Try to import the Jules client factory for messaging capabilities
+# (jules_client is cheap to import; jules_ops pulls in the whole CLI)
 try:
-    from jules_ops import JulesClient
+    from jules_client import get_jules_client
 
     JULES_OPS_AVAILABLE = True
 except ImportError:
@@ -82,8 +83,8 @@ def send_message_to_session(session_id, message):
         return False
 
     try:
-        # JulesClient expects API key in env vars if not passed
-        client = JulesClient()
+        # Uses the workspace daemon if running, else JULES_API_KEY from env
+        client = get_jules_client()
         print(f"📨 Sending message to session {session_id}...")
         return client.send_message(session_id, message)
     except Exception as e:
@@ -105,7 +106,7 @@ def delete_session_via_client(session_id):
         return False
 
     try:
-        client = JulesClient()
+        client = get_jules_client()
         print(f"🗑️  Deleting session {session_id}...")
         client.delete_session(session_id)
         return True
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Per-stage resource profile for process_pr.py (`--profile`).
+
+Each pipeline stage records wall time, CPU time (process_pr itself plus
+the child processes it waited for, e.g. npm and everything npm spawned)
+and peak RSS. With psutil installed a sampler thread sums the RSS of the
+whole process tree while the stage runs; without it the peak comes from
+getrusage(RUSAGE_CHILDREN), which only moves when a child sets a new
+high-water mark, so stages that stay below an earlier one show "-".
+
+Runs are appended to data/process_pr_profiles.jsonl. To look for
+install/build regressions on leader:
+
+    python github-ops/pr_profile.py history --stage dependencies --stage verify
+    python github-ops/pr_profile.py trend --stage dependencies --metric cpu
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Add workspace root to path before other imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from common_config import get_data_dir
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+HISTORY_FILE = "process_pr_profiles.jsonl"
+SAMPLE_SECONDS = 0.2
+# The PR comment compares each stage with its median over this many earlier runs
+COMPARE_RUNS = 20
+# `trend` flags a leader commit when a stage median moves by more than this ratio...
+REGRESSION_RATIO = 0.25
+# ...and by at least this much in absolute terms (short stages are noisy)
+MIN_DELTA = {"wall_s": 5.0, "cpu_s": 5.0, "peak_rss_mb": 100.0}
+METRICS = {"wall": "wall_s", "cpu": "cpu_s", "rss": "peak_rss_mb"}
+DEFAULT_STAGES = ("sync", "dependencies", "verify", "audit")
+
+
+def history_path() -> Path:
+    return get_data_dir() / HISTORY_FILE
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process plus every child it has waited for."""
+    if resource is None:
+        return time.process_time()
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _child_maxrss_mb() -> Optional[float]:
+    """Largest RSS any waited-for child has reached so far."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class _RssSampler(threading.Thread):
+    """Polls the summed RSS of this process and all its descendants (needs psutil)."""
+
+    def __init__(self):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.peak = 0
+        self.finished = threading.Event()
+        self.process = psutil.Process()
+
+    def tree_rss(self) -> int:
+        total = 0
+        try:
+            processes = [self.process] + self.process.children(recursive=True)
+        except psutil.Error:
+            return 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass  # Exited between listing and reading
+        return total
+
+    def run(self):
+        while True:
+            self.peak = max(self.peak, self.tree_rss())
+            if self.finished.wait(SAMPLE_SECONDS):
+                return
+
+    def stop(self) -> float:
+        self.finished.set()
+        self.join()
+        return self.peak / (1024 * 1024)
+
+
+class StageProfiler:
+    """Collects one profile per process_pr stage; `meta` describes the run."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.stages: List[Dict[str, Any]] = []
+        self.meta: Dict[str, Any] = {}
+
+    @contextmanager
+    def measure(self, name: str, span=None) -> Iterator[None]:
+        sampler = _RssSampler() if psutil else None
+        if sampler:
+            sampler.start()
+        rss_before = _child_maxrss_mb()
+        cpu_before = _cpu_seconds()
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            wall = time.perf_counter() - started
+            cpu = _cpu_seconds() - cpu_before
+            rss_after = _child_maxrss_mb()
+            peak = rss_after if rss_after is not None and rss_after > (rss_before or 0) else None
+            if sampler:
+                peak = max(sampler.stop(), peak or 0)
+            profile = {
+                "stage": name,
+                "wall_s": round(wall, 3),
+                "cpu_s": round(cpu, 3),
+                "peak_rss_mb": round(peak, 1) if peak else None,
+                "status": status,
+            }
+            self.stages.append(profile)
+            if span is not None:
+                span.set(cpu_s=profile["cpu_s"], peak_rss_mb=profile["peak_rss_mb"])
+
+    def record(self) -> Dict[str, Any]:
+        return {
+            "ts": round(self.started, 3),
+            "date": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            **self.meta,
+            "rss_source": "psutil" if psutil else "resource",
+            "total_s": round(sum(s["wall_s"] for s in self.stages), 3),
+            "stages": self.stages,
+        }
+
+    def report(self, history: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Collapsible markdown table for the PR comment, compared with earlier runs."""
+        earlier = (history or [])[-COMPARE_RUNS:]
+        baseline = stage_medians(earlier)
+        total = sum(s["wall_s"] for s in self.stages)
+        lines = [
+            f"\n<details><summary>Stage Profile ({total:.1f}s)</summary>\n",
+            "| Stage | Wall | CPU | Peak RSS | vs. median |",
+            "|---|---|---|---|---|",
+        ]
+        for s in self.stages:
+            median = baseline.get(s["stage"])
+            change = "-"
+            if median:
+                change = f"{(s['wall_s'] - median) / median:+.0%} ({median:.1f}s)"
+            rss = f"{s['peak_rss_mb']:.0f} MB" if s["peak_rss_mb"] else "-"
+            flag = "" if s["status"] == "ok" else " [FAIL]"
+            lines.append(f"| {s['stage']}{flag} | {s['wall_s']:.1f}s | {s['cpu_s']:.1f}s | {rss} | {change} |")
+        rss_note = "process tree, sampled" if psutil else "largest child process"
+        lines.append(
+            f"\nCPU includes child processes. Peak RSS: {rss_note}. "
+            f"Medians over the last {len(earlier)} profiled run(s)."
+        )
+        lines.append("</details>")
+        return "\n".join(lines)
+
+
+# -------------------------------------------------------------------------
+# HISTORY
+# -------------------------------------------------------------------------
+
+def append_history(record: Dict[str, Any], path: Optional[Path] = None):
+    with open(path or history_path(), "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def load_history(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Profiled runs, oldest first; unreadable lines are skipped."""
+    path = path or history_path()
+    if not path.exists():
+        return []
+    runs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue
+    return runs
+
+
+def stage_values(runs: List[Dict[str, Any]], stage: str, key: str = "wall_s") -> List[float]:
+    """`key` for `stage` across runs, skipping failed stages (they stop early)."""
+    return [
+        s[key] for run in runs for s in run.get("stages", [])
+        if s["stage"] == stage and s.get("status") == "ok" and s.get(key) is not None
+    ]
+
+
+def stage_medians(runs: List[Dict[str, Any]], key: str = "wall_s") -> Dict[str, float]:
+    stages = {s["stage"] for run in runs for s in run.get("stages", [])}
+    medians = {}
+    for stage in stages:
+        values = stage_values(runs, stage, key)
+        if values:
+            medians[stage] = statistics.median(values)
+    return medians
+
+
+def trend(runs: List[Dict[str, Any]], stage: str, key: str = "wall_s") -> List[Dict[str, Any]]:
+    """
+    Median of `key` for `stage` per leader commit, in the order the commits
+    were first seen, each compared with the previous commit's median.
+    """
+    groups: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+    for run in runs:
+        groups.setdefault(run.get("leader_sha") or "unknown", []).append(run)
+
+    rows, previous = [], None
+    for leader, group in groups.items():
+        values = stage_values(group, stage, key)
+        if not values:
+            continue
+        median = statistics.median(values)
+        row = {"leader_sha": leader, "first_run": group[0].get("date", ""), "runs": len(values),
+               "median": median, "change": None, "regressed": False}
+        if previous:
+            row["change"] = (median - previous) / previous
+            row["regressed"] = (row["change"] > REGRESSION_RATIO
+                                and median - previous >= MIN_DELTA.get(key, 0))
+        rows.append(row)
+        previous = median
+    return rows
+
+
+# -------------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------------
+
+def _fmt(value: Optional[float], key: str) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.0f} MB" if key == "peak_rss_mb" else f"{value:.1f}s"
+
+
+def show_history(runs: List[Dict[str, Any]], stages: List[str], limit: int):
+    print(f"{'DATE':<20} {'PR':<6} {'LEADER':<9} {'OUTCOME':<8} " + " ".join(f"{s[:12]:>12}" for s in stages) + f" {'TOTAL':>9}")
+    print("-" * (47 + 13 * len(stages) + 10))
+    for run in runs[-limit:]:
+        by_stage = {s["stage"]: s for s in run.get("stages", [])}
+        cells = []
+        for stage in stages:
+            s = by_stage.get(stage)
+            cell = "-" if s is None else _fmt(s["wall_s"], "wall_s") + ("!" if s["status"] != "ok" else "")
+            cells.append(f"{cell:>12}")
+        print(f"{run.get('date', ''):<20} {str(run.get('pr', '')):<6} {(run.get('leader_sha') or '-')[:8]:<9} "
+              f"{run.get('outcome', '-'):<8} " + " ".join(cells) + f" {_fmt(run.get('total_s'), 'wall_s'):>9}")
+
+
+def show_trend(runs: List[Dict[str, Any]], stages: List[str], key: str, window: int) -> bool:
+    """Print per-leader medians; True if the latest leader commit regressed on any stage."""
+    latest_regressed = False
+    for stage in stages:
+        rows = trend(runs, stage, key)[-window:]
+        print(f"\n{stage} ({key}, median per leader commit)")
+        if not rows:
+            print("  no successful runs recorded")
+            continue
+        for row in rows:
+            change = "" if row["change"] is None else f"{row['change']:+.0%}"
+            flag = "  ⚠️ regression" if row["regressed"] else ""
+            print(f"  {row['leader_sha'][:8]:<9} {row['first_run']:<20} {row['runs']:>3} run(s) "
+                  f"{_fmt(row['median'], key):>9} {change:>6}{flag}")
+        latest_regressed = latest_regressed or rows[-1]["regressed"]
+    return latest_regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query process_pr.py --profile history")
+    parser.add_argument("--file", type=Path, help=f"History file (default: data/{HISTORY_FILE})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p_history = subparsers.add_parser("history", help="List recent profiled runs")
+    p_history.add_argument("--stage", action="append", help="Stage column to show (repeatable)")
+    p_history.add_argument("--pr", help="Only runs for this PR number")
+    p_history.add_argument("--limit", type=int, default=20, help="Number of runs (default: 20)")
+
+    p_trend = subparsers.add_parser("trend", help="Stage medians per leader commit")
+    p_trend.add_argument("--stage", action="append", help="Stage to show (repeatable)")
+    p_trend.add_argument("--metric", choices=sorted(METRICS), default="wall", help="Metric (default: wall)")
+    p_trend.add_argument("--window", type=int, default=10, help="Leader commits to show (default: 10)")
+    p_trend.add_argument("--check", action="store_true",
+                         help="Exit 1 if the latest leader commit regressed on a shown stage")
+
+    args = parser.parse_args()
+    runs = load_history(args.file)
+    if not runs:
+        print(f"No profiled runs in {args.file or history_path()}; run process_pr.py --profile first.")
+        return
+    stages = args.stage or list(DEFAULT_STAGES)
+
+    if args.command == "history":
+        if args.pr:
+            runs = [r for r in runs if str(r.get("pr")) == args.pr.lstrip("#")]
+        show_history(runs, stages, args.limit)
+    elif args.command == "trend":
+        if show_trend(runs, stages, METRICS[args.metric], args.window) and args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
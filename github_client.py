@@ -10,11 +10,53 @@ import shutil
 import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
 
-from common_config import HRM_REPO_DIR, setup_logging
+import telemetry
+from common_config import HRM_REPO_DIR
 
-logger = setup_logging("github_client")
+logger = logging.getLogger("github_client")
+
+ISSUE_LIST_FIELDS = "number,title,assignees,updatedAt,url"
+PR_LIST_FIELDS = "number,title,headRefName,baseRefName,headRefOid,state,url,reviewDecision,updatedAt"
+
+
+class _BlobReader:
+    """Reads many blobs through one long-lived `git cat-file --batch` pipe."""
+
+    def __init__(self, repo_path: Path):
+        self.proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=repo_path,
+        )
+
+    def read(self, oid: str) -> Optional[str]:
+        """Return the decoded blob for `oid`, or None if git cannot resolve it."""
+        self.proc.stdin.write(f"{oid}\n".encode())
+        self.proc.stdin.flush()
+        reply = self.proc.stdout.readline().decode().strip()
+        header = reply.split()
+        if len(header) != 3:
+            # "<oid> missing", "<oid> ambiguous" (or a dead pipe)
+            logger.warning(f"⚠️ git cat-file could not read blob {oid}: {reply or 'no reply'}")
+            return None
+        data = self.proc.stdout.read(int(header[2]))
+        self.proc.stdout.read(1)  # Trailing newline after each object
+        return data.decode("utf-8", errors="replace")
+
+    def close(self):
+        if self.proc.stdin:
+            self.proc.stdin.close()
+        self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 
 class GitHubClient:
@@ -34,27 +76,34 @@ class GitHubClient:
 
     def run_cmd(self, cmd_list: List[str], check: bool = True) -> Optional[str]:
         """Run a shell command in the repo directory."""
-        try:
-            # Check if command exists before running to avoid FileNotFoundError
-            executable = cmd_list[0]
-            if not shutil.which(executable):
-                 logger.error(f"❌ Executable '{executable}' not found.")
-                 return None
-
-            result = subprocess.run(
-                cmd_list,
-                capture_output=True,
-                text=True,
-                check=check,
-                cwd=self.repo_path,
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            logger.error(f"❌ Command failed: {' '.join(cmd_list)}")
-            logger.error(f"   Error: {e.stderr.strip()}")
-            if check:
-                raise
-            return None
+        # Check if command exists before running to avoid FileNotFoundError
+        executable = cmd_list[0]
+        if not shutil.which(executable):
+             logger.error(f"❌ Executable '{executable}' not found.")
+             return None
+
+        subcommand = cmd_list[1] if len(cmd_list) > 1 else None
+        with telemetry.span("github.cmd", tool=executable, command=subcommand) as span:
+            try:
+                result = subprocess.run(
+                    cmd_list,
+                    capture_output=True,
+                    text=True,
+                    check=check,
+                    cwd=self.repo_path,
+                )
+                span.set(returncode=result.returncode)
+                span.add("bytes_in", len(result.stdout))
+                if result.returncode:
+                    span.status = "error"
+                return result.stdout.strip()
+            except subprocess.CalledProcessError as e:
+                span.set(returncode=e.returncode)
+                logger.error(f"❌ Command failed: {' '.join(cmd_list)}")
+                logger.error(f"   Error: {e.stderr.strip()}")
+                if check:
+                    raise
+                return None
 
     def run_gh_json(self, cmd_list: List[str]) -> Any:
         """Run a gh command and parse JSON output."""
@@ -123,6 +172,120 @@ class GitHubClient:
                 self.run_cmd(["git", "merge", "--abort"], check=False)
             return False
 
+    def push_refs(self, remote: str, refspecs: Sequence[str]) -> Dict[str, bool]:
+        """
+        Push several refspecs (e.g. "<sha>:refs/heads/<branch>") in one
+        `git push` and return success per destination ref.
+        """
+        if not refspecs:
+            return {}
+        output = self.run_cmd(["git", "push", "--porcelain", remote, *refspecs], check=False) or ""
+        results = {spec.rsplit(":", 1)[-1]: False for spec in refspecs}
+        for line in output.splitlines():
+            # "<flag>\t<from>:<to>\t<summary>"; "!" means rejected
+            parts = line.split("\t")
+            if len(parts) >= 2 and ":" in parts[1]:
+                dest = parts[1].rsplit(":", 1)[-1]
+                if dest in results:
+                    results[dest] = not parts[0].startswith("!")
+        return results
+
+    def add_worktree(self, path: Union[str, Path], ref: str) -> bool:
+        """Create a detached worktree at `path` checked out at `ref`."""
+        try:
+            self.run_cmd(["git", "worktree", "add", "--detach", "--quiet", str(path), ref])
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def remove_worktree(self, path: Union[str, Path]):
+        self.run_cmd(["git", "worktree", "remove", "--force", str(path)], check=False)
+
+    def rev_parse(self, ref: str) -> Optional[str]:
+        return self.run_cmd(["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"], check=False) or None
+
+    def _git(self, *args: str) -> subprocess.CompletedProcess:
+        """Run git without raising; callers interpret the exit status."""
+        return subprocess.run(["git", *args], capture_output=True, text=True, cwd=self.repo_path)
+
+    def merge_without_checkout(
+        self,
+        target: str,
+        source: str,
+        message: Optional[str] = None,
+        update_ref: Optional[str] = None,
+        fast_forward: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Merge `source` into `target` entirely in the object database: the
+        tree comes from `git merge-tree --write-tree` and the commit from
+        `git commit-tree`, so no working tree or index is touched and many
+        merges can run in parallel against one repo.
+
+        With `update_ref` (e.g. "refs/heads/feature"), that ref is moved to
+        the result with `git update-ref <ref> <new> <old>`, which fails if
+        the ref no longer points at `target`'s commit.
+
+        Returns a dict with:
+          status:    merged | fast-forward | up-to-date | conflict |
+                     ref-moved | unsupported | error
+          commit:    resulting commit (None on conflict/error)
+          tree:      merged tree (also set for conflicts, with markers)
+          conflicts: [{"path": str, "stages": {1|2|3: {"mode", "oid"}}}]
+                     where 1 = merge base, 2 = target, 3 = source
+          messages:  git's informational lines ("CONFLICT (content): ...")
+        """
+        result: Dict[str, Any] = {
+            "status": "error", "commit": None, "tree": None, "conflicts": [], "messages": [],
+        }
+        target_oid, source_oid = self.rev_parse(target), self.rev_parse(source)
+        if not target_oid or not source_oid:
+            result["messages"] = [f"Unknown revision: {target if not target_oid else source}"]
+            return result
+
+        if self._git("merge-base", "--is-ancestor", source_oid, target_oid).returncode == 0:
+            result.update(status="up-to-date", commit=target_oid)
+            return result
+        if fast_forward and self._git("merge-base", "--is-ancestor", target_oid, source_oid).returncode == 0:
+            result.update(status="fast-forward", commit=source_oid)
+        else:
+            proc = self._git("merge-tree", "--write-tree", target_oid, source_oid)
+            if proc.returncode not in (0, 1):
+                # git < 2.38 has no --write-tree and prints usage
+                result["status"] = "unsupported" if "write-tree" in proc.stderr or proc.returncode == 129 else "error"
+                result["messages"] = proc.stderr.strip().splitlines()
+                return result
+
+            # "<tree>\n" [conflicted entries "<mode> <oid> <stage>\t<path>"] "\n" <messages>
+            lines = proc.stdout.split("\n")
+            result["tree"] = lines[0].strip()
+            rest = lines[1:]
+            if proc.returncode == 1:
+                conflicts: Dict[str, Dict[int, Dict[str, str]]] = {}
+                while rest and rest[0]:
+                    meta, path = rest.pop(0).split("\t", 1)
+                    mode, oid, stage = meta.split()
+                    conflicts.setdefault(path, {})[int(stage)] = {"mode": mode, "oid": oid}
+                result["conflicts"] = [{"path": p, "stages": st} for p, st in conflicts.items()]
+            result["messages"] = [line for line in rest if line.strip()]
+            if proc.returncode == 1:
+                result["status"] = "conflict"
+                return result
+
+            msg = message or f"Merge {source} into {target}"
+            commit = self._git("commit-tree", result["tree"], "-p", target_oid, "-p", source_oid, "-m", msg)
+            if commit.returncode != 0:
+                result["messages"].append(commit.stderr.strip())
+                return result
+            result.update(status="merged", commit=commit.stdout.strip())
+
+        if update_ref:
+            proc = self._git("update-ref", "-m", f"merge {source}", update_ref, result["commit"], target_oid)
+            if proc.returncode != 0:
+                result["status"] = "ref-moved"
+                result["messages"].append(proc.stderr.strip())
+        return result
+
     def fetch(self, remote: str = "origin") -> bool:
         try:
             self.run_cmd(["git", "fetch", remote])
@@ -165,6 +328,108 @@ class GitHubClient:
             logger.warning(f"Failed to fetch changed files between {base} and {head}")
             return []
 
+    def iter_file_diffs(
+        self,
+        base: str,
+        head: str,
+        paths: Optional[Sequence[str]] = None,
+        context_lines: int = 3,
+        with_content: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream per-file diffs between two revisions from a single `git diff`.
+
+        Yields dicts with `path`, `diff` (the text `get_diff` returns for that
+        file, except that the index line carries full object ids), `blob`
+        (object id at `head`, None if deleted) and, when
+        `with_content` is set, `content` read through one `git cat-file
+        --batch` pipe. `paths` are passed through as git pathspecs.
+        """
+        if not shutil.which("git"):
+            logger.error("❌ Executable 'git' not found.")
+            return
+
+        cmd = [
+            "git", "-c", "core.quotePath=false", "diff",
+            f"-U{context_lines}", "--no-color", "--no-ext-diff",
+            # Full ids: an abbreviated one can be ambiguous to cat-file in a big repo
+            "--full-index", f"{base}...{head}",
+        ]
+        if paths:
+            cmd.append("--")
+            cmd.extend(paths)
+
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            cwd=self.repo_path,
+        )
+        blobs = _BlobReader(self.repo_path) if with_content else None
+
+        def finish(path: Optional[str], lines: List[str], blob: Optional[str]):
+            entry = {"path": path, "diff": "".join(lines).strip(), "blob": blob}
+            if blobs is not None:
+                entry["content"] = blobs.read(blob) if blob else None
+            return entry
+
+        path, lines, blob = None, [], None
+        try:
+            for line in proc.stdout:
+                if line.startswith("diff --git "):
+                    if lines:
+                        yield finish(path, lines, blob)
+                    # "diff --git a/<old> b/<new>"; refined by "+++"/"rename to"
+                    path = line.rstrip("\n").rsplit(" b/", 1)[-1]
+                    lines, blob = [line], None
+                    continue
+
+                lines.append(line)
+                if line.startswith("index ") and ".." in line:
+                    new_oid = line.split()[1].split("..")[1]
+                    # All-zero id means the file is gone at head
+                    blob = new_oid if new_oid.strip("0") else None
+                elif line.startswith("+++ b/"):
+                    # git appends a tab to names containing spaces
+                    path = line[len("+++ b/"):].rstrip("\n").rstrip("\t")
+                elif line.startswith("rename to "):
+                    path = line[len("rename to "):].rstrip("\n")
+                elif line.startswith("deleted file mode"):
+                    blob = None
+
+            if lines:
+                yield finish(path, lines, blob)
+        finally:
+            proc.stdout.close()
+            stderr = proc.stderr.read()
+            proc.stderr.close()
+            if proc.wait() != 0:
+                logger.warning(
+                    f"Failed to fetch diff between {base} and {head}: "
+                    f"{stderr.strip()}"
+                )
+            if blobs is not None:
+                blobs.close()
+
+    def get_file_diffs(
+        self,
+        base: str,
+        head: str,
+        paths: Optional[Sequence[str]] = None,
+        context_lines: int = 3,
+        with_content: bool = True,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Collect `iter_file_diffs` into a dict keyed by file path."""
+        return {
+            entry["path"]: entry
+            for entry in self.iter_file_diffs(
+                base, head, paths, context_lines, with_content
+            )
+        }
+
     # --- GitHub Operations ---
 
     def get_pr(self, number: int) -> Optional[Dict[str, Any]]:
@@ -183,7 +448,7 @@ class GitHubClient:
                 "--limit",
                 str(limit),
                 "--json",
-                "number,title,headRefName,baseRefName,headRefOid,state,url,reviewDecision,updatedAt",
+                PR_LIST_FIELDS,
             ]
         ) or []
 
@@ -203,10 +468,17 @@ class GitHubClient:
                 "--limit",
                 str(limit),
                 "--json",
-                "number,title,assignees,updatedAt,url",
+                ISSUE_LIST_FIELDS,
             ]
         ) or []
 
+    def issue_titles(self, state: str = "open", limit: int = 10000) -> Dict[str, int]:
+        """Map issue title -> number for all issues in `state` (gh paginates past 100)."""
+        issues = self.run_gh_json(
+            ["gh", "issue", "list", "--state", state, "--limit", str(limit), "--json", "number,title"]
+        ) or []
+        return {issue["title"]: issue["number"] for issue in issues}
+
     def post_pr_comment(self, pr_number: int, body: str) -> bool:
         """Post a comment on a Pull Request."""
         try:
@@ -4,20 +4,117 @@ Unified Jules API client for hrm-workspace operations.
 Consolidates all Jules API interactions with consistent error handling.
 """
 
+import logging
 import os
 import sys
 import time
-import requests
-from typing import Optional, Dict, List, Any
-from common_config import setup_logging, JULES_API_BASE_URL, JULES_DEFAULT_SOURCE
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import telemetry
+from rate_limit import TokenBucket
+from common_config import JULES_API_BASE_URL, JULES_DEFAULT_SOURCE
 
-logger = setup_logging("jules_client")
+logger = logging.getLogger("jules_client")
+
+# Client-wide request budget; override with JULES_API_RPS
+DEFAULT_REQUESTS_PER_SECOND = float(os.environ.get("JULES_API_RPS", "5"))
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Message that asks a finished session to push its branch and open a PR
+PUBLISH_PROMPT = "Please publish the branch and create the Pull Request now."
+
+
+def _route(endpoint: str) -> str:
+    """Metric label for an endpoint: ids replaced, e.g. "sessions/{id}:sendMessage"."""
+    path = endpoint.split("?", 1)[0]
+    collection, _, rest = path.partition("/")
+    if not rest:
+        return collection
+    action = rest.rsplit(":", 1)[1] if ":" in rest else ""
+    return f"{collection}/{{id}}" + (f":{action}" if action else "")
+
+
+def _rfc3339(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SessionQuery:
+    """
+    Typed filter for `list_sessions`. State and create-time terms are sent to
+    the API as a filter string; `where()` predicates only run locally.
+    `matches()` re-checks every term, so results stay correct even when the
+    server ignores or rejects part of the filter.
+
+        SessionQuery().states("RUNNING").created_before(hours_ago=24)
+    """
+
+    def __init__(self):
+        self.include_states: Tuple[str, ...] = ()
+        self.exclude_states: Tuple[str, ...] = ()
+        self.after: Optional[datetime] = None
+        self.before: Optional[datetime] = None
+        self.predicates: List[Callable[[Dict[str, Any]], bool]] = []
+
+    def states(self, *states: str) -> "SessionQuery":
+        self.include_states = tuple(states)
+        return self
+
+    def exclude(self, *states: str) -> "SessionQuery":
+        self.exclude_states = tuple(states)
+        return self
+
+    def created_after(self, when: Optional[datetime] = None, hours_ago: Optional[float] = None) -> "SessionQuery":
+        self.after = when or datetime.now(timezone.utc) - timedelta(hours=hours_ago or 0)
+        return self
+
+    def created_before(self, when: Optional[datetime] = None, hours_ago: Optional[float] = None) -> "SessionQuery":
+        self.before = when or datetime.now(timezone.utc) - timedelta(hours=hours_ago or 0)
+        return self
+
+    def where(self, predicate: Callable[[Dict[str, Any]], bool]) -> "SessionQuery":
+        self.predicates.append(predicate)
+        return self
+
+    def to_filter(self, include_time: bool = True) -> Optional[str]:
+        """AIP-160 filter string for the server-side terms, or None."""
+        terms = []
+        if self.include_states:
+            terms.append("(" + " OR ".join(f'state="{s}"' for s in self.include_states) + ")")
+        terms.extend(f'state!="{s}"' for s in self.exclude_states)
+        if include_time and self.after:
+            terms.append(f'create_time>"{_rfc3339(self.after)}"')
+        if include_time and self.before:
+            terms.append(f'create_time<"{_rfc3339(self.before)}"')
+        return " AND ".join(terms) or None
+
+    def matches(self, session: Dict[str, Any]) -> bool:
+        state = session.get("state")
+        if self.include_states and state not in self.include_states:
+            return False
+        if state in self.exclude_states:
+            return False
+        if self.after or self.before:
+            created = session.get("createTime")
+            try:
+                created_at = datetime.fromisoformat(created.replace("Z", "+00:00")) if created else None
+            except ValueError:
+                created_at = None
+            if created_at is None:
+                return False
+            if self.after and created_at <= self.after:
+                return False
+            if self.before and created_at >= self.before:
+                return False
+        return all(predicate(session) for predicate in self.predicates)
 
 
 class JulesClient:
     """Unified client for interacting with the Jules API."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND):
         self.api_key = api_key or os.environ.get("JULES_API_KEY")
         
         if not self.api_key:
@@ -27,43 +124,67 @@ class JulesClient:
             )
             sys.exit(1)
         
+        import requests  # Deferred: only needed once a client exists
+
         self.session = requests.Session()
         self.session.headers.update({
             "Content-Type": "application/json",
             "X-Goog-Api-Key": self.api_key,
         })
+        # Shared by every thread using this client (0 disables limiting)
+        self.limiter = TokenBucket(requests_per_second)
         
     def _request(self, method: str, endpoint: str, data: Optional[Dict] = None, 
                 params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
         """Make a request to the Jules API with consistent error handling."""
+        import requests
+
         url = f"{JULES_API_BASE_URL}/{endpoint}"
         
-        try:
-            response = self.session.request(
-                method, url, json=data, params=params, timeout=30
-            )
-            response.raise_for_status()
-            
-            if response.status_code == 204 or not response.content:
-                return {}
-            
-            return response.json()
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                logger.debug(f"Resource not found (404): {endpoint}")
-                return {"error": "not_found", "status_code": 404}
-            
-            logger.error(f"HTTP Error {e.response.status_code}: {e.response.text}")
-            return {"error": "http_error", "status_code": e.response.status_code, "message": e.response.text}
-            
-        except requests.exceptions.Timeout:
-            logger.error(f"Request timeout for: {endpoint}")
-            return {"error": "timeout"}
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed for {endpoint}: {e}")
-            return {"error": "request_failed", "message": str(e)}
+        with telemetry.span("jules.request", method=method, route=_route(endpoint)) as span:
+            try:
+                for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                    self.limiter.acquire()
+                    response = self.session.request(
+                        method, url, json=data, params=params, timeout=30
+                    )
+                    span.add("bytes_out", len(response.request.body or b""))
+                    span.add("bytes_in", len(response.content))
+                    if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                        break
+                    span.add("retries")
+                    retry_after = response.headers.get("Retry-After", "")
+                    delay = float(retry_after) if retry_after.isdigit() else 2 ** attempt
+                    logger.warning(f"Rate limited on {endpoint}; retrying in {delay:.0f}s")
+                    time.sleep(delay)
+                span.label(status=response.status_code)
+                response.raise_for_status()
+                
+                if response.status_code == 204 or not response.content:
+                    return {}
+                
+                return response.json()
+                
+            except requests.exceptions.HTTPError as e:
+                span.status = "error"
+                if e.response.status_code == 404:
+                    logger.debug(f"Resource not found (404): {endpoint}")
+                    return {"error": "not_found", "status_code": 404}
+                
+                logger.error(f"HTTP Error {e.response.status_code}: {e.response.text}")
+                return {"error": "http_error", "status_code": e.response.status_code, "message": e.response.text}
+                
+            except requests.exceptions.Timeout:
+                span.label(status="timeout")
+                span.status = "error"
+                logger.error(f"Request timeout for: {endpoint}")
+                return {"error": "timeout"}
+                
+            except requests.exceptions.RequestException as e:
+                span.label(status="failed")
+                span.status = "error"
+                logger.error(f"Request failed for {endpoint}: {e}")
+                return {"error": "request_failed", "message": str(e)}
             
     def list_sources(self, filter_str: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get list of available sources."""
@@ -76,6 +197,13 @@ class JulesClient:
         
     def list_sessions(self, filter: Optional[str] = None, page_size: int = 100) -> List[Dict[str, Any]]:
         """Get all sessions with pagination."""
+        all_sessions, _ = self._list_session_pages(filter, page_size)
+        logger.info(f"Retrieved {len(all_sessions)} total sessions")
+        return all_sessions
+
+    def _list_session_pages(self, filter: Optional[str] = None,
+                            page_size: int = 100) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """All pages for `filter`, plus the error response that stopped paging (if any)."""
         all_sessions = []
         next_page_token = None
         
@@ -93,7 +221,7 @@ class JulesClient:
             
             if not response or "error" in response:
                 logger.warning(f"Failed to fetch sessions page: {response}")
-                break
+                return all_sessions, response or {"error": "empty_response"}
                 
             sessions = response.get("sessions", [])
             all_sessions.extend(sessions)
@@ -102,8 +230,27 @@ class JulesClient:
             if not next_page_token:
                 break
                 
-        logger.info(f"Retrieved {len(all_sessions)} total sessions")
-        return all_sessions
+        return all_sessions, None
+
+    def query_sessions(self, query: SessionQuery, page_size: int = 100) -> List[Dict[str, Any]]:
+        """
+        Sessions matching `query`. Its state/time terms are pushed to the API;
+        if the API rejects the filter (HTTP 400) it is retried with state terms
+        only, then unfiltered. Whatever the server did not filter is filtered here.
+        """
+        attempts = list(dict.fromkeys([query.to_filter(), query.to_filter(include_time=False), None]))
+        sessions: List[Dict[str, Any]] = []
+        for i, filter_str in enumerate(attempts):
+            sessions, error = self._list_session_pages(filter_str, page_size)
+            if not error or error.get("status_code") != 400 or i == len(attempts) - 1:
+                break
+            logger.info(f"Server rejected filter {filter_str!r}; retrying with fewer terms")
+        matched = [s for s in sessions if query.matches(s)]
+        logger.info(
+            f"Retrieved {len(sessions)} sessions for filter {filter_str!r}; "
+            f"{len(matched)} match after local filtering"
+        )
+        return matched
         
     def get_session(self, session_name: str) -> Optional[Dict[str, Any]]:
         """Get details for a specific session."""
@@ -226,6 +373,19 @@ class JulesClient:
         logger.warning("Session succeeded but no PR URL found in outputs")
 
 
-def get_jules_client(api_key: Optional[str] = None) -> JulesClient:
-    """Factory function to get a Jules client instance."""
-    return JulesClient(api_key)
\ No newline at end of file
+def get_jules_client(api_key: Optional[str] = None,
+                     requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                     use_daemon: bool = True) -> JulesClient:
+    """
+    Factory function to get a Jules client instance. Unless an API key is
+    passed explicitly, a running workspace daemon (`jules_ops.py serve`)
+    serves the calls from its warm client, rate limiter and session index.
+    """
+    if use_daemon and api_key is None:
+        from workspace_daemon import RemoteJulesClient, connect
+
+        daemon = connect()
+        if daemon is not None:
+            logger.debug("Using the workspace daemon")
+            return RemoteJulesClient(daemon)
+    return JulesClient(api_key, requests_per_second=requests_per_second)
\ No newline at end of file
@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import importlib.util
 import json
 import os
-import re
 import shutil
 import subprocess
 import sys
@@ -14,22 +14,22 @@ from datetime import datetime, timezone
 # Import unified configuration and client
 from common_config import (
     setup_logging, setup_python_path, ensure_workspace, get_data_dir,
-    HRM_REPO_DIR, JULES_DEFAULT_SOURCE
+    HRM_REPO_DIR, JULES_DEFAULT_SOURCE, DAEMON_HOST, DAEMON_PORT
 )
-from jules_client import get_jules_client
+from jules_client import PUBLISH_PROMPT, SessionQuery, get_jules_client
 from github_client import GitHubClient
+from workstreams import correlate_data, normalize_issues, normalize_prs, normalize_sessions
 
-# Optional Pandas Import
-try:
-    import pandas as pd
-    HAS_PANDAS = True
-except ImportError:
-    HAS_PANDAS = False
+# Optional Pandas support; imported only when a pandas view/export runs
+HAS_PANDAS = importlib.util.find_spec("pandas") is not None
 
-# Setup
+def _pandas():
+    import pandas
+    return pandas
+
+# Setup (logging and workspace checks happen in main(), not at import)
 setup_python_path()
-ensure_workspace()
-logger = setup_logging("jules_ops", level=logging.INFO)
+logger = logging.getLogger("jules_ops")
 
 # Backward compatibility
 GIT_REPO_PATH = str(HRM_REPO_DIR)
@@ -40,12 +40,32 @@ DEFAULT_SOURCE = JULES_DEFAULT_SOURCE
 # GITHUB UTILITIES
 # -------------------------------------------------------------------------
 
-# Initialized GitHub Client
-gh_client = GitHubClient(repo_path=HRM_REPO_DIR)
+_gh_client = None
+
+def get_gh_client() -> GitHubClient:
+    """
+    The shared GitHub client, created on first use. When the workspace
+    daemon is running, open issue/PR listings are served from its index.
+    """
+    global _gh_client
+    if _gh_client is None:
+        import workspace_daemon
+        daemon = workspace_daemon.connect()
+        if daemon is not None:
+            _gh_client = workspace_daemon.RemoteGitHubClient(daemon, repo_path=HRM_REPO_DIR)
+        else:
+            _gh_client = GitHubClient(repo_path=HRM_REPO_DIR)
+    return _gh_client
+
+def __getattr__(name):
+    # Keeps `from jules_ops import gh_client` working without eager construction
+    if name == "gh_client":
+        return get_gh_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def fetch_issue_context(issue_number):
     logger.info(f"📥 Fetching context from Issue #{issue_number}...")
-    data = gh_client.get_issue(issue_number)
+    data = get_gh_client().get_issue(issue_number)
 
     if data:
         return {
@@ -100,183 +120,13 @@ def get_state_icon(state, created_at_iso):
     return "⚪"
 
 
-# -------------------------------------------------------------------------
-# 3. DATA PROCESSING & CORRELATION
-# -------------------------------------------------------------------------
-
-
-def extract_issue_id(text):
-    """Heuristic to find Issue ID in branches/titles."""
-    if not text:
-        return None
-    match = re.search(r"#(\d+)", text)
-    if match:
-        return match.group(1)
-    match = re.search(r"issue[-/](\d+)", text, re.IGNORECASE)
-    if match:
-        return match.group(1)
-    return None
-
-
-def normalize_sessions(sessions):
-    data = []
-    for s in sessions:
-        outputs = s.get("outputs", [])
-        pr_url = None
-        for o in outputs:
-            if "pullRequest" in o:
-                pr_url = o["pullRequest"].get("url")
-                break
-
-        sid = (
-            s.get("name", "").split("/")[-1]
-            if "/" in s.get("name", "")
-            else s.get("name", "N/A")
-        )
-
-        # Extract branch directly from session sourceContext
-        session_branch = (
-            s.get("sourceContext", {})
-            .get("githubRepoContext", {})
-            .get("startingBranch")
-        )
-
-        data.append(
-            {
-                "id": sid,
-                "full_name": s.get("name"),
-                "state": s.get("state"),
-                "created_at": s.get("createTime"),
-                "title": s.get("title", "").split("\n")[0],
-                "pr_url": pr_url,
-                "branch": session_branch,  # Add the branch here
-            }
-        )
-    return data
-
-
-def normalize_issues(issues):
-    data = []
-    for i in issues:
-        assignees = [a["login"] for a in i.get("assignees", [])]
-        data.append(
-            {
-                "id": str(i.get("number")),
-                "title": i.get("title"),
-                "assignees": ", ".join(assignees),
-                "updated_at": i.get("updatedAt"),
-                "url": i.get("url"),
-            }
-        )
-    return data
-
-
-def normalize_prs(prs):
-    data = []
-    for p in prs:
-        data.append(
-            {
-                "id": str(p.get("number")),
-                "title": p.get("title"),
-                "branch": p.get("headRefName"),
-                "review": p.get("reviewDecision"),
-                "updated_at": p.get("updatedAt"),
-                "url": p.get("url"),
-            }
-        )
-    return data
-
-
-def correlate_data(sessions, issues, prs):
-    """Groups data into Workstreams."""
-    normalized_sessions = normalize_sessions(sessions)
-    normalized_issues = normalize_issues(issues)
-    normalized_prs = normalize_prs(prs)
-
-    issue_map = {i["id"]: i for i in normalized_issues}
-    pr_map_by_url = {p["url"]: p for p in normalized_prs}
-
-    workstreams = []
-
-    # 1. Start with Sessions
-    for s in normalized_sessions:
-        row = {
-            "session_id": s["id"],
-            "session_state": s["state"],
-            "session_title": s["title"],
-            "session_created": s["created_at"],
-            "last_activity": s["created_at"],  # default
-            "pr_id": None,
-            "pr_status": None,
-            "branch": s["branch"],  # Initialize branch from session data
-            "issue_id": None,
-            "issue_title": None,
-        }
-
-        # Link PR
-        if s["pr_url"] and s["pr_url"] in pr_map_by_url:
-            pr = pr_map_by_url[s["pr_url"]]
-            row["pr_id"] = f"#{pr['id']}"
-            row["pr_status"] = pr["review"]
-            row["branch"] = pr["branch"]
-            row["last_activity"] = pr[
-                "updated_at"
-            ]  # PR update is newer than session create
-
-            # Link Issue via PR
-            found_issue = extract_issue_id(pr["branch"]) or extract_issue_id(
-                pr["title"]
-            )
-            if found_issue:
-                row["issue_id"] = f"#{found_issue}"
-                if found_issue in issue_map:
-                    row["issue_title"] = issue_map[found_issue]["title"]
-
-        # Link Issue via Session Title
-        if not row["issue_id"]:
-            found_issue = extract_issue_id(s["title"])
-            if found_issue:
-                row["issue_id"] = f"#{found_issue}"
-                if found_issue in issue_map:
-                    row["issue_title"] = issue_map[found_issue]["title"]
-
-        workstreams.append(row)
-
-    # 2. Catch Orphan PRs
-    linked_pr_urls = {s["pr_url"] for s in normalized_sessions if s["pr_url"]}
-    for p in normalized_prs:
-        if p["url"] not in linked_pr_urls:
-            iid = extract_issue_id(p["branch"]) or extract_issue_id(p["title"])
-            workstreams.append(
-                {
-                    "session_id": "-",
-                    "session_state": "-",
-                    "session_title": "-",
-                    "session_created": "-",
-                    "last_activity": p["updated_at"],
-                    "pr_id": f"#{p['id']}",
-                    "pr_status": p["review"],
-                    "branch": p["branch"],
-                    "issue_id": f"#{iid}" if iid else None,
-                    "issue_title": (
-                        issue_map[iid]["title"]
-                        if (iid and iid in issue_map)
-                        else None
-                    ),
-                }
-            )
-
-    # Sort by last_activity
-    workstreams.sort(key=lambda x: x.get("last_activity") or "", reverse=True)
-    return workstreams
-
-
 # -------------------------------------------------------------------------
 # 4. DASHBOARD & EXPORT
 # -------------------------------------------------------------------------
 
 
 def print_pandas_dashboard(sessions, issues, prs):
+    pd = _pandas()
     workstreams = correlate_data(sessions, issues, prs)
     df_ws = pd.DataFrame(workstreams)
 
@@ -339,44 +189,53 @@ def print_pandas_dashboard(sessions, issues, prs):
         print("No orphaned issues.")
 
 
-def print_dashboard(sessions, issues, prs):
-    workstreams = correlate_data(sessions, issues, prs)
+WORKSTREAM_HEADER = (
+    f"{'UPDATED':<9} {'ISSUE':<8} {'SESSION':<18} {'ST':<4} "
+    f"{'PR':<6} {'REV':<4} {'TASK'}"
+)
 
-    print("\nACTIVE WORKSTREAMS (Correlated)")
-    print(
-        f"{'UPDATED':<9} {'ISSUE':<8} {'SESSION':<18} {'ST':<4} "
-        f"{'PR':<6} {'REV':<4} {'TASK'}"
-    )
-    print("-" * 100)
 
-    for w in workstreams[:25]:
-        updated = format_time(w["last_activity"])[:9]
-        issue = w["issue_id"] or "-"
-        sess = w["session_id"][:16] or "-"
-
-        # Use Icon for state
-        state_icon = get_state_icon(w["session_state"], w["session_created"])
-
-        pr = w["pr_id"] or "-"
-
-        # Review Icon
-        rev = w["pr_status"] or ""
-        rev_icon = (
-            "✅"
-            if rev == "APPROVED"
-            else (
-                "🚫"
-                if rev == "CHANGES_REQUESTED"
-                else "👀" if rev == "REVIEW_REQUIRED" else "-"
-            )
-        )
+def format_workstream(w, task_width=35):
+    """One workstream as a dashboard table line (see WORKSTREAM_HEADER)."""
+    updated = format_time(w["last_activity"])[:9]
+    issue = w["issue_id"] or "-"
+    sess = w["session_id"][:16] or "-"
 
-        task = w["issue_title"] or w["session_title"] or ""
+    # Use Icon for state
+    state_icon = get_state_icon(w["session_state"], w["session_created"])
 
-        print(
-            f"{updated:<9} {issue:<8} {sess:<18} "
-            f"{state_icon:<4} {pr:<6} {rev_icon:<4} {task[:35]}"
+    pr = w["pr_id"] or "-"
+
+    # Review Icon
+    rev = w["pr_status"] or ""
+    rev_icon = (
+        "✅"
+        if rev == "APPROVED"
+        else (
+            "🚫"
+            if rev == "CHANGES_REQUESTED"
+            else "👀" if rev == "REVIEW_REQUIRED" else "-"
         )
+    )
+
+    task = w["issue_title"] or w["session_title"] or ""
+
+    return (
+        f"{updated:<9} {issue:<8} {sess:<18} "
+        f"{state_icon:<4} {pr:<6} {rev_icon:<4} {task[:task_width]}"
+    )
+
+
+def print_dashboard(sessions, issues, prs, workstreams=None):
+    if workstreams is None:
+        workstreams = correlate_data(sessions, issues, prs)
+
+    print("\nACTIVE WORKSTREAMS (Correlated)")
+    print(WORKSTREAM_HEADER)
+    print("-" * 100)
+
+    for w in workstreams[:25]:
+        print(format_workstream(w))
 
     print("\n📢 OPEN ISSUES (Raw List)")
     print(f"{'ID':<6} {'UPDATED':<10} {'TITLE'}")
@@ -388,6 +247,34 @@ def print_dashboard(sessions, issues, prs):
         )
 
 
+def run_live_status(client):
+    """
+    `status --live`. Uses the running daemon's index, or keeps an in-process
+    one that refreshes active sessions adaptively. False if the terminal
+    cannot host the live view.
+    """
+    import workspace_daemon
+    from workspace_live import run_live
+
+    daemon = workspace_daemon.connect()
+    if daemon is not None:
+        def fetch(**view):
+            return daemon.call("view", **view)
+
+        def refresh():
+            return daemon.call("refresh")
+    else:
+        local = workspace_daemon.WorkspaceDaemon(client, get_gh_client(), adaptive=True)
+        local.start()
+        fetch = local.rpc_view
+
+        def refresh():
+            local.refresh_sessions(full=True)
+            local.refresh_github()
+
+    return run_live(fetch, WORKSTREAM_HEADER, format_workstream, refresh)
+
+
 def export_data(sessions, issues, prs, fmt="csv"):
     """Exports data to files, using Pandas if available."""
     workstreams = correlate_data(sessions, issues, prs)
@@ -410,7 +297,7 @@ def export_data(sessions, issues, prs, fmt="csv"):
         try:
             if HAS_PANDAS:
                 # Use Pandas for robust export
-                df = pd.DataFrame(data)
+                df = _pandas().DataFrame(data)
                 if fmt == "csv":
                     df.to_csv(filename, index=False)
                 elif fmt == "json":
@@ -477,12 +364,18 @@ def generate_markdown_summary(sessions):
 
 
 def main():
+    from session_cleanup import add_cleanup_arguments
+
     parser = argparse.ArgumentParser(
         description="Jules Ops & GitHub Sync Tool"
     )
     parser.add_argument(
         "--api-key", help="Jules API Key (or set JULES_API_KEY env)"
     )
+    parser.add_argument(
+        "--no-daemon", action="store_true",
+        help="Don't use a running workspace daemon (same as HRM_NO_DAEMON=1)",
+    )
 
     subparsers = parser.add_subparsers(
         dest="command", help="Available commands"
@@ -496,6 +389,10 @@ def main():
         default="table",
         help="Output style",
     )
+    p_status.add_argument(
+        "--live", action="store_true",
+        help="Keep a live, top-like view open (sort/filter keys; q quits)",
+    )
 
     # Export
     p_export = subparsers.add_parser("export", help="Export data to files")
@@ -548,6 +445,7 @@ def main():
     p_del_old.add_argument(
         "hours_old", type=int, default=10, help="Sessions older than this many hours will be deleted"
     )
+    add_cleanup_arguments(p_del_old)
 
     # Health Check
     p_health = subparsers.add_parser(
@@ -556,12 +454,33 @@ def main():
     p_health.add_argument(
         "--clean", action="store_true", help="Automatically delete stalled/orphaned sessions"
     )
+    add_cleanup_arguments(p_health)
 
     subparsers.add_parser("list-sources", help="List available Jules sources")
     subparsers.add_parser(
         "summary", help="Generate Markdown summary of sessions"
     )
 
+    # Workspace daemon
+    p_serve = subparsers.add_parser(
+        "serve", help="Run the workspace daemon (warm clients and session/PR index)"
+    )
+    p_serve.add_argument("--host", default=DAEMON_HOST, help=f"Listen address (default: {DAEMON_HOST})")
+    p_serve.add_argument("--port", type=int, default=DAEMON_PORT, help=f"Listen port (default: {DAEMON_PORT})")
+    p_serve.add_argument(
+        "--session-interval", type=float,
+        help="Seconds between session refreshes (default: the daemon's)",
+    )
+    p_serve.add_argument(
+        "--github-interval", type=float,
+        help="Seconds between issue/PR refreshes (default: the daemon's)",
+    )
+
+    p_dash = subparsers.add_parser(
+        "dashboard", help="Open the live web dashboard (starts the daemon if needed)"
+    )
+    p_dash.add_argument("--no-browser", action="store_true", help="Print the URL instead of opening it")
+
     args = parser.parse_args()
 
     # --- Execution ---
@@ -569,16 +488,74 @@ def main():
         parser.print_help()
         return
 
-    # Initialize Client
+    setup_logging("jules_ops", level=logging.INFO)
+    ensure_workspace()
+    import telemetry
+    telemetry.configure_from_env(service=f"jules_ops.{args.command}")
+
+    if args.no_daemon:
+        os.environ["HRM_NO_DAEMON"] = "1"  # Also covers child processes
+
+    if args.command in ["serve", "dashboard"]:
+        import workspace_daemon
+        from workspace_dashboard import DashboardRequestHandler, dashboard_url
+
+        def show_dashboard(host, port, token):
+            url = dashboard_url(host, port, token)
+            print(f"📊 Dashboard: {url}")
+            if args.command == "dashboard" and not args.no_browser:
+                import webbrowser
+                webbrowser.open(url)
+
+        daemon = workspace_daemon.connect() if args.command == "dashboard" else None
+        if daemon is not None:
+            show_dashboard(daemon.host, daemon.port, daemon.token)
+            return
+        workspace_daemon.serve(
+            api_key=args.api_key,
+            host=getattr(args, "host", DAEMON_HOST),
+            port=getattr(args, "port", DAEMON_PORT),
+            session_interval=getattr(args, "session_interval", None) or workspace_daemon.SESSION_REFRESH_SECONDS,
+            github_interval=getattr(args, "github_interval", None) or workspace_daemon.GITHUB_REFRESH_SECONDS,
+            handler=DashboardRequestHandler,
+            on_start=show_dashboard,
+        )
+        return
+
+    # Initialize Client (served by the workspace daemon when one is running)
     client = get_jules_client(api_key=args.api_key)
 
+    if args.command == "status" and args.live:
+        if run_live_status(client):
+            return
+        logger.warning("--live needs an interactive terminal with curses; showing a snapshot.")
+
     # Common Fetch Logic for Status and Export
     if args.command in ["status", "export"]:
-        logger.info("🔄 Refreshing data from Jules and GitHub...")
-        sessions = client.list_sessions()
+        import workspace_daemon
+
+        workstreams, snapshot, gh = None, None, None
+        daemon = workspace_daemon.connect()
+        if daemon is not None:
+            try:
+                snapshot = daemon.call("snapshot", workstreams=True)
+            except (workspace_daemon.DaemonError, OSError) as e:
+                # Don't route each fallback call through a daemon that just failed
+                logger.warning(f"{e}; fetching directly instead")
+                client = get_jules_client(api_key=args.api_key, use_daemon=False)
+                gh = GitHubClient(repo_path=HRM_REPO_DIR)
+        if snapshot is not None:
+            sessions, issues, prs = snapshot["sessions"], snapshot["issues"], snapshot["prs"]
+            workstreams = snapshot["workstreams"]
+            age = time.time() - min(snapshot["refreshed"].values())
+            logger.info(f"⚡ Using workspace daemon state (refreshed {age:.0f}s ago)")
+        else:
+            logger.info("🔄 Refreshing data from Jules and GitHub...")
+            sessions = client.list_sessions()
 
-        issues = gh_client.list_issues(state="open", limit=100)
-        prs = gh_client.list_prs(state="open", limit=100)
+            gh = gh or get_gh_client()
+            issues = gh.list_issues(state="open", limit=100)
+            prs = gh.list_prs(state="open", limit=100)
 
         if args.command == "status":
             if args.style == "pandas":
@@ -590,7 +567,7 @@ def main():
                     )
                     print_dashboard(sessions, issues, prs)
             else:
-                print_dashboard(sessions, issues, prs)
+                print_dashboard(sessions, issues, prs, workstreams)
 
         elif args.command == "export":
             export_data(sessions, issues, prs, fmt=args.format)
@@ -634,10 +611,7 @@ def main():
             client.monitor_session(args.session_name)
 
     elif args.command == "publish":
-        if client.send_message(
-            args.session_name,
-            "Please publish the branch and create the Pull Request now.",
-        ):
+        if client.send_message(args.session_name, PUBLISH_PROMPT):
             logger.info("📨 Publish request sent to Jules.")
             logger.info("   Monitoring for PR link...")
             client.monitor_session(args.session_name)
@@ -649,55 +623,30 @@ def main():
         # New command to delete old sessions
         hours_old = args.hours_old
         logger.info(f"🗑️ Deleting sessions older than {hours_old} hours...")
-        sessions = client.list_sessions()
-        deleted_count = 0
-        for s in sessions:
-            created_at_iso = s.get("createTime")
-            if created_at_iso:
-                try:
-                    dt_utc = datetime.fromisoformat(created_at_iso.replace("Z", "+00:00"))
-                    now_utc = datetime.now(timezone.utc)
-                    delta = now_utc - dt_utc
-
-                    if delta.total_seconds() > hours_old * 3600:
-                        session_id = (
-                            s.get("name", "").split("/")[-1]
-                            if "/" in s.get("name", "")
-                            else s.get("name", "N/A")
-                        )
-                        logger.info(f"    Deleting session: {session_id} (Created: {format_time(created_at_iso)})")
-                        client.delete_session(session_id)
-                        deleted_count += 1
-                        time.sleep(1)  # Add a delay to avoid rate-limiting
-                except ValueError as e:
-                    logger.warning(f"Could not parse createTime '{created_at_iso}' for session {s.get('name', 'N/A')}: {e}")
-        logger.info(f"✅ Deleted {deleted_count} sessions older than {hours_old} hours.")
+        from session_cleanup import delete_sessions, select
+        # Only sessions past the cutoff are transferred when the API honours the filter
+        old_sessions = select(client.query_sessions(SessionQuery().created_before(hours_ago=hours_old)))
+        report = delete_sessions(client, old_sessions, args, label=f"sessions older than {hours_old} hours")
+        logger.info(f"✅ Deleted {report.counts().get('deleted', 0)} sessions older than {hours_old} hours.")
 
     elif args.command == "health-check":
         logger.info("🏥 Running Session Health Check...")
-        sessions = client.list_sessions()
-        prs = gh_client.list_prs(state="all", limit=100) # Need closed/merged too
+        from session_cleanup import TERMINAL_STATES, delete_sessions, select
+        # Stalled and orphaned sessions are both still active; skip finished ones server-side
+        sessions = client.query_sessions(SessionQuery().exclude(*TERMINAL_STATES))
+        prs = get_gh_client().list_prs(state="all", limit=100) # Need closed/merged too
 
         pr_map = {p['url']: p for p in prs}
 
         stalled_sessions = []
         orphaned_sessions = []
 
-        now_utc = datetime.now(timezone.utc)
+        # Check stalled: Running for > 24h
+        stalled = SessionQuery().states("RUNNING").created_before(hours_ago=24)
 
         for s in sessions:
-            sid = s.get("name", "").split("/")[-1]
-            state = s.get("state")
-            created_at_iso = s.get("createTime")
-
-            # Check stalled: Running for > 24h
-            if state == "RUNNING" and created_at_iso:
-                try:
-                    dt_utc = datetime.fromisoformat(created_at_iso.replace("Z", "+00:00"))
-                    if (now_utc - dt_utc).total_seconds() > 24 * 3600:
-                        stalled_sessions.append(s)
-                except ValueError:
-                    pass
+            if stalled.matches(s):
+                stalled_sessions.append(s)
 
             # Check orphaned: Associated PR is closed/merged but session is active
             outputs = s.get("outputs", [])
@@ -706,7 +655,7 @@ def main():
                     pr_url = o["pullRequest"].get("url")
                     if pr_url in pr_map:
                         pr = pr_map[pr_url]
-                        if pr['state'] in ['MERGED', 'CLOSED'] and state not in ['SUCCEEDED', 'FAILED', 'CANCELLED', 'TERMINATED']:
+                        if pr['state'] in ['MERGED', 'CLOSED']:
                             orphaned_sessions.append((s, pr['state']))
 
         if not stalled_sessions and not orphaned_sessions:
@@ -724,15 +673,8 @@ def main():
 
             if args.clean:
                 print("\n🧹 Cleaning up unhealthy sessions...")
-                for s in stalled_sessions:
-                    sid = s.get("name", "").split("/")[-1]
-                    logger.info(f"Deleting stalled session {sid}...")
-                    client.delete_session(sid)
-
-                for s, _ in orphaned_sessions:
-                    sid = s.get("name", "").split("/")[-1]
-                    logger.info(f"Deleting orphaned session {sid}...")
-                    client.delete_session(sid)
+                unhealthy = select(stalled_sessions + [s for s, _ in orphaned_sessions])
+                delete_sessions(client, unhealthy, args, label="unhealthy sessions")
                 print("✅ Cleanup complete.")
             else:
                 print("\nUse --clean to delete these sessions.")
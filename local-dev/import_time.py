@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Import-time check for the workspace CLIs.
+
+Runs `python -X importtime` for each module in a fresh interpreter, reports
+the slowest imports, times `jules_ops.py --help`, and exits non-zero when a
+module or the help command exceeds the budget. tests/test_import_time.py
+runs the same checks under pytest; this script is the readable report.
+
+Usage: python3 local-dev/import_time.py [--max-ms 150] [--top 8] [modules...]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Per-module import and `jules_ops.py --help` budget; tests/test_import_time.py enforces it
+MAX_MS = 150.0
+
+DEFAULT_MODULES = [
+    "common_config",
+    "jules_client",
+    "github_client",
+    "session_cleanup",
+    "workspace_index",
+    "jules_ops",
+]
+
+# "import time:      self [us] |  cumulative | imported package"
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _importtime(code: str):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "scripts")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "import failed")
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            yield int(cumulative), len(indent), name
+
+
+def measure_import(module: str, startup: set):
+    """
+    Returns (total_ms, [(cumulative_ms, name), ...]) for the direct imports
+    of `module`, leaving out what the interpreter loads at startup.
+    """
+    imports = []
+    total_us = 0
+    for cumulative, depth, name in _importtime(f"import {module}"):
+        if name == module:
+            total_us = cumulative
+        elif depth <= 3 and name not in startup:
+            imports.append((cumulative / 1000, name))
+    imports.sort(reverse=True)
+    return total_us / 1000, imports
+
+
+def time_help(runs: int = 3) -> float:
+    """Best wall-clock ms of `jules_ops.py --help` over `runs` runs."""
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, os.path.join(ROOT, "jules_ops.py"), "--help"],
+            cwd=ROOT, capture_output=True,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure import cost of the workspace CLIs")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--max-ms", type=float, default=MAX_MS,
+                        help=f"Budget per module import and for `jules_ops.py --help` (default: {MAX_MS:g})")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list per module")
+    args = parser.parse_args()
+
+    startup = {name for _, _, name in _importtime("pass")}
+    over_budget = []
+    for module in args.modules:
+        try:
+            total, imports = measure_import(module, startup)
+        except RuntimeError as e:
+            print(f"❌ {module}: {e}")
+            over_budget.append(module)
+            continue
+        marker = "❌" if total > args.max_ms else "✅"
+        print(f"{marker} {module}: {total:.1f} ms")
+        for ms, name in imports[:args.top]:
+            print(f"      {ms:8.1f} ms  {name}")
+        if total > args.max_ms:
+            over_budget.append(module)
+
+    help_ms = time_help()
+    marker = "❌" if help_ms > args.max_ms else "✅"
+    print(f"{marker} jules_ops.py --help: {help_ms:.1f} ms wall clock")
+    if help_ms > args.max_ms:
+        over_budget.append("jules_ops.py --help")
+
+    if over_budget:
+        print(f"\nOver the {args.max_ms:.0f} ms budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
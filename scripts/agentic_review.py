@@ -9,8 +9,10 @@ import json
 import logging
 import os
 import re
+import sqlite3
 import sys
 import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
@@ -45,39 +47,104 @@ ensure_workspace()
 logger = setup_logging("agentic_review", level=logging.INFO)
 
 # --- Configuration ---
-STATE_FILE = Path(".jules/review_state.json")
+STATE_FILE = Path(".jules/review_state.db")
+LEGACY_STATE_FILE = Path(".jules/review_state.json")
 SUPPORTED_EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx'}
 IGNORE_FILES = {'package-lock.json', 'pnpm-lock.yaml', 'yarn.lock'}
 
 # --- State Management ---
 class ReviewState:
-    def __init__(self, filepath: Path):
-        self.filepath = filepath
-        self.state: Dict[str, str] = {}  # pr_number -> commit_oid
-        self.load()
-
-    def load(self):
-        if self.filepath.exists():
-            try:
-                with open(self.filepath, 'r') as f:
-                    self.state = json.load(f)
-            except json.JSONDecodeError:
-                self.state = {}
-        else:
-            self.filepath.parent.mkdir(parents=True, exist_ok=True)
-            self.state = {}
+    """
+    Last-reviewed commit per PR, kept in SQLite (WAL mode) so several
+    reviewer processes can share it. Each write is its own transaction;
+    inside `batch()` writes are buffered and flushed together.
+    """
 
-    def save(self):
-        with open(self.filepath, 'w') as f:
-            json.dump(self.state, f, indent=2)
+    def __init__(self, filepath: Path, flush_every: int = 20):
+        self.filepath = filepath
+        self.flush_every = flush_every
+        self.pending: Dict[str, str] = {}  # pr_number -> commit_oid
+        self.batching = False
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.filepath), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS reviews ("
+                " pr_number TEXT PRIMARY KEY,"
+                " commit_oid TEXT NOT NULL,"
+                " reviewed_at TEXT NOT NULL)"
+            )
+        self._import_legacy(LEGACY_STATE_FILE)
+
+    def _import_legacy(self, legacy: Path):
+        """One-time import of the old review_state.json, if present."""
+        if not legacy.exists():
+            return
+        try:
+            with open(legacy, 'r') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return  # Includes FileNotFoundError when another reviewer migrated it first
+        now = datetime.now().isoformat()
+        # INSERT OR IGNORE, so concurrent imports of the same file are harmless
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO reviews VALUES (?, ?, ?)",
+                [(str(pr), oid, now) for pr, oid in state.items()],
+            )
+        try:
+            legacy.rename(legacy.with_suffix(".json.migrated"))
+        except FileNotFoundError:
+            return  # A reviewer started alongside this one already migrated it
+        logger.info(f"Imported {len(state)} entries from {legacy}")
+
+    def get(self, pr_number: str) -> Optional[str]:
+        pr_number = str(pr_number)
+        if pr_number in self.pending:
+            return self.pending[pr_number]
+        row = self.conn.execute(
+            "SELECT commit_oid FROM reviews WHERE pr_number = ?", (pr_number,)
+        ).fetchone()
+        return row[0] if row else None
 
     def should_review(self, pr_number: str, commit_oid: str) -> bool:
-        last_oid = self.state.get(str(pr_number))
-        return last_oid != commit_oid
+        return self.get(pr_number) != commit_oid
 
     def mark_reviewed(self, pr_number: str, commit_oid: str):
-        self.state[str(pr_number)] = commit_oid
-        self.save()
+        self.pending[str(pr_number)] = commit_oid
+        if not self.batching or len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write all pending marks in a single transaction."""
+        if not self.pending:
+            return
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO reviews VALUES (?, ?, ?) "
+                "ON CONFLICT(pr_number) DO UPDATE SET "
+                "commit_oid = excluded.commit_oid, "
+                "reviewed_at = excluded.reviewed_at",
+                [(pr, oid, now) for pr, oid in self.pending.items()],
+            )
+        self.pending.clear()
+
+    @contextmanager
+    def batch(self):
+        """Buffer marks and flush every `flush_every` PRs and on exit."""
+        self.batching = True
+        try:
+            yield self
+        finally:
+            self.batching = False
+            self.flush()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
 
 # --- Parsing Logic ---
 class BlockInfo:
@@ -227,20 +294,24 @@ class AgenticReviewer:
         # Ensure we have the latest refs
         self.gh.fetch()
 
-        # Identify changed files
-        changed_files = self.gh.get_changed_files(f"origin/{base_branch}", f"origin/{head_branch}")
+        # Fetch every changed file's diff and new content in one pass
+        file_diffs = self.gh.get_file_diffs(
+            f"origin/{base_branch}",
+            f"origin/{head_branch}",
+            paths=[f"*{ext}" for ext in sorted(SUPPORTED_EXTENSIONS)],
+        )
 
         reviews = []
 
-        for filepath in changed_files:
+        for filepath, file_diff in file_diffs.items():
             if filepath in IGNORE_FILES: continue
             _, ext = os.path.splitext(filepath)
             if ext not in SUPPORTED_EXTENSIONS: continue
 
             logger.info(f"  Analyzing {filepath}...")
 
-            file_content = self.gh.get_file_content(f"origin/{head_branch}", filepath)
-            diff = self.gh.get_diff(f"origin/{base_branch}", f"origin/{head_branch}", filepath)
+            file_content = file_diff.get("content")
+            diff = file_diff["diff"]
 
             if not file_content or not diff:
                 continue
@@ -352,8 +423,9 @@ def main():
     else:
         # Default to all open PRs if not specified
         prs = reviewer.gh.list_prs(state="open")
-        for pr in prs:
-            reviewer.process_pr(pr['number'])
+        with reviewer.state.batch():
+            for pr in prs:
+                reviewer.process_pr(pr['number'])
 
 if __name__ == "__main__":
     main()
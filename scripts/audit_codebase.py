@@ -6,14 +6,19 @@ Includes optional Gemini LLM auditing if GEMINI_KEY is present.
 """
 
 import argparse
+import hashlib
 import json
 import os
 import re
+import socket
+import socketserver
+import sqlite3
 import sys
+import threading
 import time
-import requests
 from pathlib import Path
-from typing import List, Dict, Any, Pattern
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
 
 # Add parent directory to path to import common modules
 current_dir = Path(__file__).resolve().parent
@@ -31,13 +36,62 @@ except ImportError:
     logger = logging.getLogger("audit_codebase")
     HRM_REPO_DIR = Path("hrm")
 
+from rate_limit import TokenBucket
+
+try:
+    from workspace_index import FileIndex, get_index
+except ImportError:
+    FileIndex = None
+    get_index = None
+
+try:
+    import telemetry
+except ImportError:
+    telemetry = None
+
+JS_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+
+# Bump when whole-file audit() logic changes; line rules are hashed automatically
+RULESET_VERSION = 1
+DEFAULT_CACHE_PATH = Path(
+    os.environ.get("AUDIT_CACHE_DIR", Path.home() / ".cache" / "hrm-workspace")
+) / "audit_cache.db"
+DEFAULT_SOCKET_PATH = DEFAULT_CACHE_PATH.parent / "audit.sock"
+PRUNE_DIRS = {'node_modules', '.next', '.git', 'dist', 'build'}
+
+class LineRule:
+    """
+    A declarative per-line check. Auditors list these in `rules`; the
+    RuleEngine merges every rule into one regex and reports hits to the
+    owning auditor.
+    """
+    def __init__(self, name: str, pattern: str, message: str,
+                 extensions: Tuple[str, ...] = JS_EXTENSIONS,
+                 exclude: Tuple[str, ...] = ()):
+        self.name = name
+        self.pattern = pattern
+        self.regex = re.compile(pattern)
+        self.message = message
+        self.extensions = extensions
+        self.exclude = exclude  # Path substrings that disable the rule
+
+    def applies_to(self, filepath: str) -> bool:
+        return filepath.endswith(self.extensions) and not any(x in filepath for x in self.exclude)
+
 class BaseAuditor:
+    # Per-line checks, evaluated by RuleEngine in one pass per file
+    rules: List[LineRule] = []
+
     def __init__(self, name: str):
         self.name = name
         self.findings = []
 
+    def wants_file(self, filepath: str) -> bool:
+        """Whether `audit` needs this file's content (beyond line rules)."""
+        return False
+
     def audit(self, filepath: str, content: str):
-        raise NotImplementedError
+        """Whole-file checks that cannot be expressed as line rules."""
 
     def add_finding(self, filepath: str, message: str, line_num: int = 0):
         self.findings.append({
@@ -48,81 +102,376 @@ class BaseAuditor:
         })
 
 class FrontendAuditor(BaseAuditor):
+    rules = [
+        LineRule("sx-prop", r'\bsx=\{',
+                 "Avoid using 'sx' prop for performance. Use `styled` components or CSS modules."),
+    ]
+
     def __init__(self):
         super().__init__("Frontend")
         self.use_client_re = re.compile(r'^\s*["\']use client["\']', re.MULTILINE)
-        self.sx_prop_re = re.compile(r'\bsx=\{')
 
-    def audit(self, filepath: str, content: str):
-        if not filepath.endswith(('.tsx', '.jsx', '.ts', '.js')):
-            return
+    def wants_file(self, filepath: str) -> bool:
+        return "utils/" in filepath and filepath.endswith(JS_EXTENSIONS)
 
+    def audit(self, filepath: str, content: str):
         # Check for 'use client' abuse
-        if "utils/" in filepath and self.use_client_re.search(content):
+        if self.use_client_re.search(content):
             self.add_finding(filepath, "'use client' found in utils file. Utilities should generally be isomorphic.")
 
-        # Check for 'sx' prop usage (performance)
-        lines = content.splitlines()
-        for i, line in enumerate(lines):
-            if self.sx_prop_re.search(line):
-                self.add_finding(filepath, "Avoid using 'sx' prop for performance. Use `styled` components or CSS modules.", i + 1)
-
 class SecurityAuditor(BaseAuditor):
+    rules = [
+        LineRule("unsafe-secret-comparison", r'===\s*process\.env\.',
+                 "Potential timing attack. Use `crypto.timingSafeEqual` for secret comparisons.",
+                 extensions=('.ts', '.js', '.tsx')),
+    ]
+
     def __init__(self):
         super().__init__("Security")
-        self.unsafe_comparison_re = re.compile(r'===\s*process\.env\.')
-        self.timing_safe_re = re.compile(r'crypto\.timingSafeEqual')
-
-    def audit(self, filepath: str, content: str):
-        if not filepath.endswith(('.ts', '.js', '.tsx')):
-            return
-
-        lines = content.splitlines()
-        for i, line in enumerate(lines):
-            if self.unsafe_comparison_re.search(line):
-                self.add_finding(filepath, "Potential timing attack. Use `crypto.timingSafeEqual` for secret comparisons.", i + 1)
 
 class HygieneAuditor(BaseAuditor):
+    rules = [
+        LineRule("no-var", r'\bvar\s+', "Use `let` or `const` instead of `var`."),
+        LineRule("no-console-log", r'console\.log\(',
+                 "Avoid `console.log` in production code. Use a logger.",
+                 exclude=("scripts/", "test")),
+        # TODO: Implement strict TODO checking (r'//\s*TODO')
+    ]
+
     def __init__(self):
         super().__init__("Hygiene")
-        self.var_re = re.compile(r'\bvar\s+')
-        self.console_log_re = re.compile(r'console\.log\(')
-        self.todo_re = re.compile(r'//\s*TODO')
 
-    def audit(self, filepath: str, content: str):
-        if not filepath.endswith(('.ts', '.js', '.tsx', '.jsx')):
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Line breaks str.splitlines() honours besides "\n" (text mode folds "\r")
+_EXOTIC_BREAKS_RE = re.compile('[\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+def _first_chars(parsed) -> Optional[set]:
+    """Characters a parsed pattern can start with, or None if unbounded."""
+    for op, av in parsed:
+        if op is sre_parse.AT:
+            continue  # \b, ^ etc. consume nothing
+        if op is sre_parse.LITERAL:
+            return {chr(av)}
+        if op is sre_parse.IN:
+            chars = set()
+            for item_op, item_av in av:
+                if item_op is sre_parse.LITERAL:
+                    chars.add(chr(item_av))
+                elif item_op is sre_parse.RANGE and item_av[1] - item_av[0] < 64:
+                    chars.update(chr(c) for c in range(item_av[0], item_av[1] + 1))
+                else:
+                    return None
+            return chars
+        if op is sre_parse.SUBPATTERN:
+            return _first_chars(av[-1])
+        if op is sre_parse.BRANCH:
+            chars = set()
+            for branch in av[1]:
+                branch_chars = _first_chars(branch)
+                if branch_chars is None:
+                    return None
+                chars |= branch_chars
+            return chars
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            return _first_chars(av[2])
+        return None
+    return None
+
+class RuleEngine:
+    """
+    Compiles the line rules of all auditors into a single alternation with
+    one named group per rule and scans each file's content once.
+
+    When every rule has a known set of first characters the alternation is
+    guarded by a lookahead on that set, which lets the regex engine skip
+    most positions. Lines the combined scan touches are then re-checked
+    against the individual rules, since an alternation reports only one
+    rule per position and several rules can hit the same line.
+    """
+    def __init__(self, auditors: List[BaseAuditor], cache: Optional["FindingsCache"] = None,
+                 index: Optional["FileIndex"] = None):
+        self.auditors = auditors
+        self.index = index
+        self.by_name = {a.name: a for a in auditors}
+        self.rules: List[Tuple[BaseAuditor, LineRule]] = [
+            (auditor, rule) for auditor in auditors for rule in auditor.rules
+        ]
+        self._compiled: Dict[Tuple[int, ...], Pattern] = {}
+        self.cache = cache
+        # key -> new findings, or None for a hit whose last use must be bumped
+        self.cache_updates: Dict[str, Optional[list]] = {}
+        self.fingerprint = self._fingerprint()
+
+    def _fingerprint(self) -> str:
+        h = hashlib.sha256(f"v{RULESET_VERSION}".encode())
+        for auditor in self.auditors:
+            h.update(type(auditor).__name__.encode())
+            for rule in auditor.rules:
+                h.update(repr((rule.name, rule.pattern, rule.message,
+                               rule.extensions, rule.exclude)).encode())
+        return h.hexdigest()
+
+    def _cache_key(self, content: str, indices: Tuple[int, ...],
+                   file_auditors: List[BaseAuditor]) -> str:
+        # Findings depend on the path only through which rules/hooks apply
+        h = hashlib.sha256(self.fingerprint.encode())
+        h.update(repr([self.rules[i][1].name for i in indices]).encode())
+        h.update(repr([a.name for a in file_auditors]).encode())
+        h.update(content.encode("utf-8", errors="surrogatepass"))
+        return h.hexdigest()
+
+    def rules_for(self, filepath: str) -> Tuple[int, ...]:
+        return tuple(i for i, (_, rule) in enumerate(self.rules) if rule.applies_to(filepath))
+
+    def _combined(self, indices: Tuple[int, ...]) -> Pattern:
+        if indices not in self._compiled:
+            patterns = [self.rules[i][1].pattern for i in indices]
+            combined = "|".join(f"(?P<r{i}>{p})" for i, p in zip(indices, patterns))
+            first = set()
+            for pattern in patterns:
+                chars = _first_chars(sre_parse.parse(pattern))
+                if chars is None:
+                    first = None
+                    break
+                first |= chars
+            if first:
+                combined = f"(?=[{re.escape(''.join(sorted(first)))}])(?:{combined})"
+            self._compiled[indices] = re.compile(combined, re.MULTILINE)
+        return self._compiled[indices]
+
+    def scan_file(self, filepath: str, read_path: Optional[str] = None):
+        """Audit `filepath` (as reported), reading it from `read_path` if given."""
+        # Path filters run before the file is opened
+        indices = self.rules_for(filepath)
+        file_auditors = [a for a in self.auditors if a.wants_file(filepath)]
+        if not indices and not file_auditors:
+            return
+
+        try:
+            content = _read_source(read_path or filepath, self.index)
+        except Exception as e:
+            logger.warning(f"Failed to scan {filepath}: {e}")
+            return
+
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(content, indices, file_auditors)
+            cached = self.cache.get(key)
+            if cached is not None:
+                for name, line_num, message in cached:
+                    self.by_name[name].add_finding(filepath, message, line_num)
+                self.cache_updates[key] = None
+                return
+            marks = [len(a.findings) for a in self.auditors]
+
+        for auditor in file_auditors:
+            try:
+                auditor.audit(filepath, content)
+            except Exception as e:
+                logger.warning(f"{auditor.name} failed on {filepath}: {e}")
+
+        if indices:
+            self.match_lines(filepath, content, indices)
+
+        if key is not None:
+            self.cache_updates[key] = [
+                (a.name, f["line"], f["message"])
+                for a, mark in zip(self.auditors, marks)
+                for f in a.findings[mark:]
+            ]
+
+    def pop_cache_updates(self) -> Dict[str, Optional[list]]:
+        updates, self.cache_updates = self.cache_updates, {}
+        return updates
+
+    def match_lines(self, filepath: str, content: str, indices: Tuple[int, ...]):
+        candidates = set()
+        line_num, pos = 1, 0
+        for m in self._combined(indices).finditer(content):
+            line_num += content.count("\n", pos, m.start())
+            pos = m.start()
+            last = line_num + content.count("\n", m.start(), m.end())
+            candidates.update(range(line_num, last + 1))
+        if not candidates:
             return
 
         lines = content.splitlines()
-        for i, line in enumerate(lines):
-            if self.var_re.search(line):
-                self.add_finding(filepath, "Use `let` or `const` instead of `var`.", i + 1)
+        if _EXOTIC_BREAKS_RE.search(content):
+            # Offsets no longer map to splitlines() numbering; check every line
+            candidates = range(1, len(lines) + 1)
+
+        for line_num in sorted(candidates):
+            if line_num > len(lines):
+                continue
+            line = lines[line_num - 1]
+            for i in indices:
+                auditor, rule = self.rules[i]
+                if rule.regex.search(line):
+                    auditor.add_finding(filepath, rule.message, line_num)
 
-            if self.console_log_re.search(line):
-                if "scripts/" not in filepath and "test" not in filepath:
-                     self.add_finding(filepath, "Avoid `console.log` in production code. Use a logger.", i + 1)
+class FindingsCache:
+    """
+    Persistent cache of regex-auditor findings keyed by file content hash
+    and ruleset fingerprint. It lives on local disk outside the repo, so
+    every worktree shares it, and is LRU-evicted down to `max_bytes`.
+    """
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_bytes: int = 64 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Callers that share one cache across threads must serialize access
+        self.conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS findings ("
+                " key TEXT PRIMARY KEY,"
+                " findings TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[list]:
+        row = self.conn.execute("SELECT findings FROM findings WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def record(self, updates: Dict[str, Optional[list]]) -> Tuple[int, int]:
+        """Store new entries and bump hits in one transaction. Returns (hits, misses)."""
+        now = time.time()
+        hits = [(now, key) for key, findings in updates.items() if findings is None]
+        misses = []
+        for key, findings in updates.items():
+            if findings is not None:
+                blob = json.dumps(findings)
+                misses.append((key, blob, len(blob) + len(key), now))
+        with self.conn:
+            self.conn.executemany("UPDATE findings SET last_used = ? WHERE key = ?", hits)
+            self.conn.executemany("INSERT OR REPLACE INTO findings VALUES (?, ?, ?, ?)", misses)
+        if misses:
+            self.evict()
+        return len(hits), len(misses)
+
+    def evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM findings").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        doomed = []
+        for key, size in self.conn.execute("SELECT key, size FROM findings ORDER BY last_used"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        with self.conn:
+            self.conn.executemany("DELETE FROM findings WHERE key = ?", doomed)
+        logger.info(f"Audit cache: evicted {len(doomed)} entries")
+
+    def close(self):
+        self.conn.close()
+
+# Rough chars-per-token ratio for sizing LLM prompts
+CHARS_PER_TOKEN = 4
+_BLOCK_START_RE = re.compile(
+    r'^(export\s+)?(default\s+)?(async\s+)?(function\b|class\b|const\b|let\b|interface\b|type\b|enum\b)'
+)
+
+def chunk_source(content: str, max_tokens: int = 3000, overlap_lines: int = 15) -> List[Tuple[int, str]]:
+    """
+    Split source into windows of at most ~`max_tokens`, cutting at top-level
+    function/component/type boundaries where possible. Each window after the
+    first starts `overlap_lines` before its cut point. Returns
+    (first_line, text) pairs with 1-based line numbers.
+    """
+    lines = content.splitlines()
+    budget = max_tokens * CHARS_PER_TOKEN
+    if len(content) <= budget:
+        return [(1, content)]
+
+    def span(lo: int, hi: int) -> int:
+        return sum(len(l) + 1 for l in lines[lo:hi])
 
-            if self.todo_re.search(line):
-                pass # TODO: Implement strict TODO checking
+    # Cut points: top-level definitions seen at brace depth 0 (naive counting)
+    cuts, depth = [], 0
+    for i, line in enumerate(lines):
+        if i and depth <= 0 and _BLOCK_START_RE.match(line):
+            cuts.append(i)
+        depth += line.count('{') - line.count('}')
+    cuts.append(len(lines))
+
+    # Greedily pack whole segments between cut points into windows
+    bounds: List[Tuple[int, int]] = []
+    start, prev = 0, 0
+    for cut in cuts:
+        if prev > start and span(start, cut) > budget:
+            bounds.append((start, prev))
+            start = max(start + 1, prev - overlap_lines)
+        prev = cut
+    bounds.append((start, len(lines)))
+
+    # Hard-split any window that is still over budget (e.g. one huge component).
+    # Every window keeps at least one line, so a single line longer than the
+    # budget becomes a window of its own rather than an empty one.
+    windows: List[Tuple[int, str]] = []
+    for lo, hi in bounds:
+        if hi <= lo:
+            continue
+        start = lo
+        for i in range(lo + 1, hi):
+            if span(start, i + 1) > budget:
+                windows.append((start + 1, "\n".join(lines[start:i])))
+                start = max(start + 1, i - overlap_lines)
+                # Drop overlap that would leave no room for line i
+                while start < i and span(start, i + 1) > budget:
+                    start += 1
+        windows.append((start + 1, "\n".join(lines[start:hi])))
+    return windows
 
 class GeminiAuditor(BaseAuditor):
-    def __init__(self):
+    """
+    LLM audit through the Gemini generateContent API. Files are sent
+    concurrently (at most `max_in_flight` requests, paced by a token bucket)
+    and responses are cached by a hash of model + prompt, so re-runs over
+    unchanged files cost nothing. Large files are split into overlapping
+    chunks (see `chunk_source`) that are audited in parallel and mapped back
+    to file line numbers. GEMINI_API_URL points it at a mock server.
+    """
+    def __init__(self, max_in_flight: int = 4, requests_per_minute: float = 30,
+                 cache: Optional[FindingsCache] = None, chunk_tokens: int = 3000,
+                 overlap_lines: int = 15):
         super().__init__("Gemini")
         self.api_key = os.environ.get("GEMINI_KEY")
         self.model = "gemini-2.0-flash-lite-preview-02-05"
-        self.url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent"
+        self.url = os.environ.get(
+            "GEMINI_API_URL",
+            f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent",
+        )
+        self.max_in_flight = max_in_flight
+        self.limiter = TokenBucket(requests_per_minute / 60.0, capacity=max_in_flight)
+        self.cache = cache
+        self.chunk_tokens = chunk_tokens
+        self.overlap_lines = overlap_lines
+        self.latencies: Dict[str, float] = {}
+        self.cache_hits = 0
+        self.requests = 0
+        self.failed: set = set()
 
-    def audit(self, filepath: str, content: str):
-        if not self.api_key:
-            return
+    def wants_file(self, filepath: str) -> bool:
+        return bool(self.api_key) and filepath.endswith(JS_EXTENSIONS)
 
-        if not filepath.endswith(('.ts', '.tsx', '.js', '.jsx')):
-            return
-
-        logger.info(f"🤖 Gemini auditing {filepath}...")
+    def audit(self, filepath: str, content: str):
+        self.audit_many([(filepath, content)])
 
-        prompt = f"""
-You are a senior software engineer. Analyze the following code file ({filepath}) for:
+    def build_prompt(self, filepath: str, content: str, first_line: int = 1, last_line: int = 0) -> str:
+        scope = f"code file ({filepath})"
+        if first_line > 1 or last_line:
+            scope = (f"excerpt of {filepath} (lines {first_line}-{last_line}; report line "
+                     f"numbers relative to the excerpt, its first line is line 1)")
+        return f"""
+You are a senior software engineer. Analyze the following {scope} for:
 1. Critical security vulnerabilities (e.g. injection, secrets, race conditions).
 2. Major performance bottlenecks (e.g. redundant calculations in render loops).
 3. React/Next.js best practice violations (e.g. 'use client' misuse).
@@ -137,50 +486,568 @@ Code:
 {content}
 """
 
-        try:
-            payload = {
-                "contents": [{"parts": [{"text": prompt}]}],
-                "generationConfig": {"responseMimeType": "application/json"}
+    def cache_key(self, prompt: str) -> str:
+        return "gemini:" + hashlib.sha256(f"{self.model}\0{prompt}".encode()).hexdigest()
+
+    def request(self, prompt: str) -> List[Dict[str, Any]]:
+        """Send one prompt and return the parsed issue list. Raises on failure."""
+        import requests  # Deferred: regex-only runs never need it
+
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {"responseMimeType": "application/json"}
+        }
+
+        response = requests.post(
+            f"{self.url}?key={self.api_key}",
+            json=payload,
+            timeout=30
+        )
+        response.raise_for_status()
+
+        result = response.json()
+        if "candidates" in result and result["candidates"]:
+            raw_text = result["candidates"][0]["content"]["parts"][0]["text"]
+            # Clean up any potential markdown backticks if the model ignored instructions
+            raw_text = raw_text.strip().replace("```json", "").replace("```", "")
+            return json.loads(raw_text)
+        return []
+
+    def _timed_request(self, filepath: str, prompt: str) -> Tuple[float, List[Dict[str, Any]]]:
+        self.limiter.acquire()
+        logger.info(f"🤖 Gemini auditing {filepath}...")
+        start = time.monotonic()
+        if telemetry:
+            with telemetry.span("gemini.request", model=self.model) as span:
+                span.set(file=filepath).add("bytes_out", len(prompt))
+                issues = self.request(prompt)
+        else:
+            issues = self.request(prompt)
+        return time.monotonic() - start, issues
+
+    def audit_many(self, items: List[Tuple[str, str]]):
+        """Audit (filepath, content) pairs concurrently; findings keep input order."""
+        if not self.api_key or not items:
+            return
+
+        # Work units: (item index, first line, line count, prompt, file was chunked)
+        units = []
+        for idx, (filepath, content) in enumerate(items):
+            chunks = chunk_source(content, self.chunk_tokens, self.overlap_lines)
+            for first_line, text in chunks:
+                count = text.count("\n") + 1
+                if len(chunks) == 1:
+                    prompt = self.build_prompt(filepath, text)
+                else:
+                    prompt = self.build_prompt(filepath, text, first_line, first_line + count - 1)
+                units.append((idx, first_line, count, prompt, len(chunks) > 1))
+        keys = [self.cache_key(u[3]) for u in units]
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        updates: Dict[str, Optional[list]] = {}
+        latencies: Dict[int, float] = {}
+
+        # Cache lookups stay on this thread (sqlite connections are per-thread)
+        pending = []
+        for u, key in enumerate(keys):
+            cached = self.cache.get(key) if self.cache else None
+            if self.cache and telemetry:
+                telemetry.cache_access("gemini_prompts", cached is not None)
+            if cached is not None:
+                results[u] = cached
+                updates[key] = None
+                self.cache_hits += 1
+            else:
+                pending.append(u)
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            futures = {
+                pool.submit(self._timed_request, items[units[u][0]][0], units[u][3]): u
+                for u in pending
             }
+            for future in as_completed(futures):
+                u = futures[future]
+                idx = units[u][0]
+                self.requests += 1
+                try:
+                    latency, issues = future.result()
+                except Exception as e:
+                    self.failed.add(items[idx][0])
+                    logger.warning(f"Gemini audit failed for {items[idx][0]} (from line {units[u][1]}): {e}")
+                    continue
+                # Chunks run side by side, so a file takes as long as its slowest chunk
+                latencies[idx] = max(latencies.get(idx, 0.0), latency)
+                results[u] = issues
+                updates[keys[u]] = issues
 
-            response = requests.post(
-                f"{self.url}?key={self.api_key}",
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
+        if self.cache and updates:
+            self.cache.record(updates)
 
-            result = response.json()
-            if "candidates" in result and result["candidates"]:
-                raw_text = result["candidates"][0]["content"]["parts"][0]["text"]
-                # Clean up any potential markdown backticks if the model ignored instructions
-                raw_text = raw_text.strip().replace("```json", "").replace("```", "")
+        for idx, (filepath, _) in enumerate(items):
+            self.latencies[filepath] = latencies.get(idx, 0.0)
+            for line_num, message in self._merge_chunks(
+                [(units[u], results[u]) for u in range(len(units)) if units[u][0] == idx and u in results]
+            ):
+                self.add_finding(filepath, message, line_num)
 
-                issues = json.loads(raw_text)
-                for issue in issues:
-                    self.add_finding(filepath, issue.get("message", "Issue detected"), issue.get("line", 0))
+    @staticmethod
+    def _merge_chunks(chunk_results) -> List[Tuple[int, str]]:
+        """
+        Map chunk-relative lines to file lines (for every chunk of a file that
+        was split, even if only one chunk came back) and drop duplicates, i.e.
+        the same (line, message) reported twice by chunks that overlap there.
+        """
+        merged: List[Tuple[int, str]] = []
+        seen = set()
+        for (_, first_line, count, _, chunked), issues in chunk_results:
+            for issue in issues:
+                line = issue.get("line", 0)
+                message = issue.get("message", "Issue detected")
+                if isinstance(line, int) and line > 0:
+                    if chunked:
+                        line = first_line + min(line, count) - 1
+                else:
+                    line = 0
+                key = (line, message.strip().lower())
+                if key in seen:
+                    continue
+                seen.add(key)
+                merged.append((line, message))
+        return merged
 
-        except Exception as e:
-            logger.warning(f"Gemini audit failed for {filepath}: {e}")
+    def report(self, slowest: int = 10):
+        """Log per-file latency (slowest first) and cache hit rate."""
+        total = len(self.latencies)
+        if not total:
+            return
+        ranked = sorted(self.latencies.items(), key=lambda kv: -kv[1])
+        for filepath, latency in ranked[:slowest]:
+            logger.info(f"  Gemini {latency:6.2f}s  {filepath}")
+        for filepath, latency in ranked[slowest:]:
+            logger.debug(f"  Gemini {latency:6.2f}s  {filepath}")
+        fetched = [l for l in self.latencies.values() if l > 0]
+        mean = sum(fetched) / len(fetched) if fetched else 0.0
+        lookups = self.cache_hits + self.requests
+        logger.info(
+            f"Gemini: {total} files, {lookups} prompts, {self.cache_hits} cache hits "
+            f"({100.0 * self.cache_hits / max(1, lookups):.0f}%), {len(self.failed)} files with failures, "
+            f"mean file latency {mean:.2f}s"
+        )
 
 
 def scan_file(filepath: str, auditors: List[BaseAuditor]):
+    RuleEngine(auditors).scan_file(filepath)
+
+# Regex-only auditors: deterministic, cacheable and safe to run in worker processes
+LOCAL_AUDITORS = (FrontendAuditor, SecurityAuditor, HygieneAuditor)
+
+_worker_engine: RuleEngine = None
+
+def _init_worker(cache_path: Optional[Path]):
+    global _worker_engine
+    cache = FindingsCache(cache_path) if cache_path else None
+    _worker_engine = RuleEngine([cls() for cls in LOCAL_AUDITORS], cache=cache)
+
+def _scan_worker(filepath: str) -> Tuple[List[List[Tuple[int, str]]], Dict[str, Optional[list]]]:
+    """Scan one file in a worker, returning (line, message) per auditor plus cache updates."""
+    for auditor in _worker_engine.auditors:
+        auditor.findings = []
+    _worker_engine.scan_file(filepath)
+    per_auditor = [
+        [(f["line"], f["message"]) for f in auditor.findings]
+        for auditor in _worker_engine.auditors
+    ]
+    return per_auditor, _worker_engine.pop_cache_updates()
+
+def _drain(auditors: List[BaseAuditor], emit: Optional[Callable[[Dict[str, Any]], None]]):
+    """Hand accumulated findings to `emit` and forget them (streaming mode)."""
+    if emit is None:
+        return
+    for auditor in auditors:
+        for finding in auditor.findings:
+            emit(finding)
+        auditor.findings.clear()
+
+def _read_source(path: str, index: Optional["FileIndex"] = None) -> str:
+    """Read a source file, through the shared workspace index when given."""
+    if index is not None:
+        return index.read_text(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def scan_files(files: List[str], auditors: List[BaseAuditor], jobs: int = 1,
+               cache: Optional[FindingsCache] = None, llm_max_files: int = 0,
+               emit: Optional[Callable[[Dict[str, Any]], None]] = None,
+               index: Optional["FileIndex"] = None):
+    """
+    Scan files with all auditors. With jobs > 1 the regex auditors run in a
+    process pool; results are merged back in input order so the output is
+    identical to a serial run. Regex findings are served from / written to
+    `cache` when given; cache writes happen once, in this process. LLM
+    auditors get the first `llm_max_files` files (0 = all) as one batch.
+
+    With `emit`, findings are passed on as soon as each file is done (file
+    order instead of auditor order) and are not kept on the auditors.
+    With `index`, files are read through the workspace index, so the regex
+    and LLM passes share one read per file in this process.
+    """
+    local = [a for a in auditors if isinstance(a, LOCAL_AUDITORS)]
+    remote = [a for a in auditors if not isinstance(a, LOCAL_AUDITORS)]
+    updates: Dict[str, Optional[list]] = {}
+
+    if local and (jobs <= 1 or len(files) < 2):
+        engine = RuleEngine(local, cache=cache, index=index)
+        for filepath in files:
+            engine.scan_file(filepath)
+            _drain(local, emit)
+        updates = engine.pop_cache_updates()
+    elif local:
+        by_name = {a.name: a for a in local}
+        names = [cls().name for cls in LOCAL_AUDITORS]
+        chunksize = max(1, len(files) // (jobs * 8))
+        cache_path = cache.path if cache else None
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(cache_path,)) as pool:
+            results = pool.map(_scan_worker, files, chunksize=chunksize)
+            for filepath, (per_auditor, file_updates) in zip(files, results):
+                updates.update(file_updates)
+                for name, findings in zip(names, per_auditor):
+                    auditor = by_name.get(name)
+                    if auditor is None:
+                        continue
+                    for line_num, message in findings:
+                        auditor.add_finding(filepath, message, line_num)
+                _drain(local, emit)
+
+    if cache and updates:
+        hits, misses = cache.record(updates)
+        logger.info(f"Audit cache: {hits} hits, {misses} misses")
+        if telemetry:
+            telemetry.cache_access("audit_findings", True, hits)
+            telemetry.cache_access("audit_findings", False, misses)
+
+    for auditor in remote:
+        if not hasattr(auditor, "audit_many"):
+            engine = RuleEngine([auditor], index=index)
+            for filepath in files:
+                engine.scan_file(filepath)
+                _drain([auditor], emit)
+            continue
+        batch = []
+        for filepath in files[:llm_max_files or None]:
+            if not auditor.wants_file(filepath):
+                continue
+            try:
+                batch.append((filepath, _read_source(filepath, index)))
+            except Exception as e:
+                logger.warning(f"Failed to read {filepath}: {e}")
+        auditor.audit_many(batch)
+        _drain([auditor], emit)
+
+def iter_source_files(start_dir, index: Optional["FileIndex"] = None) -> List[str]:
+    """
+    All JS/TS files under start_dir, skipping build output and dependencies.
+    Listed from `index` (an index of start_dir) when given, else by walking.
+    """
+    if index is not None:
+        return [
+            os.path.join(start_dir, entry.path)
+            for entry in index.files(exts=JS_EXTENSIONS)
+            if not PRUNE_DIRS & set(entry.path.split("/"))
+        ]
+    found = []
+    for root, dirs, files in os.walk(start_dir):
+        # Prune directories
+        dirs[:] = [d for d in dirs if d not in PRUNE_DIRS]
+        for file in files:
+            if file.endswith(JS_EXTENSIONS):
+                found.append(os.path.join(root, file))
+    return found
+
+# --- Daemon mode ---
+
+def audit_paths(engine: RuleEngine, paths: List[str], cwd: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Run `engine` over paths and return their findings in auditor order."""
+    for auditor in engine.auditors:
+        auditor.findings = []
+    for path in paths:
+        read_path = os.path.join(cwd, path) if cwd else None
+        engine.scan_file(path, read_path)
+    if engine.cache:
+        engine.cache.record(engine.pop_cache_updates())
+    return [f for auditor in engine.auditors for f in auditor.findings]
+
+class AuditDaemon:
+    """
+    Keeps compiled rules and a per-file findings index for `root` in memory,
+    re-audits files as they change (watchdog/inotify when installed,
+    mtime polling otherwise) and answers JSON-line queries on a Unix socket:
+
+        {"op": "findings", "files": [...], "cwd": "..."}  -> {"findings": [...]}
+        {"op": "all"}                                       -> {"findings": [...]}
+        {"op": "stats"}                                     -> {"files": N, ...}
+
+    Files outside `root` (e.g. PR worktrees) are audited on demand; the
+    content-hash cache makes repeats instant.
+    """
+    def __init__(self, root: Path, socket_path: Path, cache: Optional[FindingsCache] = None,
+                 poll_interval: float = 1.0):
+        self.root = Path(root).resolve()
+        self.socket_path = Path(socket_path)
+        self.poll_interval = poll_interval
+        self.engine = RuleEngine([cls() for cls in LOCAL_AUDITORS], cache=cache)
+        self.lock = threading.Lock()
+        self.index: Dict[str, List[Dict[str, Any]]] = {}
+        self.mtimes: Dict[str, Tuple[int, int]] = {}
+        self.changed: set = set()
+        self.rescans = 0
+
+    def _stat(self, path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def refresh(self, paths) -> int:
+        """Re-audit paths whose mtime/size changed; drop deleted ones."""
+        updated = 0
+        with self.lock:
+            for path in paths:
+                stat = self._stat(path)
+                if stat is None:
+                    self.index.pop(path, None)
+                    self.mtimes.pop(path, None)
+                    continue
+                if self.mtimes.get(path) == stat:
+                    continue
+                self.mtimes[path] = stat
+                self.index[path] = audit_paths(self.engine, [path])
+                updated += 1
+            self.rescans += updated
+        return updated
+
+    def full_scan(self) -> int:
+        current = set(iter_source_files(self.root))
+        return self.refresh(current | (set(self.index) - current))
+
+    def _start_observer(self):
+        """Start a watchdog observer if available; returns None to fall back to polling."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+
+        daemon = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for path in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+                    if path and path.endswith(JS_EXTENSIONS) and not PRUNE_DIRS & set(Path(path).parts):
+                        with daemon.lock:
+                            daemon.changed.add(path)
+
+        observer = Observer()
+        observer.schedule(Handler(), str(self.root), recursive=True)
+        observer.start()
+        return observer
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op", "findings")
+        if op == "stats":
+            with self.lock:
+                return {"root": str(self.root), "files": len(self.index),
+                        "findings": sum(len(v) for v in self.index.values()),
+                        "rescans": self.rescans}
+        if op == "all":
+            with self.lock:
+                return {"findings": [f for path in sorted(self.index) for f in self.index[path]]}
+        if op != "findings":
+            return {"error": f"unknown op: {op}"}
+
+        cwd = request.get("cwd")
+        findings = []
+        for path in request.get("files", []):
+            abs_path = os.path.abspath(os.path.join(cwd or "", path))
+            with self.lock:
+                indexed = self.index.get(abs_path)
+                fresh = indexed is not None and self.mtimes.get(abs_path) == self._stat(abs_path)
+                if fresh:
+                    # Index entries are keyed by absolute path; report the caller's path
+                    findings.extend(dict(f, file=path) for f in indexed)
+                else:
+                    findings.extend(audit_paths(self.engine, [path], cwd))
+        # Same ordering as a CLI run: grouped by auditor, then request order
+        order = {a.name: i for i, a in enumerate(self.engine.auditors)}
+        findings.sort(key=lambda f: order.get(f["auditor"], len(order)))
+        return {"findings": findings}
+
+    def serve_forever(self):
+        logger.info(f"Indexing {self.root}...")
+        count = self.full_scan()
+        logger.info(f"Indexed {count} files; listening on {self.socket_path}")
+
+        daemon = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        response = daemon.handle(json.loads(line))
+                    except Exception as e:
+                        response = {"error": str(e)}
+                    self.wfile.write((json.dumps(response) + "\n").encode())
+                    self.wfile.flush()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), RequestHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        observer = self._start_observer()
+        if observer is None:
+            logger.info(f"watchdog not installed; polling every {self.poll_interval}s")
+        try:
+            while True:
+                if observer is None:
+                    self.full_scan()
+                    time.sleep(self.poll_interval)
+                    continue
+                time.sleep(0.2)
+                with self.lock:
+                    changed, self.changed = self.changed, set()
+                if changed:
+                    self.refresh(changed)
+        except KeyboardInterrupt:
+            logger.info("Shutting down audit daemon")
+        finally:
+            if observer is not None:
+                observer.stop()
+            server.shutdown()
+            server.server_close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+
+def query_daemon(files: List[str], cwd: Optional[str] = None,
+                 socket_path: Path = DEFAULT_SOCKET_PATH,
+                 timeout: float = 10.0) -> Optional[List[Dict[str, Any]]]:
+    """Ask a running audit daemon for regex findings; None if none is running."""
+    if not Path(socket_path).exists():
+        return None
+    request = {"op": "findings", "files": list(files), "cwd": cwd or os.getcwd()}
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            for auditor in auditors:
-                auditor.audit(filepath, content)
-    except Exception as e:
-        logger.warning(f"Failed to scan {filepath}: {e}")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall((json.dumps(request) + "\n").encode())
+            response = json.loads(sock.makefile("rb").readline())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Audit daemon unavailable ({e})")
+        return None
+    if "error" in response:
+        logger.warning(f"Audit daemon error: {response['error']}")
+        return None
+    return response.get("findings", [])
+
+# --- Output ---
+
+class JsonLinesWriter:
+    """Writes one JSON object per finding and flushes, so consumers can stream."""
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def write(self, finding: Dict[str, Any]):
+        self.stream.write(json.dumps(finding) + "\n")
+        self.stream.flush()
+        self.count += 1
+
+    def close(self):
+        pass
+
+class SarifWriter:
+    """
+    Streams findings as a SARIF 2.1.0 log: the header is written up front,
+    each result as it arrives and the closing brackets on `close()`.
+    """
+    def __init__(self, stream, auditors: List[BaseAuditor]):
+        self.stream = stream
+        self.count = 0
+        self.rule_ids: Dict[Tuple[str, str], str] = {}
+        rules = []
+        for auditor in auditors:
+            for rule in auditor.rules:
+                rule_id = f"{auditor.name}/{rule.name}"
+                self.rule_ids[(auditor.name, rule.message)] = rule_id
+                rules.append({"id": rule_id, "shortDescription": {"text": rule.message}})
+        header = {
+            "version": "2.1.0",
+            "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+            "runs": [{
+                "tool": {"driver": {"name": "hrm-audit-codebase", "rules": rules}},
+                "results": [],
+            }],
+        }
+        # Everything up to the opening bracket of "results"
+        text = json.dumps(header, indent=2)
+        self.stream.write(text[:text.rindex('"results": [') + len('"results": [')])
+
+    def write(self, finding: Dict[str, Any]):
+        result = {
+            "ruleId": self.rule_ids.get((finding["auditor"], finding["message"]), finding["auditor"]),
+            "level": "error" if finding["auditor"] == "Security" else "warning",
+            "message": {"text": finding["message"]},
+            "locations": [{"physicalLocation": {"artifactLocation": {"uri": finding["file"]}}}],
+        }
+        if finding.get("line"):
+            result["locations"][0]["physicalLocation"]["region"] = {"startLine": finding["line"]}
+        self.stream.write(("," if self.count else "") + "\n        " + json.dumps(result))
+        self.stream.flush()
+        self.count += 1
+
+    def close(self):
+        self.stream.write("\n      ]\n    }\n  ]\n}\n")
+        self.stream.flush()
 
 def main():
     parser = argparse.ArgumentParser(description="Audit codebase for patterns.")
     parser.add_argument('files', nargs='*', help='Specific files to scan. If empty, scans relevant files in repo.')
-    parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    parser.add_argument('--json', action='store_true', help='Output results as JSON (same as --format json)')
+    parser.add_argument('--format', choices=['text', 'json', 'jsonl', 'sarif'], default=None,
+                        help='Output format; jsonl and sarif stream findings as files finish')
     parser.add_argument('--no-llm', action='store_true', help='Disable LLM/Gemini audit even if key is present')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Worker processes for regex auditors (0 = one per CPU)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the findings cache')
+    parser.add_argument('--cache', type=Path, default=DEFAULT_CACHE_PATH,
+                        help=f'Findings cache database (default: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--cache-max-mb', type=int, default=64, help='Findings cache size limit')
+    parser.add_argument('--llm-max-files', type=int, default=None,
+                        help='Max files sent to Gemini (default: 5 for whole-repo scans, all for explicit files; 0 = all)')
+    parser.add_argument('--llm-concurrency', type=int, default=4, help='Max in-flight Gemini requests')
+    parser.add_argument('--llm-rpm', type=float, default=30, help='Gemini requests per minute')
+    parser.add_argument('--llm-chunk-tokens', type=int, default=3000,
+                        help='Approximate token budget per Gemini prompt; larger files are chunked')
+    parser.add_argument('--watch', action='store_true',
+                        help='Run as a daemon: index hrm/, re-audit changed files and serve queries on --socket')
+    parser.add_argument('--use-daemon', action='store_true',
+                        help='Get regex findings from a running --watch daemon when available')
+    parser.add_argument('--socket', type=Path, default=DEFAULT_SOCKET_PATH,
+                        help=f'Daemon socket path (default: {DEFAULT_SOCKET_PATH})')
+    parser.add_argument('--poll-interval', type=float, default=1.0,
+                        help='Seconds between scans when watchdog is not installed')
 
     args = parser.parse_args()
 
+    cache = None
+    if not args.no_cache:
+        try:
+            cache = FindingsCache(args.cache, max_bytes=args.cache_max_mb * 1024 * 1024)
+        except sqlite3.Error as e:
+            logger.warning(f"Findings cache unavailable ({e}); scanning without it")
+
     auditors = [
         FrontendAuditor(),
         SecurityAuditor(),
@@ -189,44 +1056,89 @@ def main():
 
     # Add Gemini Auditor if Key is present and not disabled
     if os.environ.get("GEMINI_KEY") and not args.no_llm:
-        auditors.append(GeminiAuditor())
+        auditors.append(GeminiAuditor(
+            max_in_flight=args.llm_concurrency,
+            requests_per_minute=args.llm_rpm,
+            cache=cache,
+            chunk_tokens=args.llm_chunk_tokens,
+        ))
     elif not args.no_llm:
         logger.info("Gemini Auditor skipped (GEMINI_KEY not found)")
 
+    if args.watch:
+        AuditDaemon(HRM_REPO_DIR, args.socket, cache=cache,
+                    poll_interval=args.poll_interval).serve_forever()
+        return
+
+    # One listing and at most one read per file, shared by every auditor.
+    # Explicit files (the per-PR call from process_pr) index just those paths.
+    index = None
     files_to_scan = []
     if args.files:
         files_to_scan = [f for f in args.files if os.path.isfile(f)]
+        if FileIndex is not None and files_to_scan:
+            index = FileIndex(os.getcwd(), paths=files_to_scan)
     else:
+        if get_index is not None:
+            index = get_index(HRM_REPO_DIR)
         # Scan everything in hrm/ (excluding node_modules, etc)
-        start_dir = HRM_REPO_DIR
-        for root, dirs, files in os.walk(start_dir):
-            # Prune directories
-            dirs[:] = [d for d in dirs if d not in ['node_modules', '.next', '.git', 'dist', 'build']]
-            for file in files:
-                if file.endswith(('.ts', '.tsx', '.js', '.jsx')):
-                     files_to_scan.append(os.path.join(root, file))
+        files_to_scan = iter_source_files(HRM_REPO_DIR, index)
 
     logger.info(f"Scanning {len(files_to_scan)} files...")
 
     # If using Gemini, limit the number of files if we are scanning the whole repo to avoid rate limits/costs
     # But if specific files were passed (like from process_pr), we assume it's a small set.
-    if any(isinstance(a, GeminiAuditor) for a in auditors) and not args.files:
-        logger.warning("Running Gemini on ENTIRE repo. This might be slow and costly. Limiting to first 5 files.")
-        files_to_scan = files_to_scan[:5]
+    llm_max_files = args.llm_max_files
+    if llm_max_files is None:
+        llm_max_files = 0 if args.files else 5
+    if any(isinstance(a, GeminiAuditor) for a in auditors) and llm_max_files:
+        logger.warning(f"Limiting Gemini to the first {llm_max_files} files (--llm-max-files 0 audits all).")
 
-    for filepath in files_to_scan:
-        # Use relative path for reporting if possible
-        try:
-            rel_path = os.path.relpath(filepath, os.getcwd())
-        except ValueError:
-            rel_path = filepath
-        scan_file(filepath, auditors)
+    output_format = args.format or ('json' if args.json else 'text')
+    writer = None
+    if output_format == 'jsonl':
+        writer = JsonLinesWriter(sys.stdout)
+    elif output_format == 'sarif':
+        writer = SarifWriter(sys.stdout, auditors)
+    emit = writer.write if writer else None
+
+    try:
+        daemon_findings = query_daemon(files_to_scan, socket_path=args.socket) if args.use_daemon else None
+        if daemon_findings is not None:
+            by_name = {a.name: a for a in auditors}
+            for f in daemon_findings:
+                by_name[f["auditor"]].findings.append(f)
+            _drain(auditors, emit)
+            # The daemon covers the regex auditors; only LLM auditors still run here
+            auditors_to_run = [a for a in auditors if not isinstance(a, LOCAL_AUDITORS)]
+        else:
+            auditors_to_run = auditors
+
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        scan_files(files_to_scan, auditors_to_run, jobs=jobs, cache=cache,
+                   llm_max_files=llm_max_files, emit=emit, index=index)
+    except BrokenPipeError:
+        # Consumer stopped reading (e.g. aborted on the first Security finding)
+        sys.stderr.close()
+        os._exit(1)
+    finally:
+        if cache:
+            cache.close()
+    for auditor in auditors:
+        if isinstance(auditor, GeminiAuditor):
+            auditor.report()
+
+    if writer:
+        writer.close()
+        if writer.count:
+            sys.exit(1)
+        return
 
     all_findings = []
     for auditor in auditors:
         all_findings.extend(auditor.findings)
 
-    if args.json:
+    if output_format == 'json':
         print(json.dumps(all_findings, indent=2))
     else:
         if not all_findings:
@@ -6,60 +6,163 @@ Dispatch AI Agents to audit the HRM codebase and file GitHub issues.
 import sys
 import re
 import os
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Pattern, Sequence, Union
 
 # Setup path
 sys.path.append(str(Path(__file__).parent.parent))
 from common_config import HRM_REPO_DIR, setup_logging
 from github_client import GitHubClient
+from workspace_index import get_index
 
 logger = setup_logging("dispatch_agents")
 
+# Files above this size are grepped through mmap instead of the index cache
+MMAP_THRESHOLD = 1 << 20
+
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+# Pattern set -> (one bytes alternation with a named group per pattern, group name -> pattern)
+_combined_patterns: Dict[Tuple[Pattern, ...], Tuple[Pattern, Dict[str, Pattern]]] = {}
+_combined_lock = threading.Lock()
+
+def _combined_bytes_pattern(patterns: Tuple[Pattern, ...]) -> Tuple[Pattern, Dict[str, Pattern]]:
+    """Compile `patterns` into one bytes regex, once per pattern set."""
+    with _combined_lock:
+        combined = _combined_patterns.get(patterns)
+        if combined is None:
+            groups, parts = {}, []
+            for i, pattern in enumerate(patterns):
+                flags = "".join(letter for flag, letter in _INLINE_FLAGS if pattern.flags & flag)
+                body = f"(?{flags}:{pattern.pattern})" if flags else pattern.pattern
+                parts.append(f"(?P<p{i}>{body})")
+                groups[f"p{i}"] = pattern
+            # MULTILINE so ^ and $ anchor to lines, as in the per-line scan
+            regex = re.compile("|".join(parts).encode("utf-8"), re.MULTILINE)
+            combined = _combined_patterns[patterns] = (regex, groups)
+        return combined
+
+class IssueTitleIndex:
+    """Open issue titles, listed once on first use and shared by all auditors."""
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self._titles: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, int]:
+        if self._titles is None:
+            self._titles = self.client.issue_titles(state="open")
+            logger.info(f"Loaded {len(self._titles)} open issue titles.")
+        return self._titles
+
+    def claim(self, title: str) -> Optional[int]:
+        """
+        Return the number of an open issue with `title`, or None after
+        reserving the title so a concurrent auditor won't file it twice.
+        """
+        with self._lock:
+            titles = self._load()
+            if title in titles:
+                return titles[title]
+            titles[title] = 0
+            return None
+
+    def release(self, title: str):
+        """Forget a reservation whose issue could not be created."""
+        with self._lock:
+            if self._titles and self._titles.get(title) == 0:
+                del self._titles[title]
+
 class Auditor:
     def __init__(self, name: str, client: GitHubClient):
         self.name = name
         self.client = client
         self.repo_dir = HRM_REPO_DIR
+        # Shared by all auditors, so each file is listed and read once
+        self.index = get_index(self.repo_dir)
 
     def audit(self) -> Tuple[str, str]:
         """Performs the audit and returns (title, body)."""
         raise NotImplementedError
 
-    def run(self):
+    def run(self, existing: Optional[IssueTitleIndex] = None):
         title, body = self.audit()
         logger.info(f"Agent {self.name} finished audit. Title: {title}")
 
         # Check if issue already exists
-        existing_issues = self.client.list_issues(state="open", limit=100)
-        for issue in existing_issues:
-            if issue['title'] == title:
-                logger.info(f"Issue '{title}' already exists (#{issue['number']}). Skipping.")
-                return
+        existing = existing or IssueTitleIndex(self.client)
+        number = existing.claim(title)
+        if number is not None:
+            logger.info(f"Issue '{title}' already exists (#{number}). Skipping.")
+            return
 
         logger.info(f"Creating issue '{title}'...")
         result = self.client.create_issue(title, body)
         if result:
             logger.info(f"Created issue: {result}")
         else:
+            existing.release(title)
             logger.error("Failed to create issue.")
 
     def _check_file_exists(self, filepath: str) -> bool:
-        return (self.repo_dir / filepath).exists()
-
-    def _grep_file(self, filepath: str, pattern: str) -> List[str]:
+        return self.index.exists(filepath) or (self.repo_dir / filepath).exists()
+
+    def _grep_file(self, filepath: str, pattern: Union[str, Pattern]) -> List[str]:
+        pattern = re.compile(pattern)
+        return self._grep_patterns(filepath, [pattern])[pattern]
+
+    def _grep_patterns(self, filepath: str, patterns: Sequence[Pattern]) -> Dict[Pattern, List[str]]:
+        """
+        Scan `filepath` once for several compiled patterns. Returns
+        "path:line: text" hits grouped by pattern (every pattern is a key).
+        """
+        found: Dict[Pattern, List[str]] = {p: [] for p in patterns}
         if not self._check_file_exists(filepath):
-            return []
-        found = []
+            return found
         try:
-            with open(self.repo_dir / filepath, 'r', encoding='utf-8') as f:
-                for i, line in enumerate(f, 1):
-                    if re.search(pattern, line):
-                        found.append(f"{filepath}:{i}: {line.strip()}")
+            entry = self.index.get(self.repo_dir / filepath)
+            if entry is not None and entry.size > MMAP_THRESHOLD:
+                self._grep_mmap(filepath, entry.abspath, found)
+                return found
+            content = self.index.read_text(self.repo_dir / filepath)
+            for i, line in enumerate(content.splitlines(), 1):
+                for pattern, hits in found.items():
+                    if pattern.search(line):
+                        hits.append(f"{filepath}:{i}: {line.strip()}")
         except Exception as e:
             logger.warning(f"Error reading {filepath}: {e}")
         return found
 
+    @staticmethod
+    def _grep_mmap(filepath: str, abspath: str, found: Dict[Pattern, List[str]]):
+        """
+        Large-file path: one pass over the mapped bytes with all patterns
+        combined. The alternation reports one pattern per match, so the
+        others are checked on just the lines it lands on.
+        """
+        regex, groups = _combined_bytes_pattern(tuple(found))
+        with open(abspath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            line_no, counted_to, pos = 1, 0, 0
+            while True:
+                m = regex.search(buf, pos)
+                if m is None:
+                    break
+                start = buf.rfind(b"\n", 0, m.start()) + 1
+                end = buf.find(b"\n", m.start())
+                end = end if end != -1 else len(buf)
+                line_no += buf[counted_to:start].count(b"\n")
+                counted_to = start
+                text = buf[start:end].decode("utf-8", errors="replace")
+                hit = f"{filepath}:{line_no}: {text.strip()}"
+                for name, pattern in groups.items():
+                    if name == m.lastgroup or pattern.search(text):
+                        found[pattern].append(hit)
+                pos = end + 1  # One hit per line and pattern, like the per-line scan
+                if pos > len(buf):
+                    break
+
 class FrontendAuditor(Auditor):
     def audit(self) -> Tuple[str, str]:
         title = "[Audit] Frontend Architecture & UX Review"
@@ -73,16 +176,13 @@ class FrontendAuditor(Auditor):
 
         # Check for 'use client' in app/
         client_components = []
-        app_dir = self.repo_dir / "app"
-        if app_dir.exists():
-            for p in app_dir.rglob("*.tsx"):
-                try:
-                    content = p.read_text(encoding='utf-8')
-                    if 'use client' in content:
-                        rel_path = p.relative_to(self.repo_dir)
-                        client_components.append(str(rel_path))
-                except:
-                    pass
+        for entry in self.index.files("app", pattern="*.tsx"):
+            try:
+                content = self.index.read_entry(entry)
+                if 'use client' in content:
+                    client_components.append(entry.path)
+            except:
+                pass
 
         if client_components:
             for cc in client_components[:5]: # Limit to 5 examples
@@ -93,11 +193,9 @@ class FrontendAuditor(Auditor):
         # 2. Material-UI Optimization
         body_sections.append("## Material-UI Optimization")
         sx_usage = []
-        components_dir = self.repo_dir / "components"
-        if components_dir.exists():
-            for p in components_dir.rglob("*.tsx"):
-                if "sx={" in p.read_text(encoding='utf-8', errors='ignore'):
-                    sx_usage.append(str(p.relative_to(self.repo_dir)))
+        for entry in self.index.files("components", pattern="*.tsx"):
+            if "sx={" in self.index.read_entry(entry, errors='ignore'):
+                sx_usage.append(entry.path)
 
         if sx_usage:
             body_sections.append(f"Found `sx` prop usage in {len(sx_usage)} files. Consider extracting to styled-components for performance if critical.")
@@ -113,6 +211,10 @@ class FrontendAuditor(Auditor):
         return title, "\n\n".join(body_sections)
 
 class QAAuditor(Auditor):
+    TIMEOUT_RE = re.compile(r"(page\.waitForTimeout|setTimeout|setInterval)")
+    RANDOM_RE = re.compile(r"Math\.random")
+    SERIAL_RE = re.compile(r"test\.describe\.serial")
+
     def audit(self) -> Tuple[str, str]:
         title = "[Audit] Test Suite Robustness & Coverage"
         body_sections = ["## Summary", "Automated review of test strategy and coverage."]
@@ -123,19 +225,12 @@ class QAAuditor(Auditor):
         random_inputs = []
         isolation_issues = []
 
-        tests_dir = self.repo_dir / "tests"
-        if tests_dir.exists():
-            for p in tests_dir.rglob("*.ts"):
-                rel_path = str(p.relative_to(self.repo_dir))
-
-                # Check for timeouts
-                timeouts.extend(self._grep_file(rel_path, r"(page\.waitForTimeout|setTimeout|setInterval)"))
-
-                # Check for random inputs
-                random_inputs.extend(self._grep_file(rel_path, r"Math\.random"))
-
-                # Check for serial mode (potential isolation issue)
-                isolation_issues.extend(self._grep_file(rel_path, r"test\.describe\.serial"))
+        for entry in self.index.files("tests", pattern="*.ts"):
+            # Timeouts, random inputs and serial mode (potential isolation issue) in one pass
+            hits = self._grep_patterns(entry.path, [self.TIMEOUT_RE, self.RANDOM_RE, self.SERIAL_RE])
+            timeouts.extend(hits[self.TIMEOUT_RE])
+            random_inputs.extend(hits[self.RANDOM_RE])
+            isolation_issues.extend(hits[self.SERIAL_RE])
 
         if timeouts:
             body_sections.append("Found potential timing assumptions (waitForTimeout/setTimeout):")
@@ -170,6 +265,8 @@ class QAAuditor(Auditor):
         return title, "\n\n".join(body_sections)
 
 class CodeHygieneAuditor(Auditor):
+    VAR_RE = re.compile(r"var\s+")
+
     def audit(self) -> Tuple[str, str]:
         title = "[Audit] Code Hygiene & Operational Standards"
         body_sections = ["## Summary", "Automated code quality and hygiene check."]
@@ -178,7 +275,7 @@ class CodeHygieneAuditor(Auditor):
         body_sections.append("## Static Analysis Findings")
         tsconfig = self.repo_dir / "tsconfig.json"
         if tsconfig.exists():
-            content = tsconfig.read_text(encoding='utf-8')
+            content = self.index.read_text(tsconfig)
             if '"strict": true' in content:
                 body_sections.append("- ✅ TypeScript Strict mode is enabled.")
             else:
@@ -195,11 +292,8 @@ class CodeHygieneAuditor(Auditor):
         # 3. Modern Syntax / Legacy Patterns
         body_sections.append("## Refactoring Targets (Legacy Patterns)")
         vars_found = []
-        app_dir = self.repo_dir / "app"
-        if app_dir.exists():
-            for p in app_dir.rglob("*.ts*"):
-                 found = self._grep_file(str(p.relative_to(self.repo_dir)), r"var\s+")
-                 vars_found.extend(found)
+        for entry in self.index.files("app", pattern="*.ts*"):
+            vars_found.extend(self._grep_file(entry.path, self.VAR_RE))
 
         if vars_found:
             body_sections.append("Found usage of `var` (prefer `let`/`const`):")
@@ -243,6 +337,7 @@ def main():
     parser = argparse.ArgumentParser(description="Dispatch AI Agents")
     parser.add_argument("auditor", nargs="?", default="all", help="Specific auditor to run (frontend, qa, hygiene, docs)")
     parser.add_argument("--dry-run", action="store_true", help="Print issue content instead of creating on GitHub")
+    parser.add_argument("--jobs", "-j", type=int, default=0, help="Auditors to run at once (default: all selected)")
     args = parser.parse_args()
 
     try:
@@ -258,21 +353,34 @@ def main():
         DocumentationAuditor("Docs", client)
     ]
 
-    for auditor in auditors:
-        if args.auditor == "all" or args.auditor.lower() in auditor.name.lower():
-            logger.info(f"Running {auditor.name} Auditor...")
-            try:
-                if args.dry_run:
-                    title, body = auditor.audit()
-                    print(f"\n--- [DRY RUN] {auditor.name} ---")
-                    print(f"TITLE: {title}")
-                    print("BODY:")
-                    print(body)
-                    print("-----------------------------")
-                else:
-                    auditor.run()
-            except Exception as e:
-                logger.error(f"Error running {auditor.name}: {e}")
+    selected = [a for a in auditors if args.auditor == "all" or args.auditor.lower() in a.name.lower()]
+    existing = IssueTitleIndex(client)
+
+    def run_one(auditor: Auditor):
+        logger.info(f"Running {auditor.name} Auditor...")
+        try:
+            if args.dry_run:
+                return auditor.audit()
+            auditor.run(existing)
+        except Exception as e:
+            logger.error(f"Error running {auditor.name}: {e}")
+        return None
+
+    # Audits are file I/O bound and independent; run them side by side
+    jobs = args.jobs or len(selected) or 1
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        outcomes = list(pool.map(run_one, selected))
+
+    if args.dry_run:
+        for auditor, outcome in zip(selected, outcomes):
+            if outcome is None:
+                continue
+            title, body = outcome
+            print(f"\n--- [DRY RUN] {auditor.name} ---")
+            print(f"TITLE: {title}")
+            print("BODY:")
+            print(body)
+            print("-----------------------------")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
+import argparse
 import subprocess
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -63,8 +65,214 @@ def close_and_reopen_issue(issue_number, repo_path):
         
     logging.info(f"  - Successfully recreated issue #{issue_number}")
 
+# --- Batched mode ---
+
+# One page = 100 open issues with their PR cross-references. gh fills in
+# {owner}/{repo} from the checkout and $endCursor while paginating.
+OPEN_ISSUES_QUERY = """
+query($owner: String!, $repo: String!, $endCursor: String) {
+  repository(owner: $owner, name: $repo) {
+    issues(states: OPEN, first: 100, after: $endCursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id
+        number
+        timelineItems(itemTypes: [CROSS_REFERENCED_EVENT], first: 100) {
+          nodes {
+            ... on CrossReferencedEvent {
+              source { __typename ... on PullRequest { number state } }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Issues closed and reopened per GraphQL request; each issue adds two aliased fields
+MUTATION_BATCH = 20
+
+def build_reopen_mutation(ids):
+    """One mutation that closes and reopens every issue in `ids` via aliased fields."""
+    params = ", ".join(f"$id{i}: ID!" for i in range(len(ids)))
+    fields = "\n".join(
+        f"  close{i}: closeIssue(input: {{issueId: $id{i}}}) {{ issue {{ number }} }}\n"
+        f"  reopen{i}: reopenIssue(input: {{issueId: $id{i}}}) {{ issue {{ number }} }}"
+        for i in range(len(ids))
+    )
+    return f"mutation({params}) {{\n{fields}\n}}", {f"id{i}": issue_id for i, issue_id in enumerate(ids)}
+
+def _split_json_stream(text):
+    """`gh api --paginate` prints one JSON document per page back to back."""
+    decoder = json.JSONDecoder()
+    docs, pos = [], 0
+    text = text.strip()
+    while pos < len(text):
+        doc, end = decoder.raw_decode(text, pos)
+        docs.append(doc)
+        pos = end
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+    return docs
+
+def load_fixture(path):
+    """Recorded {"pages": [...], "mutations": [...]}; a bare list is pages only."""
+    with open(path, encoding="utf-8") as f:
+        recorded = json.load(f)
+    if isinstance(recorded, list):
+        return {"pages": recorded, "mutations": []}
+    return {"pages": recorded.get("pages", []), "mutations": recorded.get("mutations", [])}
+
+def fetch_issue_pages(repo_path, fixture=None):
+    """
+    All pages of OPEN_ISSUES_QUERY, fetched with one paginated `gh api graphql`
+    call, or taken from a loaded `fixture`.
+    """
+    if fixture is not None:
+        return fixture["pages"]
+
+    logging.info("Fetching open issues and linked PRs (batched GraphQL)...")
+    command = [
+        "gh", "api", "graphql", "--paginate",
+        "-f", f"query={OPEN_ISSUES_QUERY}",
+        "-F", "owner={owner}", "-F", "repo={repo}",
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, cwd=repo_path)
+    try:
+        # gh exits non-zero on partial GraphQL errors but still prints the pages
+        pages = _split_json_stream(result.stdout)
+    except json.JSONDecodeError as e:
+        logging.error(f"Failed to fetch issues via GraphQL: {e}: {result.stderr.strip()}")
+        return []
+    if result.returncode != 0 and not pages:
+        logging.error(f"Failed to fetch issues via GraphQL: {result.stderr.strip()}")
+    return pages
+
+def _issue_nodes(page):
+    issues = ((page.get("data") or {}).get("repository") or {}).get("issues") or {}
+    return [issue for issue in issues.get("nodes") or [] if issue]
+
+def issues_without_linked_pr(pages):
+    """[(node id, number)] for open issues with no cross-referencing pull request."""
+    unlinked = []
+    for page in pages:
+        for error in page.get("errors") or []:
+            # Partial results: the failing nodes come back null, the rest are usable
+            logging.warning(f"GraphQL error while listing issues: {error.get('message')}")
+        for issue in _issue_nodes(page):
+            events = (issue.get("timelineItems") or {}).get("nodes") or []
+            if not any(((e or {}).get("source") or {}).get("__typename") == "PullRequest" for e in events):
+                unlinked.append((issue["id"], issue["number"]))
+    return unlinked
+
+def parse_reopen_result(batch, response):
+    """
+    Split one mutation response into (recreated numbers, [(number, error)]).
+    An issue counts as recreated only if both its aliased fields returned data.
+    """
+    data = (response or {}).get("data") or {}
+    errors = {}
+    for error in (response or {}).get("errors") or []:
+        alias = (error.get("path") or [""])[0]
+        index = alias.replace("close", "").replace("reopen", "")
+        if index.isdigit():
+            errors.setdefault(int(index), error.get("message", "unknown error"))
+        else:
+            # Not tied to a field (e.g. a syntax error): the whole batch failed
+            return [], [(number, error.get("message", "unknown error")) for _, number in batch]
+
+    recreated, failed = [], []
+    for i, (_, number) in enumerate(batch):
+        if i in errors:
+            failed.append((number, errors[i]))
+        elif data.get(f"close{i}") and data.get(f"reopen{i}"):
+            recreated.append(number)
+        else:
+            failed.append((number, "no data returned"))
+    return recreated, failed
+
+def reopen_batch(batch, repo_path, replay=None):
+    """Close and reopen `batch` [(node id, number)] in one GraphQL request (or a replayed response)."""
+    if replay is not None:
+        return replay
+    query, variables = build_reopen_mutation([issue_id for issue_id, _ in batch])
+    command = ["gh", "api", "graphql", "-f", f"query={query}"]
+    for name, value in variables.items():
+        command += ["-F", f"{name}={value}"]
+    result = subprocess.run(command, capture_output=True, text=True, cwd=repo_path)
+    try:
+        # Partial failures still print a response (with "errors") and exit non-zero
+        return json.loads(result.stdout)
+    except json.JSONDecodeError:
+        return {"errors": [{"message": result.stderr.strip() or f"gh exited with {result.returncode}"}]}
+
+def recreate_batched(repo_path, parallel=8, fixture=None, record=None, dry_run=False,
+                     batch_size=MUTATION_BATCH):
+    """
+    Batched mode. With `fixture`, recorded query pages and mutation responses
+    are replayed and nothing is sent to GitHub; `dry_run` stops before the
+    mutations either way.
+    """
+    recorded = load_fixture(fixture) if fixture else None
+    if recorded is not None:
+        logging.info(f"Replaying recorded responses from {fixture}...")
+    pages = fetch_issue_pages(repo_path, fixture=recorded)
+    total = sum(len(_issue_nodes(page)) for page in pages)
+    unlinked = issues_without_linked_pr(pages)
+    logging.info(f"{total} open issues, {len(unlinked)} without a linked PR.")
+
+    batches = [unlinked[i:i + max(1, batch_size)] for i in range(0, len(unlinked), max(1, batch_size))]
+    responses = []
+    if unlinked and dry_run:
+        for _, number in unlinked:
+            logging.info(f"  [DRY RUN] Would recreate issue #{number}")
+    elif unlinked:
+        replays = recorded["mutations"] if recorded is not None else []
+        if recorded is not None and len(replays) < len(batches):
+            logging.error(f"Fixture has {len(replays)} mutation responses for {len(batches)} batches")
+            return
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+            responses = list(pool.map(
+                lambda i: reopen_batch(batches[i], repo_path, replays[i] if recorded is not None else None),
+                range(len(batches)),
+            ))
+        recreated = 0
+        for batch, response in zip(batches, responses):
+            done, failed = parse_reopen_result(batch, response)
+            recreated += len(done)
+            for number in done:
+                logging.info(f"  - Successfully recreated issue #{number}")
+            for number, message in failed:
+                logging.error(f"  - Failed to recreate issue #{number}: {message}")
+        source = " (replayed)" if recorded is not None else ""
+        logging.info(f"Recreated {recreated} of {len(unlinked)} issues in {len(batches)} request(s){source}.")
+
+    if record and recorded is None:
+        with open(record, "w", encoding="utf-8") as f:
+            json.dump({"pages": pages, "mutations": responses}, f, indent=2)
+        logging.info(f"Recorded {len(pages)} pages and {len(responses)} mutation responses to {record}")
+
 def main():
+    parser = argparse.ArgumentParser(description="Close and reopen open issues that have no linked PR.")
+    parser.add_argument("--batched", action="store_true",
+                        help="Fetch linked-PR status for all issues in paginated GraphQL queries "
+                             "and recreate issues concurrently")
+    parser.add_argument("--parallel", type=int, default=8,
+                        help="Concurrent close/reopen requests in batched mode (default: 8)")
+    parser.add_argument("--batch-size", type=int, default=MUTATION_BATCH,
+                        help=f"Issues per close/reopen mutation in batched mode (default: {MUTATION_BATCH})")
+    parser.add_argument("--fixture", help="Replay recorded GraphQL responses from this file; nothing is sent")
+    parser.add_argument("--record", help="Save the GraphQL responses of this run to this file")
+    parser.add_argument("--dry-run", action="store_true", help="List issues that would be recreated")
+    args = parser.parse_args()
+
     repo_path = "hrm"  # Target the hrm repository in the current workspace
+
+    if args.batched or args.fixture:
+        recreate_batched(repo_path, parallel=args.parallel, fixture=args.fixture,
+                         record=args.record, dry_run=args.dry_run, batch_size=args.batch_size)
+        return
     
     issues = get_open_issues(repo_path)
     if not issues:
@@ -74,7 +282,10 @@ def main():
     for issue in issues:
         issue_number = issue["number"]
         if not has_linked_pr(issue_number, repo_path):
-            close_and_reopen_issue(issue_number, repo_path)
+            if args.dry_run:
+                logging.info(f"  [DRY RUN] Would recreate issue #{issue_number}")
+            else:
+                close_and_reopen_issue(issue_number, repo_path)
             
 if __name__ == "__main__":
     main()
@@ -8,7 +8,11 @@ import sys
 import os
 import argparse
 import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 # Add parent directory to path to import common modules
 current_dir = Path(__file__).resolve().parent
@@ -68,24 +72,138 @@ def update_branch(client: GitHubClient, branch: str) -> bool:
         # Merge is already aborted by client.merge if it fails
         return False
 
+def merge_in_worktree(client: GitHubClient, branch: str, leader_ref: str,
+                      worktrees_dir: Path) -> Tuple[str, Optional[str]]:
+    """
+    Merge `leader_ref` into origin/<branch> in a throwaway worktree.
+    Returns (status, commit) where status is merged, up-to-date, conflict,
+    missing or error; commit is the merge result to push when status is merged.
+    """
+    remote_ref = f"origin/{branch}"
+    old = client.rev_parse(remote_ref)
+    if not old:
+        return "missing", None
+
+    # mkdtemp keeps names unique: feat/a and feat_a sanitize to the same prefix
+    path = Path(tempfile.mkdtemp(prefix=re.sub(r"[^A-Za-z0-9._-]", "_", branch) + "-", dir=worktrees_dir))
+    if not client.add_worktree(path, remote_ref):
+        logger.error(f"    {branch}: could not create a worktree at {path}")
+        return "error", None
+    try:
+        worktree = GitHubClient(repo_path=path)
+        message = f"Merge branch '{leader_ref.split('/')[-1]}' into {branch}"
+        if not worktree.merge(leader_ref, message=message, abort_on_conflict=True):
+            return "conflict", None
+        new = worktree.rev_parse("HEAD")
+        return ("up-to-date", None) if new == old else ("merged", new)
+    finally:
+        client.remove_worktree(path)
+
+def merge_in_object_db(client: GitHubClient, branch: str, leader_ref: str) -> Tuple[str, Optional[str]]:
+    """Like merge_in_worktree, but via `git merge-tree` with no checkout at all."""
+    result = client.merge_without_checkout(
+        f"origin/{branch}", leader_ref,
+        message=f"Merge branch '{leader_ref.split('/')[-1]}' into {branch}",
+    )
+    status = result["status"]
+    if status in ("merged", "fast-forward"):
+        return "merged", result["commit"]
+    if status == "conflict":
+        paths = ", ".join(c["path"] for c in result["conflicts"])
+        logger.info(f"    {branch}: conflicts in {paths}")
+        return "conflict", None
+    if status == "error":
+        if result["messages"] == [f"Unknown revision: origin/{branch}"]:
+            return "missing", None
+        stderr = "; ".join(result["messages"]) or "no output"
+        logger.error(f"    {branch}: git merge-tree failed: {stderr}")
+        return "error", None
+    return status, None
+
+def update_branches_parallel(client: GitHubClient, branches: List[str], jobs: int,
+                             leader_ref: str = "origin/leader", use_worktrees: bool = False) -> Dict[str, str]:
+    """
+    Update many branches at once without touching the main checkout, then
+    push every result in a single multi-ref push. Merges are computed with
+    `git merge-tree` where git supports it (>= 2.38), otherwise each branch
+    is merged in its own worktree. Returns {branch: status}.
+    """
+    logger.info(f"⚡ Updating {len(branches)} branches with {jobs} workers...")
+    outcomes = None
+    if not use_worktrees:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            outcomes = list(pool.map(lambda b: merge_in_object_db(client, b, leader_ref), branches))
+        if any(status == "unsupported" for status, _ in outcomes):
+            logger.info("git merge-tree --write-tree unavailable; falling back to worktrees")
+            outcomes = None
+
+    if outcomes is None:
+        worktrees_dir = Path(tempfile.mkdtemp(prefix="update-prs-"))
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+                outcomes = list(pool.map(
+                    lambda b: merge_in_worktree(client, b, leader_ref, worktrees_dir), branches
+                ))
+        finally:
+            shutil.rmtree(worktrees_dir, ignore_errors=True)
+            client.run_cmd(["git", "worktree", "prune"], check=False)
+
+    statuses = {}
+    refspecs = []
+    for branch, (status, commit) in zip(branches, outcomes):
+        statuses[branch] = status
+        if status == "merged":
+            refspecs.append(f"{commit}:refs/heads/{branch}")
+        elif status == "conflict":
+            logger.warning(f"⚠️  Conflicts in {branch} - skipping")
+        elif status == "missing":
+            logger.warning(f"⚠️ Branch {branch} not found on remote, skipping")
+        elif status == "error":
+            logger.error(f"❌ Could not merge leader into {branch} - skipping")
+
+    if refspecs:
+        logger.info(f"🚀 Pushing {len(refspecs)} branches in one push...")
+        pushed = client.push_refs("origin", refspecs)
+        for branch in branches:
+            if statuses[branch] == "merged":
+                ok = pushed.get(f"refs/heads/{branch}", False)
+                statuses[branch] = "updated" if ok else "push-failed"
+                if ok:
+                    logger.info(f"✅ Updated {branch}")
+                else:
+                    logger.error(f"❌ Failed to push {branch}")
+    return statuses
+
 def main():
     parser = argparse.ArgumentParser(description="Update PR branches with changes from leader.")
     parser.add_argument('targets', metavar='TARGET', type=str, nargs='*',
                         help='PR numbers (e.g. 123, #123) or branch names. If empty, updates ALL open PRs.')
+    parser.add_argument('--parallel', '-j', type=int, default=0, metavar='N',
+                        help='Merge N branches at once without a checkout and push them together '
+                             '(leaves the hrm/ checkout untouched)')
+    parser.add_argument('--worktrees', action='store_true',
+                        help='With --parallel, merge in throwaway worktrees instead of with git merge-tree')
 
     args = parser.parse_args()
 
     client = GitHubClient(repo_path=HRM_REPO_DIR)
 
-    # Ensure we're on leader
-    logger.info("Switching to leader branch...")
-    if not client.checkout("leader"):
-        logger.error("Failed to checkout leader branch. Aborting.")
-        return
+    if args.parallel:
+        # Parallel mode works on origin/* refs; one fetch replaces every pull
+        logger.info("Fetching origin...")
+        if not client.fetch("origin"):
+            logger.error("Failed to fetch origin. Aborting.")
+            return
+    else:
+        # Ensure we're on leader
+        logger.info("Switching to leader branch...")
+        if not client.checkout("leader"):
+            logger.error("Failed to checkout leader branch. Aborting.")
+            return
 
-    logger.info("Pulling latest leader...")
-    if not client.pull("origin", "leader"):
-        logger.warning("Could not pull latest leader")
+        logger.info("Pulling latest leader...")
+        if not client.pull("origin", "leader"):
+            logger.warning("Could not pull latest leader")
 
     branches_to_update = []
 
@@ -114,14 +232,20 @@ def main():
     updated_count = 0
     failed_count = 0
 
-    for branch in branches_to_update:
-        if update_branch(client, branch):
-            updated_count += 1
-        else:
-            failed_count += 1
+    if args.parallel:
+        statuses = update_branches_parallel(client, branches_to_update, args.parallel,
+                                            use_worktrees=args.worktrees)
+        updated_count = sum(1 for s in statuses.values() if s in ("updated", "up-to-date"))
+        failed_count = len(statuses) - updated_count
+    else:
+        for branch in branches_to_update:
+            if update_branch(client, branch):
+                updated_count += 1
+            else:
+                failed_count += 1
 
-    # Return to leader
-    client.checkout("leader")
+        # Return to leader
+        client.checkout("leader")
 
     logger.info("==================== SUMMARY ====================")
     logger.info(f"Total branches processed: {len(branches_to_update)}")
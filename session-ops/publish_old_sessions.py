@@ -2,19 +2,26 @@
 """
 Publish old Jules sessions that may have stalled.
 Uses unified configuration and data management.
+
+All publish requests are sent concurrently through one Jules client, then a
+single watcher polls every pending session until it opens a PR, fails, or
+hits its own deadline.
 """
 
 import csv
-import subprocess
 import os
+import sys
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # Import unified configuration
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from common_config import (
-    setup_logging, setup_python_path, get_data_dir, WORKSPACE_ROOT
+    setup_logging, setup_python_path, get_data_dir
 )
+from jules_client import PUBLISH_PROMPT, get_jules_client
 
 # Setup
 setup_python_path()
@@ -22,43 +29,23 @@ logger = setup_logging("publish_old_sessions")
 
 # Configuration
 CONSOLIDATED_WORKSTREAMS_CSV = "consolidated_workstreams.csv"
-JULES_OPS_SCRIPT = "jules_ops.py"
+FAILED_STATES = ("FAILED", "CANCELLED", "TERMINATED")
 
-def run_jules_ops_export():
-    """Run jules_ops.py export to regenerate CSV files."""
+def regenerate_csv(client):
+    """Regenerate the CSV exports in-process (same data as `jules_ops.py export`)."""
     logger.info("Regenerating CSV data from Jules and GitHub...")
-    
-    jules_ops_path = WORKSPACE_ROOT / JULES_OPS_SCRIPT
-    command = [
-        "python3",
-        str(jules_ops_path),
-        "export",
-        "--format",
-        "csv"
-    ]
-    
     try:
-        result = subprocess.run(
-            command,
-            cwd=str(WORKSPACE_ROOT),
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        
-        if result.returncode == 0:
-            logger.info("✅ CSV data regenerated successfully.")
-        else:
-            logger.error(f"❌ Failed to regenerate CSV data. Exit code: {result.returncode}")
-            
-        if result.stdout:
-            logger.info(result.stdout)
-        if result.stderr:
-            logger.error(result.stderr)
-    except FileNotFoundError:
-        logger.error(f"Error: '{jules_ops_path}' not found.")
+        # Deferred: only --update needs the GitHub client and export helpers
+        from jules_ops import export_data, get_gh_client
+
+        gh_client = get_gh_client()
+        sessions = client.list_sessions()
+        issues = gh_client.list_issues(state="open", limit=100)
+        prs = gh_client.list_prs(state="open", limit=100)
+        export_data(sessions, issues, prs, fmt="csv")
+        logger.info("✅ CSV data regenerated successfully.")
     except Exception as e:
-        logger.error(f"An unexpected error occurred during CSV regeneration: {e}")
+        logger.error(f"❌ Failed to regenerate CSV data: {e}")
 
 
 def get_unpublished_sessions():
@@ -68,7 +55,7 @@ def get_unpublished_sessions():
     """
     data_dir = get_data_dir()
     csv_path = data_dir / CONSOLIDATED_WORKSTREAMS_CSV
-    
+
     sessions_to_publish = []
     try:
         with open(csv_path, mode="r", newline="", encoding="utf-8") as file:
@@ -93,53 +80,59 @@ def get_unpublished_sessions():
     return sessions_to_publish
 
 
-def publish_session_with_timeout(session_id, timeout_seconds=60):
-    """
-    Attempt to publish a single Jules session with a specified timeout.
-    """
-    logger.info(f"Publishing session: {session_id} (timeout: {timeout_seconds}s)...")
-    
-    jules_ops_path = WORKSPACE_ROOT / JULES_OPS_SCRIPT
-    command = [
-        "timeout",
-        str(timeout_seconds),
-        "python3",
-        str(jules_ops_path),
-        "publish",
-        session_id,
-    ]
+def _pr_url(status):
+    for output in status.get("outputs", []):
+        if "pullRequest" in output:
+            return output["pullRequest"].get("url")
+    return None
 
-    try:
-        result = subprocess.run(
-            command,
-            cwd=str(WORKSPACE_ROOT),
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        
-        logger.info(f"--- Output for session {session_id} ---")
-        if result.stdout:
-            logger.info(result.stdout)
-        if result.stderr:
-            logger.error(result.stderr)
-        logger.info(f"--- End Output for session {session_id} ---")
-
-        if result.returncode == 0:
-            logger.info(f"✅ Publish request for session {session_id} completed.")
-            return True
-        elif result.returncode == 124:  # Timeout exit code
-            logger.warning(f"❌ Publish request for session {session_id} timed out after {timeout_seconds} seconds.")
-            return False
-        else:
-            logger.error(f"❌ Publish request for session {session_id} failed with exit code {result.returncode}.")
-            return False
 
-    except FileNotFoundError:
-        logger.error(f"Error: '{jules_ops_path}' or 'timeout' command not found.")
-    except Exception as e:
-        logger.error(f"An unexpected error occurred: {e}")
-    return False
+def publish_sessions(client, session_ids, timeout_seconds=60, workers=16, poll_interval=10):
+    """
+    Ask every session to publish, then watch them all until each one has a
+    PR, ends, or passes `timeout_seconds` after its request was sent.
+    Returns {session_id: (outcome, detail)} where outcome is one of
+    published, succeeded, failed, timeout or send-failed.
+    """
+    results = {}
+    deadlines = {}
+
+    def send(session_id):
+        return session_id, client.send_message(session_id, PUBLISH_PROMPT), time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(session_ids)))) as pool:
+        for session_id, ok, sent_at in pool.map(send, session_ids):
+            if ok:
+                deadlines[session_id] = sent_at + timeout_seconds
+            else:
+                results[session_id] = ("send-failed", "")
+        logger.info(f"📨 Sent {len(deadlines)} of {len(session_ids)} publish requests; watching for PRs...")
+
+        # One watcher for every pending session
+        while deadlines:
+            wait = min(poll_interval, max(0.0, min(deadlines.values()) - time.monotonic()))
+            time.sleep(wait)
+            pending = list(deadlines)
+            for session_id, status in zip(pending, pool.map(client.get_session, pending)):
+                state = (status or {}).get("state", "UNKNOWN")
+                pr_url = _pr_url(status or {})
+                if pr_url:
+                    results[session_id] = ("published", pr_url)
+                elif state == "SUCCEEDED":
+                    results[session_id] = ("succeeded", "no PR link yet")
+                elif state in FAILED_STATES:
+                    results[session_id] = ("failed", state)
+                elif time.monotonic() >= deadlines[session_id]:
+                    results[session_id] = ("timeout", state)
+                else:
+                    continue
+                del deadlines[session_id]
+                outcome, detail = results[session_id]
+                logger.info(f"    {session_id}: {outcome} ({detail})")
+            if deadlines:
+                logger.info(f"⏳ {len(deadlines)} sessions still pending...")
+
+    return results
 
 
 def main():
@@ -151,14 +144,24 @@ def main():
         action="store_true",
         help="Regenerate consolidated_workstreams.csv before processing sessions.",
     )
+    parser.add_argument(
+        "--timeout", type=int, default=60,
+        help="Seconds to wait for each session to publish (default: 60)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=16,
+        help="Concurrent API requests (default: 16; the client rate limit still applies)",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=10,
+        help="Seconds between status polls of pending sessions (default: 10)",
+    )
     args = parser.parse_args()
 
-    args = parser.parse_args()
+    client = get_jules_client()
 
     if args.update:
-        run_jules_ops_export()
-        # Give a moment for files to be written
-        time.sleep(2)
+        regenerate_csv(client)
 
     logger.info("Collecting unpublished Jules sessions...")
 
@@ -169,13 +172,21 @@ def main():
         return
 
     logger.info(f"Found {len(sessions)} completed, unpublished sessions.")
-
     for session in sessions:
-        session_id = session["session_id"]
-        session_title = session["session_title"]
-        logger.info(f"Processing session ID: {session_id}, Title: {session_title}")
-        publish_session_with_timeout(session_id)
-        time.sleep(1)  # Small delay to prevent overwhelming the API
+        logger.info(f"Processing session ID: {session['session_id']}, Title: {session['session_title']}")
+
+    results = publish_sessions(
+        client,
+        list(dict.fromkeys(s["session_id"] for s in sessions)),
+        timeout_seconds=args.timeout,
+        workers=args.workers,
+        poll_interval=args.poll_interval,
+    )
+
+    counts = {}
+    for outcome, _ in results.values():
+        counts[outcome] = counts.get(outcome, 0) + 1
+    logger.info("✅ Publish summary: " + ", ".join(f"{n} {k}" for k, n in sorted(counts.items())))
 
 
 if __name__ == "__main__":
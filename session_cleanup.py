@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Bulk deletion of Jules sessions.
+
+Shared by delete_failed_sessions.py, delete_archived_sessions.py,
+close_jules_sessions.py and `jules_ops.py delete-old` / `health-check --clean`.
+Sessions are selected with composable predicates and deleted concurrently;
+the client's rate limiter paces the requests. Completed deletions are
+appended to an optional checkpoint file so an interrupted run can resume.
+"""
+
+import csv
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+
+logger = logging.getLogger("session_cleanup")
+
+Session = Dict[str, Any]
+Predicate = Callable[[Session], bool]
+
+TERMINAL_STATES = ("SUCCEEDED", "FAILED", "CANCELLED", "TERMINATED")
+
+
+# -------------------------------------------------------------------------
+# SELECTION
+# -------------------------------------------------------------------------
+
+def session_id(session: Session) -> str:
+    """Bare session id ("sessions/123" -> "123"), as delete_session expects."""
+    return session.get("name", "").split("/")[-1]
+
+
+def parse_time(iso_str: Optional[str]) -> Optional[datetime]:
+    if not iso_str:
+        return None
+    try:
+        return datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
+    except ValueError:
+        logger.warning(f"Could not parse time '{iso_str}'")
+        return None
+
+
+def older_than(hours: float, now: Optional[datetime] = None) -> Predicate:
+    """Created more than `hours` ago. Sessions without a createTime never match."""
+    cutoff = (now or datetime.now(timezone.utc)).timestamp() - hours * 3600
+
+    def predicate(session: Session) -> bool:
+        created = parse_time(session.get("createTime"))
+        return created is not None and created.timestamp() < cutoff
+    return predicate
+
+
+def state_in(*states: str) -> Predicate:
+    wanted = set(states)
+    return lambda session: session.get("state") in wanted
+
+
+def state_not_in(*states: str) -> Predicate:
+    unwanted = set(states)
+    return lambda session: session.get("state") not in unwanted
+
+
+def title_matches(pattern: Union[str, "re.Pattern"]) -> Predicate:
+    regex = re.compile(pattern)
+    return lambda session: bool(regex.search(session.get("title") or ""))
+
+
+def pr_urls(session: Session) -> List[str]:
+    urls = []
+    for output in session.get("outputs", []):
+        if "pullRequest" in output:
+            url = output["pullRequest"].get("url")
+            if url:
+                urls.append(url)
+    return urls
+
+
+def has_pr() -> Predicate:
+    return lambda session: bool(pr_urls(session))
+
+
+def pr_in(urls: Iterable[str]) -> Predicate:
+    """The session's pull request output is one of `urls`."""
+    wanted = set(urls)
+    return lambda session: any(url in wanted for url in pr_urls(session))
+
+
+def all_of(*predicates: Predicate) -> Predicate:
+    return lambda session: all(p(session) for p in predicates)
+
+
+def any_of(*predicates: Predicate) -> Predicate:
+    return lambda session: any(p(session) for p in predicates)
+
+
+def negate(predicate: Predicate) -> Predicate:
+    return lambda session: not predicate(session)
+
+
+def select(sessions: Iterable[Session], predicate: Optional[Predicate] = None) -> List[Session]:
+    """Matching sessions that have a name, deduplicated by session id."""
+    selected, seen = [], set()
+    for session in sessions:
+        sid = session_id(session)
+        if not sid or sid in seen:
+            continue
+        if predicate is None or predicate(session):
+            seen.add(sid)
+            selected.append(session)
+    return selected
+
+
+# -------------------------------------------------------------------------
+# DELETION
+# -------------------------------------------------------------------------
+
+class DeletionReport:
+    """Per-session outcomes of a bulk deletion run."""
+
+    def __init__(self):
+        self.outcomes: List[Dict[str, Any]] = []
+
+    def add(self, session: Session, status: str, error: str = "", seconds: float = 0.0):
+        self.outcomes.append({
+            "session": session_id(session),
+            "title": session.get("title", ""),
+            "state": session.get("state", ""),
+            "status": status,
+            "error": error,
+            "seconds": round(seconds, 3),
+        })
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for outcome in self.outcomes:
+            counts[outcome["status"]] = counts.get(outcome["status"], 0) + 1
+        return counts
+
+    @property
+    def failed(self) -> List[Dict[str, Any]]:
+        return [o for o in self.outcomes if o["status"] == "failed"]
+
+    def summary(self) -> str:
+        counts = self.counts()
+        parts = [f"{counts[k]} {k}" for k in sorted(counts)]
+        return f"{len(self.outcomes)} sessions: " + (", ".join(parts) if parts else "nothing to do")
+
+    def write(self, path: Union[str, Path]):
+        """Write outcomes as CSV or JSON, chosen by the file extension."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".csv":
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(
+                    f, fieldnames=["session", "title", "state", "status", "error", "seconds"]
+                )
+                writer.writeheader()
+                writer.writerows(self.outcomes)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"summary": self.counts(), "outcomes": self.outcomes}, f, indent=2)
+        logger.info(f"📄 Deletion report written to {path}")
+
+
+class BulkDeleter:
+    """
+    Deletes sessions concurrently. `workers` bounds the threads in flight;
+    the request rate itself is governed by the client's rate limiter.
+    With `checkpoint`, each successful deletion is appended to that file and
+    sessions already listed there are skipped on the next run.
+    """
+
+    def __init__(self, client, workers: int = 8, dry_run: bool = False,
+                 checkpoint: Optional[Union[str, Path]] = None, progress_every: int = 0):
+        self.client = client
+        self.workers = max(1, workers)
+        self.dry_run = dry_run
+        self.checkpoint = Path(checkpoint) if checkpoint else None
+        self.progress_every = progress_every
+        self._lock = threading.Lock()
+
+    def _load_checkpoint(self) -> Set[str]:
+        done: Set[str] = set()
+        if not self.checkpoint or not self.checkpoint.exists():
+            return done
+        with open(self.checkpoint, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn final line from an interrupted run
+                if entry.get("status") == "deleted":
+                    done.add(entry["session"])
+        logger.info(f"Resuming: {len(done)} sessions already deleted per {self.checkpoint}")
+        return done
+
+    def _record(self, handle, sid: str, status: str):
+        if handle is None:
+            return
+        with self._lock:
+            handle.write(json.dumps({"session": sid, "status": status}) + "\n")
+            handle.flush()
+
+    def _delete(self, session: Session):
+        started = time.monotonic()
+        try:
+            ok = self.client.delete_session(session_id(session))
+            return ("deleted" if ok else "failed"), ("" if ok else "delete request failed"), started
+        except Exception as e:
+            return "failed", str(e), started
+
+    def run(self, sessions: List[Session], label: str = "sessions") -> DeletionReport:
+        report = DeletionReport()
+        done = self._load_checkpoint()
+        todo = []
+        for session in sessions:
+            if session_id(session) in done:
+                report.add(session, "skipped", "already deleted (checkpoint)")
+            else:
+                todo.append(session)
+
+        if self.dry_run:
+            logger.info(f"[DRY RUN] Would delete {len(todo)} {label}:")
+            for session in todo:
+                logger.info(
+                    f"    {session_id(session)}  {session.get('state', '')}  "
+                    f"{session.get('createTime', '')}  {session.get('title', '')}"
+                )
+                report.add(session, "would-delete")
+            return report
+
+        if not todo:
+            logger.info(f"No {label} to delete.")
+            return report
+
+        total = len(todo)
+        every = self.progress_every or max(1, total // 20)
+        logger.info(f"🗑️ Deleting {total} {label} with {min(self.workers, total)} workers...")
+        handle = None
+        if self.checkpoint:
+            self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(self.checkpoint, "a", encoding="utf-8")
+        run_started = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.workers, total)) as pool:
+                futures = {pool.submit(self._delete, s): s for s in todo}
+                completed = deleted = 0
+                for future in as_completed(futures):
+                    session = futures[future]
+                    status, error, started = future.result()
+                    report.add(session, status, error, time.monotonic() - started)
+                    self._record(handle, session_id(session), status)
+                    completed += 1
+                    deleted += status == "deleted"
+                    if completed % every == 0 or completed == total:
+                        logger.info(
+                            f"    Progress: {completed}/{total} "
+                            f"({deleted} deleted, {completed - deleted} failed, "
+                            f"{time.monotonic() - run_started:.1f}s)"
+                        )
+        finally:
+            if handle:
+                handle.close()
+        return report
+
+
+# -------------------------------------------------------------------------
+# CLI HELPERS
+# -------------------------------------------------------------------------
+
+def add_cleanup_arguments(parser):
+    """Flags shared by every bulk deletion entry point."""
+    parser.add_argument("--dry-run", action="store_true", help="Preview the sessions that would be deleted")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent deletions (default: 8)")
+    parser.add_argument("--checkpoint", help="Append completed deletions here and skip them when re-run")
+    parser.add_argument("--report", help="Write per-session outcomes to this .json or .csv file")
+
+
+def delete_sessions(client, sessions: List[Session], args=None, label: str = "sessions",
+                    **options) -> DeletionReport:
+    """Run a BulkDeleter configured from parsed `add_cleanup_arguments` flags (or `options`)."""
+    if args is not None:
+        options.setdefault("dry_run", getattr(args, "dry_run", False))
+        options.setdefault("workers", getattr(args, "workers", 8))
+        options.setdefault("checkpoint", getattr(args, "checkpoint", None))
+    report = BulkDeleter(client, **options).run(sessions, label=label)
+    logger.info(f"✅ {report.summary()}")
+    for outcome in report.failed:
+        logger.error(f"    Failed: {outcome['session']} ({outcome['error']})")
+    report_path = getattr(args, "report", None) if args is not None else None
+    if report_path:
+        report.write(report_path)
+    return report
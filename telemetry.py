@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Timing and metrics for hrm-workspace tools.
+
+`span()` times a block (an HTTP request, a subprocess, a pipeline stage)
+and records it in an in-process registry of latency histograms and
+counters; `cache_access()` counts cache hits and misses. When tracing is
+on (HRM_TRACE=<file>, HRM_TRACE=1 for data/trace.jsonl, or `configure()`)
+every finished span is also appended to a JSON-lines trace file.
+
+`prometheus_text()` renders the registry in the Prometheus text format.
+The workspace daemon serves it at /metrics; other processes can expose it
+with `start_metrics_server()` (or HRM_METRICS_PORT via `configure_from_env`).
+
+    with telemetry.span("jules.request", method="GET", route="sessions") as span:
+        ...
+        span.add("bytes_in", len(body))
+        span.label(status=200)
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger("telemetry")
+
+METRIC_PREFIX = "hrm_"
+# Latency buckets in seconds; pipeline stages (npm install, builds) run for minutes
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("span", default=None)
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _metric_name(name: str, suffix: str) -> str:
+    return METRIC_PREFIX + name.replace(".", "_").replace("-", "_") + suffix
+
+
+# -------------------------------------------------------------------------
+# METRICS REGISTRY
+# -------------------------------------------------------------------------
+
+class Histogram:
+    """Cumulative-bucket latency histogram, as Prometheus expects."""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[int]:
+        total, out = 0, []
+        for n in self.counts:
+            total += n
+            out.append(total)
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation (None if empty)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, seen in zip(BUCKETS, self.cumulative()):
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    """Histograms and counters keyed by (metric name, labels). Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+
+    def observe(self, name: str, value: float, labels: Labels = ()):
+        with self._lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[(name, labels)] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, value: float = 1, labels: Labels = ()):
+        with self._lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict view: counters, and count/sum/p50/p95 per histogram series."""
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), "count": h.count, "sum": round(h.sum, 6),
+                     "p50": h.quantile(0.5), "p95": h.quantile(0.95)}
+                    for (name, labels), h in sorted(self.histograms.items())
+                ],
+            }
+
+    def prometheus_text(self) -> str:
+        def fmt(labels: Labels, extra: Labels = ()) -> str:
+            pairs = labels + extra
+            if not pairs:
+                return ""
+            escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+        lines: List[str] = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{name}{fmt(labels)} {value:g}")
+            for (name, labels), h in sorted(self.histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                for bound, seen in zip(BUCKETS, h.cumulative()):
+                    lines.append(f"{name}_bucket{fmt(labels, (('le', f'{bound:g}'),))} {seen}")
+                lines.append(f"{name}_bucket{fmt(labels, (('le', '+Inf'),))} {h.count}")
+                lines.append(f"{name}_sum{fmt(labels)} {h.sum:.6f}")
+                lines.append(f"{name}_count{fmt(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def counter(name: str, value: float = 1, **labels):
+    """Add `value` to the counter `hrm_<name>_total`."""
+    registry.inc(_metric_name(name, "_total"), value, _labels(labels))
+
+
+def observe(name: str, seconds: float, **labels):
+    """Record a duration in the histogram `hrm_<name>_seconds`."""
+    registry.observe(_metric_name(name, "_seconds"), seconds, _labels(labels))
+
+
+def cache_access(cache: str, hit: bool, count: int = 1):
+    """Count `count` lookups in `cache` as hits or misses (`hrm_cache_requests_total`)."""
+    registry.inc(_metric_name("cache_requests", "_total"), count,
+                 _labels({"cache": cache, "result": "hit" if hit else "miss"}))
+
+
+def cache_hit_ratio(cache: str) -> Optional[float]:
+    name = _metric_name("cache_requests", "_total")
+    hits = registry.counters.get((name, _labels({"cache": cache, "result": "hit"})), 0)
+    misses = registry.counters.get((name, _labels({"cache": cache, "result": "miss"})), 0)
+    return hits / (hits + misses) if hits + misses else None
+
+
+def prometheus_text() -> str:
+    return registry.prometheus_text()
+
+
+def snapshot() -> Dict[str, Any]:
+    return registry.snapshot()
+
+
+# -------------------------------------------------------------------------
+# TRACING
+# -------------------------------------------------------------------------
+
+class _TraceWriter:
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.handle = None
+
+    def write(self, record: Dict[str, Any]):
+        line = json.dumps(record, default=str) + "\n"
+        with self.lock:
+            if self.handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.handle = open(self.path, "a", encoding="utf-8")
+            self.handle.write(line)
+            self.handle.flush()
+
+
+_writer: Optional[_TraceWriter] = None
+_configured = False
+_service = None
+
+
+def configure(trace_path: Optional[Union[str, Path]] = None, service: Optional[str] = None):
+    """Send finished spans to `trace_path` (None turns tracing off)."""
+    global _writer, _configured, _service
+    _writer = _TraceWriter(Path(trace_path)) if trace_path else None
+    _service = service
+    _configured = True
+
+
+def _trace_path_from_env() -> Optional[str]:
+    trace = os.environ.get("HRM_TRACE", "")
+    if trace.lower() in ("1", "true", "yes"):
+        from common_config import WORKSPACE_ROOT
+        return str(WORKSPACE_ROOT / "data" / "trace.jsonl")
+    return trace or None
+
+
+def configure_from_env(service: Optional[str] = None):
+    """
+    Apply HRM_TRACE (trace file; "1" means data/trace.jsonl) and
+    HRM_METRICS_PORT (serve /metrics on localhost) for this process.
+    """
+    configure(_trace_path_from_env(), service=service)
+    port = os.environ.get("HRM_METRICS_PORT", "")
+    if port.isdigit():
+        start_metrics_server(int(port))
+
+
+def trace_enabled() -> bool:
+    # Processes that never call configure() still honour HRM_TRACE
+    if not _configured:
+        configure(_trace_path_from_env())
+    return _writer is not None
+
+
+class Span:
+    """
+    One timed operation. `labels` become metric labels, so keep them
+    low-cardinality (method, route, stage); per-call detail goes in `attrs`.
+    """
+
+    __slots__ = ("name", "labels", "attrs", "counts", "trace_id", "span_id", "parent_id",
+                 "start", "duration", "status")
+
+    def __init__(self, name: str, labels: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.labels = labels
+        self.attrs: Dict[str, Any] = {}
+        self.counts: Dict[str, float] = {}
+        self.trace_id = parent.trace_id if parent else os.urandom(8).hex()
+        self.span_id = os.urandom(4).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.duration: Optional[float] = None
+        self.status = "ok"
+
+    def label(self, **labels) -> "Span":
+        self.labels.update(labels)
+        return self
+
+    def set(self, **attrs) -> "Span":
+        self.attrs.update(attrs)
+        return self
+
+    def add(self, key: str, value: float = 1) -> "Span":
+        """Accumulate a per-span count (retries, bytes_in...); also feeds `hrm_<span>_<key>_total`."""
+        self.counts[key] = self.counts.get(key, 0) + value
+        return self
+
+    def elapsed(self) -> float:
+        return self.duration if self.duration is not None else time.time() - self.start
+
+    def record(self) -> Dict[str, Any]:
+        return {
+            "ts": round(self.start, 6),
+            "name": self.name,
+            "duration_ms": round(self.elapsed() * 1000, 3),
+            "status": self.status,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "service": _service,
+            "pid": os.getpid(),
+            "labels": self.labels,
+            "counts": self.counts,
+            "attrs": self.attrs,
+        }
+
+
+@contextmanager
+def span(name: str, **labels) -> Iterator[Span]:
+    """Time the enclosed block as span `name`; exceptions mark it as an error and propagate."""
+    current = Span(name, labels, _current_span.get())
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.attrs.setdefault("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current_span.reset(token)
+        _finish(current)
+
+
+def _finish(current: Span):
+    labels = _labels(current.labels)
+    registry.observe(_metric_name(current.name, "_seconds"), current.duration, labels)
+    if current.status != "ok":
+        registry.inc(_metric_name(current.name, "_errors_total"), 1, labels)
+    for key, value in current.counts.items():
+        registry.inc(_metric_name(f"{current.name}_{key}", "_total"), value, labels)
+    if trace_enabled():
+        try:
+            _writer.write(current.record())
+        except OSError as e:
+            logger.warning(f"Could not write trace record: {e}")
+
+
+# -------------------------------------------------------------------------
+# PROMETHEUS ENDPOINT
+# -------------------------------------------------------------------------
+
+def start_metrics_server(port: int, host: str = "127.0.0.1"):
+    """Serve GET /metrics from a background thread; returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info(f"📈 Metrics at http://{host}:{server.server_address[1]}/metrics")
+    return server
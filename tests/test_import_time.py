@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for the workspace CLIs, measured with `python -X
+importtime` through local-dev/import_time.py (run that script for the
+per-import breakdown).
+"""
+
+import importlib.util
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_spec = importlib.util.spec_from_file_location("import_time", ROOT / "local-dev" / "import_time.py")
+import_time = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(import_time)
+
+
+class ImportTimeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.startup = {name for _, _, name in import_time._importtime("pass")}
+
+    def test_modules_import_within_budget(self):
+        for module in import_time.DEFAULT_MODULES:
+            with self.subTest(module=module):
+                total, imports = import_time.measure_import(module, self.startup)
+                slowest = ", ".join(f"{name} {ms:.1f} ms" for ms, name in imports[:5])
+                self.assertLessEqual(total, import_time.MAX_MS, f"{module}: {total:.1f} ms ({slowest})")
+
+    def test_jules_ops_help_within_budget(self):
+        help_ms = import_time.time_help()
+        self.assertLessEqual(help_ms, import_time.MAX_MS, f"jules_ops.py --help: {help_ms:.1f} ms")
+
+    def test_jules_ops_defers_heavy_modules(self):
+        imported = {name for _, _, name in import_time._importtime("import jules_ops")}
+        for module in ("pandas", "requests", "workspace_daemon", "session_cleanup"):
+            with self.subTest(module=module):
+                self.assertNotIn(module, imported)
+
+
+if __name__ == "__main__":
+    unittest.main()
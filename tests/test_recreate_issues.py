@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Replays tests/fixtures/recreate_issues.json through the batched GraphQL
+mode of scripts/recreate_issues.py. The fixture holds two query pages (the
+second with a partial `errors` entry and a null node) and three mutation
+responses for batches of two, one of them with a per-alias error.
+"""
+
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "scripts" / "recreate_issues.py"
+FIXTURE = ROOT / "tests" / "fixtures" / "recreate_issues.json"
+
+sys.path.insert(0, str(SCRIPT.parent))
+import recreate_issues  # noqa: E402
+
+
+def replay(*args):
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), "--fixture", str(FIXTURE), *args],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+
+
+class BatchedModeTest(unittest.TestCase):
+    def setUp(self):
+        with open(FIXTURE, encoding="utf-8") as f:
+            self.fixture = json.load(f)
+
+    def test_unlinked_issues_skip_null_nodes_and_pr_references(self):
+        unlinked = recreate_issues.issues_without_linked_pr(self.fixture["pages"])
+        self.assertEqual([number for _, number in unlinked], [102, 103, 104, 107, 108])
+
+    def test_mutation_aliases_each_issue(self):
+        query, variables = recreate_issues.build_reopen_mutation(["A", "B"])
+        self.assertIn("mutation($id0: ID!, $id1: ID!)", query)
+        self.assertIn("close1: closeIssue(input: {issueId: $id1})", query)
+        self.assertIn("reopen0: reopenIssue(input: {issueId: $id0})", query)
+        self.assertEqual(variables, {"id0": "A", "id1": "B"})
+
+    def test_partial_errors_fail_only_their_issue(self):
+        batch = [("I_kwDO0104", 104), ("I_kwDO0107", 107)]
+        recreated, failed = recreate_issues.parse_reopen_result(batch, self.fixture["mutations"][1])
+        self.assertEqual(recreated, [104])
+        self.assertEqual([number for number, _ in failed], [107])
+
+    def test_request_level_error_fails_whole_batch(self):
+        batch = [("A", 1), ("B", 2)]
+        recreated, failed = recreate_issues.parse_reopen_result(batch, {"errors": [{"message": "Bad credentials"}]})
+        self.assertEqual(recreated, [])
+        self.assertEqual(failed, [(1, "Bad credentials"), (2, "Bad credentials")])
+
+    def test_fixture_replay_splits_batches(self):
+        result = replay("--batch-size", "2")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("GraphQL error while listing issues: Resource not accessible", result.stderr)
+        self.assertIn("7 open issues, 5 without a linked PR.", result.stderr)
+        self.assertIn("Failed to recreate issue #107: Could not resolve", result.stderr)
+        self.assertIn("Recreated 4 of 5 issues in 3 request(s) (replayed).", result.stderr)
+
+    def test_fixture_without_enough_responses_sends_nothing(self):
+        result = replay("--batch-size", "1")
+        self.assertIn("Fixture has 3 mutation responses for 5 batches", result.stderr)
+        self.assertNotIn("Successfully recreated", result.stderr)
+
+    def test_dry_run_with_fixture_only_lists(self):
+        result = replay("--dry-run")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("[DRY RUN] Would recreate issue #107", result.stderr)
+        self.assertNotIn("Recreated", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
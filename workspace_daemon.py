@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""
+Long-running workspace daemon (`jules_ops.py serve`).
+
+Keeps warm Jules and GitHub clients and an in-memory, correlated index of
+sessions, issues and PRs that background loops keep fresh, and serves them
+as JSON-RPC over localhost HTTP. CLI entry points reach it through
+RemoteJulesClient / RemoteGitHubClient (see `get_jules_client`) and fall
+back to their own clients when no daemon is running.
+"""
+
+import http.client
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import telemetry
+from common_config import DAEMON_HOST, DAEMON_PORT, HRM_REPO_DIR, WORKSPACE_ROOT
+from jules_client import JulesClient, SessionQuery
+from session_cleanup import TERMINAL_STATES
+from workstreams import correlate_data
+
+logger = logging.getLogger("workspace_daemon")
+
+# Written by the running daemon: {"pid", "host", "port", "token", "started"}
+STATE_FILE = WORKSPACE_ROOT / "data" / "daemon.json"
+TOKEN_HEADER = "X-Daemon-Token"
+
+SESSION_REFRESH_SECONDS = 30
+# Adaptive loops poll this often while data is changing
+MIN_REFRESH_SECONDS = 5
+# Every Nth session refresh lists all sessions; the others only active ones
+FULL_REFRESH_EVERY = 10
+GITHUB_REFRESH_SECONDS = 60
+# Open issues/PRs kept warm; the same window `jules_ops.py status` shows
+GITHUB_LIMIT = 100
+CONNECT_TIMEOUT = 0.5
+CALL_TIMEOUT = 120
+# How long a call waits for the first refresh after startup
+READY_TIMEOUT = 60
+
+Session = Dict[str, Any]
+
+
+class DaemonError(Exception):
+    """The daemon could not be reached, or the call failed on its side."""
+
+
+# -------------------------------------------------------------------------
+# IN-MEMORY INDEX
+# -------------------------------------------------------------------------
+
+class WorkstreamIndex:
+    """
+    Sessions, open issues and open PRs as last fetched, plus the correlated
+    workstreams. `version` increases only when the data actually changes;
+    workstreams are re-correlated at most once per version, and watchers
+    blocked in `wait_for_change` wake up on each new version.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._change = threading.Condition(self._lock)
+        self.sessions: Dict[str, Session] = {}
+        self.issues: List[Dict[str, Any]] = []
+        self.prs: List[Dict[str, Any]] = []
+        self.version = 0
+        self.refreshed: Dict[str, float] = {}
+        # Per-kind change counters, for callers that adapt to how busy the data is
+        self.changes: Dict[str, int] = {"sessions": 0, "github": 0}
+        self._ready = {"sessions": threading.Event(), "github": threading.Event()}
+        self._workstreams: Optional[List[Dict[str, Any]]] = None
+        self._workstreams_version = -1
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return name if name.startswith("sessions/") else f"sessions/{name}"
+
+    def _changed(self, changed: bool, kind: Optional[str] = None):
+        # Caller holds the lock
+        if kind:
+            self.refreshed[kind] = time.time()
+            self._ready[kind].set()
+        if changed:
+            self.version += 1
+            if kind:
+                self.changes[kind] += 1
+            self._change.notify_all()
+
+    def set_sessions(self, sessions: List[Session]):
+        sessions_by_name = {s["name"]: s for s in sessions if s.get("name")}
+        with self._lock:
+            changed = sessions_by_name != self.sessions
+            self.sessions = sessions_by_name
+            self._changed(changed, "sessions")
+
+    def merge_sessions(self, sessions: List[Session], kind: Optional[str] = "sessions") -> int:
+        """Upsert `sessions`, leaving the rest of the index alone. Returns how many changed."""
+        with self._lock:
+            changed = 0
+            for session in sessions:
+                name = session.get("name")
+                if name and self.sessions.get(name) != session:
+                    self.sessions[name] = session
+                    changed += 1
+            self._changed(bool(changed), kind)
+            return changed
+
+    def upsert_session(self, session: Session):
+        self.merge_sessions([session], kind=None)
+
+    def remove_session(self, name: str):
+        with self._lock:
+            self._changed(self.sessions.pop(self._key(name), None) is not None)
+
+    def set_github(self, issues: List[Dict[str, Any]], prs: List[Dict[str, Any]]):
+        with self._lock:
+            changed = issues != self.issues or prs != self.prs
+            self.issues, self.prs = list(issues), list(prs)
+            self._changed(changed, "github")
+
+    def wait_for_change(self, version: int, timeout: Optional[float] = None) -> int:
+        """Block until the index is past `version` (or `timeout`); returns the current version."""
+        with self._lock:
+            self._change.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def wait_ready(self, *kinds: str, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for kind in kinds or tuple(self._ready):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self._ready[kind].wait(remaining):
+                return False
+        return True
+
+    def age(self, kind: str) -> Optional[float]:
+        refreshed = self.refreshed.get(kind)
+        return None if refreshed is None else time.time() - refreshed
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": list(self.sessions.values()),
+                "issues": list(self.issues),
+                "prs": list(self.prs),
+                "version": self.version,
+                "refreshed": dict(self.refreshed),
+            }
+
+    def workstreams(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            hit = self._workstreams_version == self.version
+            telemetry.cache_access("workstreams", hit)
+            if hit:
+                return self._workstreams
+            version = self.version
+            sessions, issues, prs = list(self.sessions.values()), list(self.issues), list(self.prs)
+        workstreams = correlate_data(sessions, issues, prs)
+        with self._lock:
+            if version >= self._workstreams_version:
+                self._workstreams, self._workstreams_version = workstreams, version
+        return workstreams
+
+
+# -------------------------------------------------------------------------
+# DAEMON
+# -------------------------------------------------------------------------
+
+class WorkspaceDaemon:
+    """
+    Warm clients, the shared index and the refresh loops. Public `rpc_*`
+    methods are what clients can call; they mirror JulesClient/GitHubClient
+    signatures so the remote clients can stay thin.
+    """
+
+    def __init__(self, jules, github, session_interval: float = SESSION_REFRESH_SECONDS,
+                 github_interval: float = GITHUB_REFRESH_SECONDS, adaptive: bool = False,
+                 min_interval: float = MIN_REFRESH_SECONDS):
+        self.jules = jules
+        self.github = github
+        self.session_interval = session_interval
+        self.github_interval = github_interval
+        # Adaptive loops refresh every `min_interval` after a change and back
+        # off towards their interval while nothing changes
+        self.adaptive = adaptive
+        self.min_interval = min(min_interval, session_interval, github_interval)
+        self.index = WorkstreamIndex()
+        self.started = time.time()
+        self._stop = threading.Event()
+        # One refresh of each kind at a time; concurrent requests wait for it
+        self._refreshing = {"sessions": threading.Lock(), "github": threading.Lock()}
+        self._sources: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        self._active_query = SessionQuery().exclude(*TERMINAL_STATES)
+        self._active: Set[str] = set()
+        self._incremental = True
+        self._passes = 0
+        self.methods: Dict[str, Callable[..., Any]] = {
+            name[len("rpc_"):]: getattr(self, name) for name in dir(self) if name.startswith("rpc_")
+        }
+
+    # --- Refresh ---
+
+    def refresh_sessions(self, full: bool = False) -> bool:
+        """
+        Incremental by default: only sessions outside TERMINAL_STATES are
+        listed, and ones that left that set since the last pass are fetched
+        individually for their final state. Every FULL_REFRESH_EVERY passes
+        (or when the API rejects the state filter) all sessions are listed,
+        which also drops deleted ones.
+        """
+        with self._refreshing["sessions"]:
+            started = time.monotonic()
+            full = (full or not self._incremental or not self.index.wait_ready("sessions", timeout=0)
+                    or self._passes % FULL_REFRESH_EVERY == 0)
+            self._passes += 1
+            with telemetry.span("daemon.refresh", kind="sessions",
+                                mode="full" if full else "incremental") as span:
+                refreshed = self._refresh_all_sessions(started) if full else self._refresh_active_sessions(started)
+                if not refreshed:
+                    span.status = "error"
+                return refreshed
+
+    def _refresh_all_sessions(self, started: float) -> bool:
+        # Keep the previous index rather than replace it with a partial listing
+        sessions, error = self.jules._list_session_pages()
+        if error:
+            logger.warning(f"Session refresh failed, keeping previous index: {error}")
+            return False
+        self.index.set_sessions(sessions)
+        self._active = {s["name"] for s in sessions if self._active_query.matches(s)}
+        logger.debug(f"Refreshed {len(sessions)} sessions in {time.monotonic() - started:.2f}s")
+        return True
+
+    def _refresh_active_sessions(self, started: float) -> bool:
+        sessions, error = self.jules._list_session_pages(self._active_query.to_filter(include_time=False))
+        if error:
+            if error.get("status_code") == 400:
+                logger.info("Server rejected the state filter; using full session refreshes")
+                self._incremental = False
+            else:
+                logger.warning(f"Session refresh failed, keeping previous index: {error}")
+            return False
+
+        active = [s for s in sessions if self._active_query.matches(s)]
+        names = {s["name"] for s in active if s.get("name")}
+        # Sessions that left the active set finished (or were deleted) since the last pass
+        finished = []
+        kept = set()
+        for name in self._active - names:
+            # _request rather than get_session, which hides why a lookup failed
+            session = self.jules._request("GET", f"sessions/{name.split('/')[-1]}")
+            if session and "error" not in session:
+                finished.append(session)
+            elif session and session.get("status_code") == 404:
+                self.index.remove_session(name)
+            else:
+                # Transient failure: keep the previous entry and look again next pass
+                kept.add(name)
+        changed = self.index.merge_sessions(active + finished)
+        self._active = names | kept
+        logger.debug(
+            f"Refreshed {len(active)} active and {len(finished)} finished sessions "
+            f"({changed} changed) in {time.monotonic() - started:.2f}s"
+        )
+        return True
+
+    def refresh_github(self) -> bool:
+        from github_client import ISSUE_LIST_FIELDS, PR_LIST_FIELDS
+
+        with self._refreshing["github"], \
+                telemetry.span("daemon.refresh", kind="github", mode="full") as span:
+            started = time.monotonic()
+            # run_gh_json directly: list_issues/list_prs turn a failed gh call into []
+            issues = self.github.run_gh_json(["gh", "issue", "list", "--state", "open",
+                                              "--limit", str(GITHUB_LIMIT), "--json", ISSUE_LIST_FIELDS])
+            prs = self.github.run_gh_json(["gh", "pr", "list", "--state", "open",
+                                           "--limit", str(GITHUB_LIMIT), "--json", PR_LIST_FIELDS])
+            if issues is None or prs is None:
+                # Keep the previous index rather than replace it with an empty listing
+                logger.warning("GitHub refresh failed, keeping previous index")
+                span.status = "error"
+                return False
+            self.index.set_github(issues, prs)
+            logger.debug(
+                f"Refreshed {len(issues)} issues and {len(prs)} PRs "
+                f"in {time.monotonic() - started:.2f}s"
+            )
+            return True
+
+    def _loop(self, kind: str, refresh: Callable[[], bool], interval: float):
+        wait = interval
+        while not self._stop.is_set():
+            before = self.index.changes[kind]
+            try:
+                refresh()
+            except Exception as e:
+                logger.error(f"{refresh.__name__} failed: {e}")
+            if self.adaptive:
+                changed = self.index.changes[kind] != before
+                wait = self.min_interval if changed else min(interval, wait * 2)
+            self._stop.wait(wait)
+
+    def start(self):
+        for kind, refresh, interval in (("sessions", self.refresh_sessions, self.session_interval),
+                                        ("github", self.refresh_github, self.github_interval)):
+            threading.Thread(target=self._loop, args=(kind, refresh, interval),
+                             name=refresh.__name__, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _fresh(self, kind: str, max_age: Optional[float] = None):
+        """Wait for the first load of `kind`; refresh now if older than `max_age`."""
+        if not self.index.wait_ready(kind, timeout=READY_TIMEOUT):
+            raise DaemonError(f"The daemon has not loaded {kind} yet")
+        age = self.index.age(kind)
+        if max_age is not None and (age is None or age > max_age):
+            (self.refresh_sessions if kind == "sessions" else self.refresh_github)()
+
+    def call(self, method: str, params: Dict[str, Any]) -> Any:
+        handler = self.methods.get(method)
+        if handler is None:
+            raise DaemonError(f"Unknown method: {method}")
+        with telemetry.span("daemon.rpc", method=method):
+            return handler(**params)
+
+    # --- RPC: daemon ---
+
+    def rpc_ping(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "started": self.started,
+            "version": self.index.version,
+            "refreshed": dict(self.index.refreshed),
+        }
+
+    def rpc_refresh(self, what: str = "all") -> Dict[str, Any]:
+        if what in ("all", "sessions"):
+            self.refresh_sessions(full=True)
+        if what in ("all", "github"):
+            self.refresh_github()
+        return self.rpc_ping()
+
+    def rpc_snapshot(self, max_age: Optional[float] = None, workstreams: bool = False) -> Dict[str, Any]:
+        self._fresh("sessions", max_age)
+        self._fresh("github", max_age)
+        snapshot = self.index.snapshot()
+        if workstreams:
+            snapshot["workstreams"] = self.index.workstreams()
+        return snapshot
+
+    def rpc_workstreams(self, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        self._fresh("sessions", max_age)
+        self._fresh("github", max_age)
+        return self.index.workstreams()
+
+    def rpc_view(self, version: int = -1, wait: float = 0, **view) -> Dict[str, Any]:
+        """
+        One page of workstreams for a view (see workspace_dashboard.View).
+        With `wait`, blocks up to that many seconds for the index to move
+        past `version` (or finish its first load) and returns
+        {"version", "unchanged": True} if it doesn't, so pollers never hang
+        for READY_TIMEOUT.
+        """
+        from workspace_dashboard import View, view_page  # Deferred: it imports this module
+
+        if wait:
+            deadline = time.monotonic() + wait
+            if not self.index.wait_ready("sessions", "github", timeout=wait):
+                return {"version": version, "unchanged": True}
+            current = self.index.wait_for_change(version, timeout=max(0.0, deadline - time.monotonic()))
+        else:
+            self._fresh("sessions")
+            self._fresh("github")
+            current = self.index.version
+        if current == version:
+            return {"version": version, "unchanged": True}
+        return view_page(View(**view), self.index.workstreams(), current)
+
+    # --- RPC: Jules ---
+
+    def rpc_list_sources(self, filter_str: Optional[str] = None) -> List[Dict[str, Any]]:
+        telemetry.cache_access("jules_sources", filter_str in self._sources)
+        if filter_str not in self._sources:
+            self._sources[filter_str] = self.jules.list_sources(filter_str)
+        return self._sources[filter_str]
+
+    def rpc_list_sessions(self, filter: Optional[str] = None, page_size: int = 100) -> List[Session]:
+        if filter:
+            return self.jules.list_sessions(filter, page_size)
+        self._fresh("sessions")
+        return self.index.snapshot()["sessions"]
+
+    def rpc_get_session(self, session_name: str) -> Optional[Session]:
+        session = self.jules.get_session(session_name)
+        if session:
+            self.index.upsert_session(session)
+        return session
+
+    def rpc_create_session(self, prompt: str, source: Optional[str] = None,
+                           branch: Optional[str] = None, title: Optional[str] = None) -> Optional[str]:
+        kwargs = {"source": source} if source else {}
+        session_name = self.jules.create_session(prompt, branch=branch, title=title, **kwargs)
+        if session_name:
+            self.rpc_get_session(session_name.split("/")[-1])
+        return session_name
+
+    def rpc_send_message(self, session_name: str, text: str) -> bool:
+        return self.jules.send_message(session_name, text)
+
+    def rpc_delete_session(self, session_name: str) -> bool:
+        ok = self.jules.delete_session(session_name)
+        if ok:
+            self.index.remove_session(session_name)
+        return ok
+
+    # --- RPC: GitHub ---
+
+    def rpc_list_issues(self, state: str = "open", limit: int = 100) -> List[Dict[str, Any]]:
+        if state == "open" and limit <= GITHUB_LIMIT:
+            self._fresh("github")
+            return self.index.snapshot()["issues"][:limit]
+        return self.github.list_issues(state=state, limit=limit)
+
+    def rpc_list_prs(self, state: str = "open", limit: int = 100) -> List[Dict[str, Any]]:
+        if state == "open" and limit <= GITHUB_LIMIT:
+            self._fresh("github")
+            return self.index.snapshot()["prs"][:limit]
+        return self.github.list_prs(state=state, limit=limit)
+
+    def rpc_get_issue(self, number: int) -> Optional[Dict[str, Any]]:
+        return self.github.get_issue(number)
+
+
+# -------------------------------------------------------------------------
+# HTTP SERVER
+# -------------------------------------------------------------------------
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """`GET /health` and `GET /metrics` are open; `POST /rpc` needs the token from STATE_FILE."""
+
+    server_version = "hrm-workspace-daemon"
+
+    @property
+    def daemon(self) -> WorkspaceDaemon:
+        return self.server.workspace_daemon
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _reply(self, status: int, payload: Any):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"ok": True, "pid": os.getpid()})
+        elif self.path == "/metrics":
+            body = telemetry.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._reply(404, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/rpc":
+            self._reply(404, {"error": f"Not found: {self.path}"})
+            return
+        if not secrets.compare_digest(self.headers.get(TOKEN_HEADER, ""), self.server.token):
+            self._reply(403, {"error": "Invalid daemon token"})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            method, params = request["method"], request.get("params") or {}
+        except (ValueError, KeyError, TypeError) as e:
+            self._reply(400, {"error": f"Malformed request: {e}"})
+            return
+
+        started = time.monotonic()
+        try:
+            result = self.daemon.call(method, params)
+        except Exception as e:
+            logger.error(f"RPC {method} failed: {e}")
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        logger.debug(f"RPC {method} served in {(time.monotonic() - started) * 1000:.1f} ms")
+        self._reply(200, {"result": result})
+
+
+def _write_state(host: str, port: int, token: str):
+    STATE_FILE.parent.mkdir(exist_ok=True)
+    fd = os.open(STATE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"pid": os.getpid(), "host": host, "port": port, "token": token,
+                   "started": time.time()}, f)
+
+
+def _clear_state():
+    try:
+        with open(STATE_FILE, encoding="utf-8") as f:
+            owner = json.load(f).get("pid")
+        if owner == os.getpid():
+            STATE_FILE.unlink()
+    except (OSError, ValueError):
+        pass
+
+
+def serve(api_key: Optional[str] = None, host: str = DAEMON_HOST, port: int = DAEMON_PORT,
+          session_interval: float = SESSION_REFRESH_SECONDS,
+          github_interval: float = GITHUB_REFRESH_SECONDS,
+          handler=DaemonRequestHandler,
+          on_start: Optional[Callable[[str, int, str], None]] = None):
+    """
+    Run the daemon in the foreground until interrupted. `on_start` is
+    called with (host, port, token) once it is accepting connections.
+    """
+    from github_client import GitHubClient
+
+    daemon = WorkspaceDaemon(
+        JulesClient(api_key), GitHubClient(repo_path=HRM_REPO_DIR),
+        session_interval=session_interval, github_interval=github_interval,
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.workspace_daemon = daemon
+    server.token = secrets.token_urlsafe(32)
+    host, port = server.server_address[:2]
+
+    daemon.start()
+    _write_state(host, port, server.token)
+    logger.info(f"🛰️  Workspace daemon listening on http://{host}:{port} (pid {os.getpid()})")
+    logger.info(f"    Sessions refresh every {session_interval:.0f}s, GitHub every {github_interval:.0f}s")
+    if on_start:
+        on_start(host, port, server.token)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down workspace daemon...")
+    finally:
+        daemon.stop()
+        server.server_close()
+        _clear_state()
+    return daemon
+
+
+# -------------------------------------------------------------------------
+# CLIENTS
+# -------------------------------------------------------------------------
+
+class DaemonClient:
+    """JSON-RPC over localhost HTTP. One short-lived connection per call, so it is thread-safe."""
+
+    def __init__(self, host: str, port: int, token: str, timeout: float = CALL_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+
+    def call(self, method: str, **params) -> Any:
+        body = json.dumps({"method": method, "params": params})
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        with telemetry.span("daemon.call", method=method) as span:
+            try:
+                conn.request("POST", "/rpc", body=body, headers={
+                    "Content-Type": "application/json", TOKEN_HEADER: self.token,
+                })
+                raw = conn.getresponse().read()
+                span.add("bytes_out", len(body)).add("bytes_in", len(raw))
+                payload = json.loads(raw)
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                raise DaemonError(f"Workspace daemon unreachable: {e}") from e
+            finally:
+                conn.close()
+            if "error" in payload:
+                raise DaemonError(payload["error"])
+        return payload.get("result")
+
+
+_connection: Any = False  # False = not tried yet; None = no daemon
+
+
+def connect(refresh: bool = False) -> Optional[DaemonClient]:
+    """
+    The running daemon, or None. The answer is cached per process; set
+    HRM_NO_DAEMON=1 (or `jules_ops.py --no-daemon`) to always run standalone.
+    """
+    global _connection
+    if _connection is not False and not refresh:
+        return _connection
+    _connection = None
+    if os.environ.get("HRM_NO_DAEMON", "").lower() in ("1", "true", "yes"):
+        return None
+    try:
+        with open(STATE_FILE, encoding="utf-8") as f:
+            state = json.load(f)
+        client = DaemonClient(state["host"], state["port"], state["token"], timeout=CONNECT_TIMEOUT)
+        client.call("ping")
+    except (OSError, ValueError, KeyError, DaemonError) as e:
+        logger.debug(f"No workspace daemon available: {e}")
+        return None
+    client.timeout = CALL_TIMEOUT
+    _connection = client
+    return client
+
+
+class RemoteJulesClient:
+    """
+    JulesClient stand-in served by the daemon: listings come from its index,
+    everything else goes through its warm client and shared rate limiter.
+    Reads fall back to a local client if the daemon goes away mid-run.
+    """
+
+    def __init__(self, daemon: DaemonClient, api_key: Optional[str] = None):
+        self.daemon = daemon
+        self.api_key = api_key
+        self._local: Optional[JulesClient] = None
+
+    def _read(self, method: str, **params) -> Any:
+        try:
+            return self.daemon.call(method, **params)
+        except DaemonError as e:
+            logger.warning(f"{e}; continuing without the daemon")
+            if self._local is None:
+                self._local = JulesClient(self.api_key)
+            return getattr(self._local, method)(**params)
+
+    def list_sources(self, filter_str: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._read("list_sources", filter_str=filter_str)
+
+    def list_sessions(self, filter: Optional[str] = None, page_size: int = 100) -> List[Session]:
+        return self._read("list_sessions", filter=filter, page_size=page_size)
+
+    def query_sessions(self, query: SessionQuery, page_size: int = 100) -> List[Session]:
+        # The daemon already holds every session, so the query runs against its index
+        sessions = self.list_sessions(page_size=page_size)
+        matched = [s for s in sessions if query.matches(s)]
+        logger.info(f"Daemon index has {len(sessions)} sessions; {len(matched)} match")
+        return matched
+
+    def get_session(self, session_name: str) -> Optional[Session]:
+        return self._read("get_session", session_name=session_name)
+
+    def create_session(self, prompt: str, source: Optional[str] = None,
+                       branch: Optional[str] = None, title: Optional[str] = None) -> Optional[str]:
+        return self.daemon.call("create_session", prompt=prompt, source=source, branch=branch, title=title)
+
+    def send_message(self, session_name: str, text: str) -> bool:
+        return self.daemon.call("send_message", session_name=session_name, text=text)
+
+    def delete_session(self, session_name: str) -> bool:
+        return self.daemon.call("delete_session", session_name=session_name)
+
+    # Polling loops run here, one daemon call per poll
+    monitor_session = JulesClient.monitor_session
+    _print_pr_link = JulesClient._print_pr_link
+
+
+class RemoteGitHubClient:
+    """
+    GitHubClient stand-in: open issue/PR listings come from the daemon's
+    index; every other call (git, PR/issue writes) runs on a local client.
+    """
+
+    def __init__(self, daemon: DaemonClient, repo_path=HRM_REPO_DIR):
+        self.daemon = daemon
+        self.repo_path = repo_path
+        self._local = None
+
+    def _local_client(self):
+        if self._local is None:
+            from github_client import GitHubClient
+            self._local = GitHubClient(repo_path=self.repo_path)
+        return self._local
+
+    def _read(self, method: str, **params) -> Any:
+        try:
+            return self.daemon.call(method, **params)
+        except DaemonError as e:
+            logger.warning(f"{e}; continuing without the daemon")
+            return getattr(self._local_client(), method)(**params)
+
+    def list_issues(self, state: str = "open", limit: int = 100) -> List[Dict[str, Any]]:
+        return self._read("list_issues", state=state, limit=limit)
+
+    def list_prs(self, state: str = "open", limit: int = 100) -> List[Dict[str, Any]]:
+        return self._read("list_prs", state=state, limit=limit)
+
+    def get_issue(self, number: int) -> Optional[Dict[str, Any]]:
+        return self._read("get_issue", number=number)
+
+    def __getattr__(self, name: str):
+        return getattr(self._local_client(), name)
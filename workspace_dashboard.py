@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Web dashboard for the workspace daemon (`jules_ops.py dashboard`).
+
+Serves one page plus two data endpoints from the daemon's HTTP server.
+Sorting, filtering and paging run server-side over the full correlated
+workstream index; `/events` is a Server-Sent Events stream that, whenever
+the index changes, sends only the rows of the viewed page that changed.
+
+    GET /                      the page
+    GET /api/workstreams?...   one page of rows as JSON
+    GET /events?...            SSE: row diffs for that page
+
+Data endpoints take the daemon token as `?token=`, plus the view
+parameters sort, desc, q, state, page and page_size.
+"""
+
+import json
+import logging
+import secrets
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from workspace_daemon import READY_TIMEOUT, DaemonRequestHandler
+
+logger = logging.getLogger("workspace_dashboard")
+
+SORT_KEYS = ("last_activity", "session_created", "session_state", "issue_id", "pr_id", "session_id")
+SEARCH_FIELDS = ("session_id", "session_title", "issue_id", "issue_title", "pr_id", "branch")
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Seconds between SSE keepalive comments while nothing changes
+KEEPALIVE_SECONDS = 15
+
+Row = Dict[str, Any]
+
+
+def dashboard_url(host: str, port: int, token: str) -> str:
+    return f"http://{host}:{port}/?{urlencode({'token': token})}"
+
+
+def row_key(row: Row) -> str:
+    """Stable id of a workstream row: its session, or its PR for orphan PRs."""
+    if row.get("session_id") not in (None, "-"):
+        return row["session_id"]
+    return f"pr{row.get('pr_id')}"
+
+
+def _sort_value(row: Row, key: str):
+    value = row.get(key)
+    if value in (None, "-"):
+        return (0, 0, "")
+    if key in ("issue_id", "pr_id") and str(value).lstrip("#").isdigit():
+        return (1, int(str(value).lstrip("#")), "")
+    return (1, 0, str(value))
+
+
+class View:
+    """One client's window onto the workstreams: filter, sort, then page."""
+
+    def __init__(self, sort: str = "last_activity", desc: bool = True, q: str = "",
+                 state: str = "", page: int = 1, page_size: int = DEFAULT_PAGE_SIZE):
+        self.sort = sort if sort in SORT_KEYS else "last_activity"
+        self.desc = desc
+        self.q = q.lower()
+        self.state = state
+        self.page = max(1, page)
+        self.page_size = min(max(1, page_size), MAX_PAGE_SIZE)
+
+    @classmethod
+    def from_query(cls, query: Dict[str, List[str]]) -> "View":
+        def arg(name: str, default: str = "") -> str:
+            return query.get(name, [default])[0]
+
+        def number(name: str, default: int) -> int:
+            value = arg(name)
+            return int(value) if value.isdigit() else default
+
+        return cls(
+            sort=arg("sort", "last_activity"),
+            desc=arg("desc", "1") not in ("0", "false"),
+            q=arg("q"),
+            state=arg("state"),
+            page=number("page", 1),
+            page_size=number("page_size", DEFAULT_PAGE_SIZE),
+        )
+
+    def matches(self, row: Row) -> bool:
+        if self.state and row.get("session_state") != self.state:
+            return False
+        if self.q:
+            return any(self.q in str(row.get(field) or "").lower() for field in SEARCH_FIELDS)
+        return True
+
+    def apply(self, rows: List[Row]) -> Tuple[List[Row], int]:
+        """The rows on this view's page and the number of rows matching it."""
+        selected = [row for row in rows if self.matches(row)]
+        selected.sort(key=lambda row: _sort_value(row, self.sort), reverse=self.desc)
+        start = (self.page - 1) * self.page_size
+        return selected[start:start + self.page_size], len(selected)
+
+
+def diff_page(previous: Dict[str, Row], previous_order: List[str],
+              rows: List[Row]) -> Dict[str, Any]:
+    """
+    What changed between the page a client has and `rows`: changed or new
+    rows, keys that left the page, and the new key order if it moved.
+    """
+    current = {row_key(row): row for row in rows}
+    order = [row_key(row) for row in rows]
+    diff: Dict[str, Any] = {
+        "upserts": [dict(row, key=key) for key, row in current.items() if previous.get(key) != row],
+        "removes": [key for key in previous if key not in current],
+    }
+    if order != previous_order:
+        diff["order"] = order
+    return diff
+
+
+def _page_payload(view: View, total: int, version: int) -> Dict[str, Any]:
+    return {
+        "version": version,
+        "total": total,
+        "page": view.page,
+        "pages": max(1, -(-total // view.page_size)),
+    }
+
+
+def session_states(workstreams: List[Row]) -> List[str]:
+    return sorted({row["session_state"] for row in workstreams
+                   if row.get("session_state") not in (None, "-")})
+
+
+def view_page(view: View, workstreams: List[Row], version: int) -> Dict[str, Any]:
+    """A whole page for `view`: its rows (with keys), paging info and the known states."""
+    rows, total = view.apply(workstreams)
+    payload = _page_payload(view, total, version)
+    payload["rows"] = [dict(row, key=row_key(row)) for row in rows]
+    payload["states"] = session_states(workstreams)
+    return payload
+
+
+class DashboardRequestHandler(DaemonRequestHandler):
+    """Daemon RPC plus the dashboard page and its data endpoints."""
+
+    def _authorized(self, query: Dict[str, List[str]]) -> bool:
+        token = query.get("token", [""])[0]
+        if secrets.compare_digest(token, self.server.token):
+            return True
+        self._reply(403, {"error": "Invalid daemon token"})
+        return False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/":
+            body = DASHBOARD_HTML.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif url.path == "/api/workstreams":
+            if self._authorized(query):
+                self._workstreams(View.from_query(query))
+        elif url.path == "/events":
+            if self._authorized(query):
+                self._events(View.from_query(query))
+        else:
+            super().do_GET()
+
+    def _ready(self) -> bool:
+        if self.daemon.index.wait_ready(timeout=READY_TIMEOUT):
+            return True
+        self._reply(503, {"error": "The daemon has not loaded its data yet"})
+        return False
+
+    def _workstreams(self, view: View):
+        if not self._ready():
+            return
+        version = self.daemon.index.version
+        self._reply(200, view_page(view, self.daemon.index.workstreams(), version))
+
+    def _events(self, view: View):
+        if not self._ready():
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        index = self.daemon.index
+        sent: Dict[str, Row] = {}
+        sent_order: List[str] = []
+        sent_states: Optional[List[str]] = None
+        version = -1
+        try:
+            while True:
+                current = index.wait_for_change(version, timeout=KEEPALIVE_SECONDS)
+                if current == version:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    continue
+                workstreams = index.workstreams()
+                rows, total = view.apply(workstreams)
+                message = diff_page(sent, sent_order, rows)
+                message.update(_page_payload(view, total, current))
+                if version == -1:
+                    message["reset"] = True  # New stream (or a reconnect): start from an empty page
+                version = current
+                states = session_states(workstreams)
+                if states != sent_states:
+                    message["states"] = sent_states = states
+                sent = {row_key(row): row for row in rows}
+                sent_order = [row_key(row) for row in rows]
+                self.wfile.write(f"event: rows\ndata: {json.dumps(message)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("Dashboard client disconnected")
+
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>hrm workstreams</title>
+<style>
+  body { font: 13px system-ui, sans-serif; margin: 1em 2em; color: #222; }
+  header { display: flex; gap: 1em; align-items: center; margin-bottom: .8em; }
+  h1 { font-size: 16px; margin: 0 1em 0 0; }
+  table { border-collapse: collapse; width: 100%; }
+  th, td { text-align: left; padding: 3px 8px; border-bottom: 1px solid #eee; white-space: nowrap; }
+  th[data-sort] { cursor: pointer; user-select: none; }
+  th.sorted::after { content: " \\25BE"; }
+  th.sorted.asc::after { content: " \\25B4"; }
+  td.task { white-space: normal; }
+  tr.flash { animation: flash 1.5s; }
+  @keyframes flash { from { background: #fff3b0; } to { background: transparent; } }
+  #status { color: #888; margin-left: auto; }
+</style>
+</head>
+<body>
+<header>
+  <h1>Workstreams</h1>
+  <input id="q" type="search" placeholder="Filter issue, session, PR, branch, title">
+  <select id="state"><option value="">All states</option></select>
+  <button id="prev">&lsaquo;</button><span id="pager"></span><button id="next">&rsaquo;</button>
+  <span id="status">connecting...</span>
+</header>
+<table>
+  <thead><tr>
+    <th data-sort="last_activity">Updated</th>
+    <th data-sort="issue_id">Issue</th>
+    <th data-sort="session_id">Session</th>
+    <th data-sort="session_state">State</th>
+    <th data-sort="pr_id">PR</th>
+    <th>Review</th>
+    <th data-sort="session_created">Created</th>
+    <th>Task</th>
+  </tr></thead>
+  <tbody id="rows"></tbody>
+</table>
+<script>
+const token = new URLSearchParams(location.search).get("token") || "";
+const view = { sort: "last_activity", desc: 1, q: "", state: "", page: 1 };
+const rows = new Map();
+const tbody = document.getElementById("rows");
+let source = null, pages = 1;
+
+const REVIEW = { APPROVED: "\\u2705", CHANGES_REQUESTED: "\\ud83d\\udeab", REVIEW_REQUIRED: "\\ud83d\\udc40" };
+
+function ago(iso) {
+  if (!iso || iso === "-") return "-";
+  const s = (Date.now() - Date.parse(iso)) / 1000;
+  if (s < 3600) return Math.max(0, Math.floor(s / 60)) + "m ago";
+  if (s < 86400) return Math.floor(s / 3600) + "h ago";
+  return Math.floor(s / 86400) + "d ago";
+}
+
+function cells(r) {
+  const dash = (v) => (v === null || v === undefined || v === "") ? "-" : v;
+  return [
+    [ago(r.last_activity)], [dash(r.issue_id)], [dash(r.session_id)], [dash(r.session_state)],
+    [dash(r.pr_id)], [REVIEW[r.pr_status] || "-"], [ago(r.session_created)],
+    [dash(r.issue_title || r.session_title), "task"],
+  ];
+}
+
+function render(tr, r) {
+  tr.replaceChildren(...cells(r).map(([text, cls]) => {
+    const td = document.createElement("td");
+    td.textContent = text;
+    if (cls) td.className = cls;
+    return td;
+  }));
+  tr.dataset.last = r.last_activity || "";
+  tr.dataset.created = r.session_created || "";
+}
+
+function apply(msg) {
+  if (msg.reset) { rows.clear(); tbody.replaceChildren(); }
+  for (const key of msg.removes) { rows.get(key)?.remove(); rows.delete(key); }
+  for (const r of msg.upserts) {
+    let tr = rows.get(r.key);
+    if (!tr) { tr = document.createElement("tr"); rows.set(r.key, tr); tbody.appendChild(tr); }
+    render(tr, r);
+    tr.classList.remove("flash"); void tr.offsetWidth; tr.classList.add("flash");
+  }
+  if (msg.order) for (const key of msg.order) tbody.appendChild(rows.get(key));
+  if (msg.states) {
+    const select = document.getElementById("state");
+    const current = select.value;
+    select.replaceChildren(new Option("All states", ""), ...msg.states.map((s) => new Option(s, s)));
+    select.value = current;
+  }
+  pages = msg.pages;
+  document.getElementById("pager").textContent = `page ${msg.page}/${msg.pages} (${msg.total} rows)`;
+  document.getElementById("status").textContent = "live \\u2022 v" + msg.version;
+}
+
+function connect() {
+  if (source) source.close();
+  const params = new URLSearchParams({ ...view, token });
+  source = new EventSource("/events?" + params);
+  source.addEventListener("rows", (e) => apply(JSON.parse(e.data)));
+  source.onerror = () => { document.getElementById("status").textContent = "reconnecting..."; };
+  document.querySelectorAll("th[data-sort]").forEach((th) => {
+    th.classList.toggle("sorted", th.dataset.sort === view.sort);
+    th.classList.toggle("asc", th.dataset.sort === view.sort && !view.desc);
+  });
+}
+
+document.querySelectorAll("th[data-sort]").forEach((th) => th.addEventListener("click", () => {
+  view.desc = th.dataset.sort === view.sort ? 1 - view.desc : 1;
+  view.sort = th.dataset.sort;
+  view.page = 1;
+  connect();
+}));
+let typing;
+document.getElementById("q").addEventListener("input", (e) => {
+  clearTimeout(typing);
+  typing = setTimeout(() => { view.q = e.target.value; view.page = 1; connect(); }, 250);
+});
+document.getElementById("state").addEventListener("change", (e) => { view.state = e.target.value; view.page = 1; connect(); });
+document.getElementById("prev").addEventListener("click", () => { if (view.page > 1) { view.page--; connect(); } });
+document.getElementById("next").addEventListener("click", () => { if (view.page < pages) { view.page++; connect(); } });
+
+// Relative times age without any server traffic
+setInterval(() => {
+  for (const tr of rows.values()) {
+    tr.children[0].textContent = ago(tr.dataset.last);
+    tr.children[6].textContent = ago(tr.dataset.created);
+  }
+}, 30000);
+connect();
+</script>
+</body>
+</html>
+"""
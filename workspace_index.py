@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Shared file index for the hrm checkout.
+
+Enumerates files once through `git ls-files` and caches file contents by
+blob hash, so tools that crawl `hrm/` (dispatch_agents, audit_codebase,
+analyze_structure) read each file at most once per process.
+"""
+
+import fnmatch
+import logging
+import os
+import subprocess
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Set, Tuple, Union
+
+import telemetry
+
+logger = logging.getLogger("workspace_index")
+
+# Only used when the directory is not a git checkout
+PRUNE_DIRS = {'node_modules', '.next', '.git', 'dist', 'build'}
+
+
+class IndexEntry:
+    """One file in the index. `blob` is None for modified or untracked files."""
+
+    __slots__ = ("path", "abspath", "blob", "_size")
+
+    def __init__(self, path: str, abspath: str, blob: Optional[str] = None):
+        self.path = path
+        self.abspath = abspath
+        self.blob = blob
+        self._size: Optional[int] = None
+
+    @property
+    def ext(self) -> str:
+        return os.path.splitext(self.path)[1]
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            try:
+                self._size = os.path.getsize(self.abspath)
+            except OSError:
+                self._size = 0
+        return self._size
+
+    @property
+    def cache_key(self) -> str:
+        return self.blob or f"path:{self.path}"
+
+    def __repr__(self):
+        return f"IndexEntry({self.path!r}, blob={self.blob!r})"
+
+
+class FileIndex:
+    """
+    Tracked + untracked (non-ignored) files under `root`, with a content
+    cache. With `paths`, only those files are indexed (git pathspecs), so a
+    handful of explicit files never costs a listing of the whole tree.
+    """
+
+    def __init__(self, root: Union[str, Path], paths: Optional[Sequence[str]] = None):
+        self.root = Path(root).absolute()
+        self.paths = list(paths) if paths is not None else None
+        self.entries: Dict[str, IndexEntry] = {}
+        self.dirs: Set[str] = set()
+        self._contents: Dict[str, bytes] = {}
+        # Reads in progress, so concurrent callers wait for one read instead of repeating it
+        self._pending: Dict[str, Future] = {}
+        # Guards the two dicts only; disk reads happen outside it
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.hits = 0
+        self._load()
+
+    def _git_lines(self, *args: str) -> Optional[list]:
+        try:
+            result = subprocess.run(
+                ["git", "-c", "core.quotePath=false", "ls-files", "-z", *args,
+                 *(["--", *self.paths] if self.paths is not None else [])],
+                cwd=self.root, capture_output=True, check=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return [p for p in result.stdout.decode("utf-8", errors="replace").split("\0") if p]
+
+    def _load(self):
+        staged = self._git_lines("-s")
+        if staged is None:
+            logger.debug(f"{self.root} is not a git checkout; walking the tree")
+            self._walk()
+            return
+
+        modified = set(self._git_lines("-m") or [])
+        for line in staged:
+            # "<mode> <blob> <stage>\t<path>"
+            meta, path = line.split("\t", 1)
+            mode, blob, _ = meta.split()
+            if mode == "160000":
+                continue  # Submodule commit, not a file
+            if path in modified:
+                blob = None  # Index blob no longer matches the working tree
+            self._add(path, blob)
+        for path in self._git_lines("-o", "--exclude-standard") or []:
+            self._add(path, None)
+
+    def _walk(self):
+        if self.paths is not None:
+            for path in self.paths:
+                rel = self.relpath(path)
+                if rel is not None:
+                    self._add(rel, None)
+            return
+        for root, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in PRUNE_DIRS]
+            for file in files:
+                path = os.path.relpath(os.path.join(root, file), self.root).replace(os.sep, "/")
+                self._add(path, None)
+
+    def _add(self, path: str, blob: Optional[str]):
+        abspath = str(self.root / path)
+        if blob is None and not os.path.isfile(abspath):
+            return
+        self.entries[path] = IndexEntry(path, abspath, blob)
+        parent = path.rpartition("/")[0]
+        while parent and parent not in self.dirs:
+            self.dirs.add(parent)
+            parent = parent.rpartition("/")[0]
+
+    def relpath(self, path: Union[str, Path]) -> Optional[str]:
+        """`path` (absolute, or relative to the cwd) as an index key, or None if outside root."""
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel.startswith(".."):
+            return None
+        return rel.replace(os.sep, "/")
+
+    def get(self, path: Union[str, Path]) -> Optional[IndexEntry]:
+        rel = self.relpath(path)
+        return self.entries.get(rel) if rel is not None else None
+
+    def exists(self, rel_path: str) -> bool:
+        """True for indexed files and for directories containing indexed files."""
+        rel_path = rel_path.strip("/")
+        return rel_path in self.entries or rel_path in self.dirs
+
+    def files(self, under: str = "", pattern: Optional[str] = None,
+              exts: Optional[Tuple[str, ...]] = None) -> Iterator[IndexEntry]:
+        """
+        Entries below the root-relative directory `under`, in path order.
+        `pattern` is matched against the file name like `Path.rglob`.
+        """
+        prefix = under.strip("/") + "/" if under.strip("/") else ""
+        for path in sorted(self.entries):
+            if prefix and not path.startswith(prefix):
+                continue
+            entry = self.entries[path]
+            if exts and not path.endswith(exts):
+                continue
+            if pattern and not fnmatch.fnmatch(entry.name, pattern):
+                continue
+            yield entry
+
+    def read_bytes(self, path: Union[str, Path]) -> bytes:
+        """
+        Contents of `path` (absolute, or relative to the cwd). Indexed files
+        are read once and cached by blob hash; others are read directly.
+        Raises OSError like `open` does.
+        """
+        entry = self.get(path)
+        if entry is None:
+            with open(path, "rb") as f:
+                return f.read()
+        key = entry.cache_key
+        with self._lock:
+            data = self._contents.get(key)
+            pending = self._pending.get(key) if data is None else None
+            owner = data is None and pending is None
+            if owner:
+                pending = self._pending[key] = Future()
+            else:
+                self.hits += 1
+        telemetry.cache_access("workspace_index", not owner)
+        if data is not None:
+            return data
+        if not owner:
+            return pending.result()  # Re-raises the reader's OSError
+
+        try:
+            with open(entry.abspath, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self.reads += 1
+            self._contents[key] = data
+            del self._pending[key]
+        pending.set_result(data)
+        return data
+
+    def read_text(self, path: Union[str, Path], errors: str = "strict") -> str:
+        return self.read_bytes(path).decode("utf-8", errors=errors)
+
+    def read_entry(self, entry: IndexEntry, errors: str = "strict") -> str:
+        return self.read_text(entry.abspath, errors=errors)
+
+
+_indexes: Dict[Path, FileIndex] = {}
+
+
+def get_index(root: Union[str, Path]) -> FileIndex:
+    """The shared index for `root`, built on first use."""
+    key = Path(root).absolute()
+    if key not in _indexes:
+        _indexes[key] = FileIndex(key)
+    return _indexes[key]
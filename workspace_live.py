@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Live terminal dashboard (`jules_ops.py status --live`).
+
+A top-like view of the workstreams. Pages come from a workspace daemon's
+`view` call, either the running daemon over RPC or an in-process one with
+adaptive, incremental refresh, so the terminal only ever holds one page.
+Each frame rewrites just the screen lines whose text changed.
+
+Keys: q quit, s sort column, r reverse, / filter text, f state filter,
+      n/p next/previous page, R full refresh now.
+"""
+
+import locale
+import logging
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import curses
+except ImportError:  # e.g. Windows without the windows-curses package
+    curses = None
+
+from workspace_dashboard import SORT_KEYS
+
+logger = logging.getLogger("workspace_live")
+
+# How long each frame waits for the index to change before handling keys again
+POLL_SECONDS = 0.25
+# Title, column header and rule above the rows; key help below them
+HEADER_LINES = 3
+FOOTER_LINES = 1
+KEY_HELP = "q quit  s sort  r reverse  / filter  f state  n/p page  R refresh"
+
+
+class _StatusLine(logging.Handler):
+    """Shows the latest warning in the footer instead of scribbling over the screen."""
+
+    def __init__(self, view: "LiveStatus"):
+        super().__init__(logging.WARNING)
+        self.view = view
+
+    def emit(self, record):
+        self.view.message = record.getMessage()
+
+
+class LiveStatus:
+    """
+    Screen state for the live view. `fetch(version=, wait=, **view)` returns
+    a page like WorkspaceDaemon.rpc_view; `refresh()` forces a full refresh.
+    """
+
+    def __init__(self, fetch: Callable[..., Dict[str, Any]], header: str,
+                 format_row: Callable[[Dict[str, Any]], str],
+                 refresh: Optional[Callable[[], Any]] = None):
+        self.fetch = fetch
+        self.header = header
+        self.format_row = format_row
+        self.refresh = refresh
+        self.view: Dict[str, Any] = {
+            "sort": "last_activity", "desc": True, "q": "", "state": "", "page": 1, "page_size": 20,
+        }
+        self.page: Optional[Dict[str, Any]] = None
+        self.version = -1
+        self.screen: List[str] = []
+        self.message = ""
+
+    # --- Input ---
+
+    def _changed_view(self, **changes):
+        self.view.update(changes)
+        self.version = -1  # Refetch even if the index has not moved
+
+    def _prompt(self, stdscr, label: str) -> str:
+        height, width = stdscr.getmaxyx()
+        stdscr.move(height - 1, 0)
+        stdscr.clrtoeol()
+        stdscr.addnstr(height - 1, 0, label, width - 1)
+        if len(self.screen) == height:
+            self.screen[-1] = label  # So the footer is redrawn afterwards
+        curses.echo()
+        stdscr.nodelay(False)
+        try:
+            text = stdscr.getstr(height - 1, len(label), max(1, width - len(label) - 1))
+        finally:
+            curses.noecho()
+            stdscr.nodelay(True)
+        return text.decode("utf-8", errors="replace").strip()
+
+    def handle_key(self, stdscr, key: int) -> bool:
+        """Apply one key press; False means quit."""
+        states = [""] + ((self.page or {}).get("states") or [])
+        pages = (self.page or {}).get("pages", 1)
+        if key in (ord("q"), 27):
+            return False
+        if key == ord("s"):
+            i = SORT_KEYS.index(self.view["sort"]) if self.view["sort"] in SORT_KEYS else -1
+            self._changed_view(sort=SORT_KEYS[(i + 1) % len(SORT_KEYS)], page=1)
+        elif key == ord("r"):
+            self._changed_view(desc=not self.view["desc"])
+        elif key == ord("/"):
+            self._changed_view(q=self._prompt(stdscr, "filter: "), page=1)
+        elif key == ord("f"):
+            i = states.index(self.view["state"]) if self.view["state"] in states else 0
+            self._changed_view(state=states[(i + 1) % len(states)], page=1)
+        elif key in (ord("n"), curses.KEY_NPAGE) and self.view["page"] < pages:
+            self._changed_view(page=self.view["page"] + 1)
+        elif key in (ord("p"), curses.KEY_PPAGE) and self.view["page"] > 1:
+            self._changed_view(page=self.view["page"] - 1)
+        elif key == ord("R") and self.refresh:
+            self.message = "Refreshing..."
+            threading.Thread(target=self._refresh, daemon=True).start()
+        elif key == curses.KEY_RESIZE:
+            self._fit(stdscr)
+        return True
+
+    def _refresh(self):
+        try:
+            self.refresh()
+            self.message = ""
+        except Exception as e:
+            self.message = f"Refresh failed: {e}"
+
+    def _fit(self, stdscr):
+        height, _ = stdscr.getmaxyx()
+        page_size = max(1, height - HEADER_LINES - FOOTER_LINES)
+        if page_size != self.view["page_size"]:
+            first_row = (self.view["page"] - 1) * self.view["page_size"]
+            self._changed_view(page_size=page_size, page=first_row // page_size + 1)
+        stdscr.clear()
+        self.screen = []
+
+    # --- Output ---
+
+    def render(self, height: int) -> List[str]:
+        view, page = self.view, self.page or {}
+        arrow = "v" if view["desc"] else "^"
+        title = (
+            f"WORKSTREAMS  {page.get('total', 0)} rows  sort {view['sort']} {arrow}  "
+            f"state {view['state'] or 'all'}  filter '{view['q']}'  "
+            f"page {page.get('page', 1)}/{page.get('pages', 1)}"
+        )
+        if self.page is None:
+            title = "Loading workstreams..."
+        lines = [title, self.header, "-" * 100]
+        lines += [self.format_row(row) for row in page.get("rows", [])]
+        lines += [""] * (height - FOOTER_LINES - len(lines))
+        lines = lines[:height - FOOTER_LINES]
+        lines.append(self.message or KEY_HELP)
+        return lines
+
+    def draw(self, stdscr):
+        height, width = stdscr.getmaxyx()
+        lines = self.render(height)
+        for y, line in enumerate(lines):
+            if y < len(self.screen) and self.screen[y] == line:
+                continue
+            try:
+                stdscr.move(y, 0)
+                stdscr.clrtoeol()
+                stdscr.addnstr(y, 0, line, width - 1)
+            except curses.error:
+                pass  # Wide characters at the right edge
+        self.screen = lines
+        stdscr.refresh()
+
+    # --- Main loop ---
+
+    def run(self, stdscr):
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        stdscr.nodelay(True)
+        self._fit(stdscr)
+        self.draw(stdscr)
+        while True:
+            key = stdscr.getch()
+            while key != -1:
+                if not self.handle_key(stdscr, key):
+                    return
+                key = stdscr.getch()
+            try:
+                page = self.fetch(version=self.version, wait=POLL_SECONDS, **self.view)
+            except Exception as e:
+                self.message = f"Update failed: {e}"
+                curses.napms(int(POLL_SECONDS * 1000))
+            else:
+                if self.message.startswith("Update failed"):
+                    self.message = ""
+                if not page.get("unchanged"):
+                    self.page, self.version = page, page["version"]
+            # Relative times move on their own, so re-render; only changed lines are written
+            self.draw(stdscr)
+
+
+def run_live(fetch: Callable[..., Dict[str, Any]], header: str,
+             format_row: Callable[[Dict[str, Any]], str],
+             refresh: Optional[Callable[[], Any]] = None) -> bool:
+    """Run the live view until the user quits. False if no curses terminal is available."""
+    if curses is None or not sys.stdout.isatty():
+        return False
+    locale.setlocale(locale.LC_ALL, "")
+    view = LiveStatus(fetch, header, format_row, refresh)
+    root = logging.getLogger()
+    saved_handlers = root.handlers[:]
+    root.handlers = [_StatusLine(view)]
+    try:
+        curses.wrapper(view.run)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        root.handlers = saved_handlers
+    return True
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Workstream correlation: joins Jules sessions, GitHub issues and PRs into
+one row per piece of work. Shared by jules_ops.py and the workspace daemon.
+"""
+
+import re
+
+
+def extract_issue_id(text):
+    """Heuristic to find Issue ID in branches/titles."""
+    if not text:
+        return None
+    match = re.search(r"#(\d+)", text)
+    if match:
+        return match.group(1)
+    match = re.search(r"issue[-/](\d+)", text, re.IGNORECASE)
+    if match:
+        return match.group(1)
+    return None
+
+
+def normalize_sessions(sessions):
+    data = []
+    for s in sessions:
+        outputs = s.get("outputs", [])
+        pr_url = None
+        for o in outputs:
+            if "pullRequest" in o:
+                pr_url = o["pullRequest"].get("url")
+                break
+
+        sid = (
+            s.get("name", "").split("/")[-1]
+            if "/" in s.get("name", "")
+            else s.get("name", "N/A")
+        )
+
+        # Extract branch directly from session sourceContext
+        session_branch = (
+            s.get("sourceContext", {})
+            .get("githubRepoContext", {})
+            .get("startingBranch")
+        )
+
+        data.append(
+            {
+                "id": sid,
+                "full_name": s.get("name"),
+                "state": s.get("state"),
+                "created_at": s.get("createTime"),
+                "title": s.get("title", "").split("\n")[0],
+                "pr_url": pr_url,
+                "branch": session_branch,  # Add the branch here
+            }
+        )
+    return data
+
+
+def normalize_issues(issues):
+    data = []
+    for i in issues:
+        assignees = [a["login"] for a in i.get("assignees", [])]
+        data.append(
+            {
+                "id": str(i.get("number")),
+                "title": i.get("title"),
+                "assignees": ", ".join(assignees),
+                "updated_at": i.get("updatedAt"),
+                "url": i.get("url"),
+            }
+        )
+    return data
+
+
+def normalize_prs(prs):
+    data = []
+    for p in prs:
+        data.append(
+            {
+                "id": str(p.get("number")),
+                "title": p.get("title"),
+                "branch": p.get("headRefName"),
+                "review": p.get("reviewDecision"),
+                "updated_at": p.get("updatedAt"),
+                "url": p.get("url"),
+            }
+        )
+    return data
+
+
+def correlate_data(sessions, issues, prs):
+    """Groups data into Workstreams."""
+    normalized_sessions = normalize_sessions(sessions)
+    normalized_issues = normalize_issues(issues)
+    normalized_prs = normalize_prs(prs)
+
+    issue_map = {i["id"]: i for i in normalized_issues}
+    pr_map_by_url = {p["url"]: p for p in normalized_prs}
+
+    workstreams = []
+
+    # 1. Start with Sessions
+    for s in normalized_sessions:
+        row = {
+            "session_id": s["id"],
+            "session_state": s["state"],
+            "session_title": s["title"],
+            "session_created": s["created_at"],
+            "last_activity": s["created_at"],  # default
+            "pr_id": None,
+            "pr_status": None,
+            "branch": s["branch"],  # Initialize branch from session data
+            "issue_id": None,
+            "issue_title": None,
+        }
+
+        # Link PR
+        if s["pr_url"] and s["pr_url"] in pr_map_by_url:
+            pr = pr_map_by_url[s["pr_url"]]
+            row["pr_id"] = f"#{pr['id']}"
+            row["pr_status"] = pr["review"]
+            row["branch"] = pr["branch"]
+            row["last_activity"] = pr[
+                "updated_at"
+            ]  # PR update is newer than session create
+
+            # Link Issue via PR
+            found_issue = extract_issue_id(pr["branch"]) or extract_issue_id(
+                pr["title"]
+            )
+            if found_issue:
+                row["issue_id"] = f"#{found_issue}"
+                if found_issue in issue_map:
+                    row["issue_title"] = issue_map[found_issue]["title"]
+
+        # Link Issue via Session Title
+        if not row["issue_id"]:
+            found_issue = extract_issue_id(s["title"])
+            if found_issue:
+                row["issue_id"] = f"#{found_issue}"
+                if found_issue in issue_map:
+                    row["issue_title"] = issue_map[found_issue]["title"]
+
+        workstreams.append(row)
+
+    # 2. Catch Orphan PRs
+    linked_pr_urls = {s["pr_url"] for s in normalized_sessions if s["pr_url"]}
+    for p in normalized_prs:
+        if p["url"] not in linked_pr_urls:
+            iid = extract_issue_id(p["branch"]) or extract_issue_id(p["title"])
+            workstreams.append(
+                {
+                    "session_id": "-",
+                    "session_state": "-",
+                    "session_title": "-",
+                    "session_created": "-",
+                    "last_activity": p["updated_at"],
+                    "pr_id": f"#{p['id']}",
+                    "pr_status": p["review"],
+                    "branch": p["branch"],
+                    "issue_id": f"#{iid}" if iid else None,
+                    "issue_title": (
+                        issue_map[iid]["title"]
+                        if (iid and iid in issue_map)
+                        else None
+                    ),
+                }
+            )
+
+    # Sort by last_activity
+    workstreams.sort(key=lambda x: x.get("last_activity") or "", reverse=True)
+    return workstreams